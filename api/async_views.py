@@ -0,0 +1,231 @@
+"""
+Asynchronous API views of issues for ASGI, reading from the database by the async ORM,
+so that an ASGI process serves many concurrent (polling) clients without a worker thread
+waiting for each request. They return the same issues as `IssueViewSet`, but:
+
+- Only token and session logins are accepted.
+- Issues are listed and exported only by their titles (also the found ones, `?q=`),
+  a page after the issue titled `?after=`.
+- Responses are not cached (clients can use conditional requests instead).
+
+The state changes of issues are sent as server-sent events by a long-polling view.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import functools
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import get_authorization_header
+from rest_framework.utils.urls import replace_query_param
+
+from api.authentication import aauthenticate_credentials
+from api.conditions import aissue_validators, aissues_validators, async_condition
+from issues.models import Issue, IssueStateChange
+from issues.search import search_issues
+from issues.serializers import (
+    IssueExportQuerySerializer,
+    IssuePageQuerySerializer,
+    IssueStateChangeEventSerializer,
+    IssueStateChangesQuerySerializer,
+    ISSUE_ROW_FIELDS,
+    get_state_labels,
+    issue_row_to_dict,
+)
+from trackerino import routers
+
+# How long (in milliseconds) clients wait before they ask for more events.
+EVENTS_RECONNECTION_TIME = 100
+
+
+def _search(request, queryset):
+    query = request.GET.get('q')
+    return search_issues(queryset, query) if query else queryset
+
+
+def _get_changes_cutoff() -> datetime.datetime:
+    return timezone.now() - datetime.timedelta(seconds=settings.API_CHANGES_DELAY)
+
+
+def _error_response(exc: exceptions.APIException) -> JsonResponse:
+    # The same responses as of DRF's exception handler.
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = JsonResponse(data, status=exc.status_code, safe=False)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        response.headers['WWW-Authenticate'] = 'Token'
+    return response
+
+
+async def _authenticate(request):
+    """
+    Get the user logged in by a token (like `CachedTokenAuthentication`) or the session.
+    """
+    auth = get_authorization_header(request).split()
+    if auth and auth[0].lower() == b'token':
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+        user, _token = await aauthenticate_credentials(key)
+        return user
+    # The session (and its user) is read from the database by the sync API only.
+    return await sync_to_async(get_user)(request)
+
+
+def api_view(view):
+    """
+    Allow only safe requests of staff users (as `IssueViewSet` does) and read issues
+    from the replica (as `ReplicaReadsMixin` does).
+    """
+
+    @functools.wraps(view)
+    async def inner(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(['GET', 'HEAD'])
+        try:
+            user = await _authenticate(request)
+            if not user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            if not user.is_staff:
+                raise exceptions.PermissionDenied()
+            with routers.database_routing():
+                if not await sync_to_async(routers.is_pinned_to_primary)(user):
+                    routers.allow_replica_reads()
+                return await view(request, *args, **kwargs)
+        except exceptions.APIException as e:
+            return _error_response(e)
+
+    return inner
+
+
+@api_view
+@async_condition(aissues_validators)
+async def issue_list(request):
+    """
+    A page of filtered issues (see `IssuePageQuerySerializer`), with a link to the next one.
+    """
+    query = IssuePageQuerySerializer(data=request.GET)
+    query.is_valid(raise_exception=True)
+    page_size = query.validated_data['page_size']
+    queryset = query.filter(_search(request, Issue.objects.values(*ISSUE_ROW_FIELDS)))
+    rows = [row async for row in queryset[: page_size + 1]]
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_url = replace_query_param(
+            request.build_absolute_uri(), 'after', rows[-1]['title']
+        )
+    state_labels = get_state_labels()
+    return JsonResponse(
+        {'next': next_url, 'results': [issue_row_to_dict(row, state_labels) for row in rows]}
+    )
+
+
+@api_view
+@async_condition(aissue_validators)
+async def issue_detail(request, pk):
+    try:
+        row = await Issue.objects.values(*ISSUE_ROW_FIELDS).aget(pk=pk)
+    except Issue.DoesNotExist:
+        raise exceptions.NotFound()
+    return JsonResponse(issue_row_to_dict(row, get_state_labels()))
+
+
+@api_view
+async def issue_export(request):
+    """
+    Filtered issues as newline-delimited JSON, read from the database in chunks: a part
+    of them (see `IssueExportQuerySerializer`), with a link to the next part in the `Link`
+    header.
+
+    Django cannot stream async iterators yet, so the body is built before it is sent,
+    and its size is limited by `API_ASYNC_EXPORT_MAX_SIZE`.
+    """
+    query = IssueExportQuerySerializer(data=request.GET)
+    query.is_valid(raise_exception=True)
+    page_size = query.validated_data['page_size']
+    queryset = query.filter(_search(request, Issue.objects.values(*ISSUE_ROW_FIELDS)))
+    rows = [
+        row
+        async for row in queryset[: page_size + 1].aiterator(
+            chunk_size=settings.API_EXPORT_CHUNK_SIZE
+        )
+    ]
+    state_labels = get_state_labels()
+    lines = [
+        json.dumps(issue_row_to_dict(row, state_labels), ensure_ascii=False, separators=(',', ':'))
+        + '\n'
+        for row in rows[:page_size]
+    ]
+    response = HttpResponse(''.join(lines), content_type='application/x-ndjson')
+    if len(rows) > page_size:
+        next_url = replace_query_param(
+            request.build_absolute_uri(), 'after', rows[page_size - 1]['title']
+        )
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
+
+
+@api_view
+async def issue_state_changes(request):
+    """
+    State changes of issues as server-sent events (e.g. for an `EventSource`), following
+    the change with the ID `Last-Event-ID` (sent by reconnecting clients) or `?after=`,
+    or the latest one.
+
+    This is long polling: the response waits until there are any changes (up to
+    `API_EVENTS_TIMEOUT`), querying the database for them every `API_EVENTS_POLL_INTERVAL`
+    for each connected client, so that a client reconnecting after each response gets all
+    state changes as they come.
+
+    The changes are sent in the order of their IDs, but only once they are
+    `API_CHANGES_DELAY` old (as the issues in the change feed of `IssueViewSet`), so that
+    changes committed late (out of the order of their IDs, or to the replica) are not skipped.
+    """
+    data = request.GET.dict()
+    if 'Last-Event-ID' in request.headers:
+        data['after'] = request.headers['Last-Event-ID']
+    query = IssueStateChangesQuerySerializer(data=data)
+    query.is_valid(raise_exception=True)
+    after = query.validated_data.get('after')
+    if after is None:
+        after = (
+            await IssueStateChange.objects.filter(occurred_at__lt=_get_changes_cutoff())
+            .order_by('-pk')
+            .values_list('pk', flat=True)
+            .afirst()
+        ) or 0
+    queryset = IssueStateChange.objects.order_by('pk')
+    deadline = time.monotonic() + settings.API_EVENTS_TIMEOUT
+    while True:
+        cutoff = _get_changes_cutoff()
+        changes = []
+        # Looked up by the primary key, so cheaply.
+        async for change in queryset.filter(pk__gt=after)[: settings.API_EVENTS_BATCH_SIZE]:
+            if change.occurred_at >= cutoff:
+                # The changes before it may not be committed yet.
+                break
+            changes.append(change)
+        if changes or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(settings.API_EVENTS_POLL_INTERVAL)
+    events = [f'retry: {EVENTS_RECONNECTION_TIME}\n\n']
+    for change in IssueStateChangeEventSerializer(changes, many=True).data:
+        events.append(f'id: {change["id"]}\ndata: {json.dumps(change, separators=(",", ":"))}\n\n')
+    if not changes:
+        # Without data, only the last event ID of the client is set (to resume from).
+        events.append(f'id: {after}\n\n')
+    response = HttpResponse(''.join(events), content_type='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,74 @@
+"""
+Token authentication with the tokens and their users cached, so that polling clients
+do not pay a database query per request for it.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+
+def get_token_key(key: str) -> str:
+    # Tokens are secrets, so they are not a part of the cache keys as they are.
+    return f'api:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def invalidate_tokens(keys: Iterable[str]) -> None:
+    """
+    Drop the cached tokens (and their users) with the given keys.
+    """
+    cache_keys = [get_token_key(key) for key in keys]
+    if not cache_keys:
+        return
+
+    def invalidate():
+        cache.delete_many(cache_keys)
+
+    # Like `issues.cache.invalidate_issues`: now and after the commit.
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` with valid tokens cached together with their users for
+    `API_TOKEN_CACHE_TIMEOUT` seconds. Cached tokens are dropped when they are deleted
+    (e.g. rotated) or their users are changed (e.g. deactivated) by saving them; changes
+    bypassing the signals (e.g. `QuerySet.update`) take effect after the timeout.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = get_token_key(key)
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            # Invalid tokens and inactive users are rejected (and not cached) as usual.
+            credentials = super(CachedTokenAuthentication, self).authenticate_credentials(key)
+            cache.set(cache_key, credentials, timeout=settings.API_TOKEN_CACHE_TIMEOUT)
+        return credentials
+
+
+async def aauthenticate_credentials(key: str) -> tuple:
+    """
+    `CachedTokenAuthentication.authenticate_credentials` for async views, using the async
+    cache and ORM. Return the user and the token, or raise `AuthenticationFailed`.
+    """
+    cache_key = get_token_key(key)
+    credentials = await cache.aget(cache_key)
+    if credentials is None:
+        try:
+            token = await Token.objects.select_related('user').aget(key=key)
+        except Token.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        credentials = (token.user, token)
+        await cache.aset(cache_key, credentials, timeout=settings.API_TOKEN_CACHE_TIMEOUT)
+    return credentials
@@ -0,0 +1,100 @@
+"""
+Cheap validators (ETag, Last-Modified) of API responses, so that clients can use
+conditional requests and get "304 Not Modified" without the response being built.
+
+Lists of issues are versioned by the generation of the cached lists (see `issues.cache`),
+which changes with any issue, so they are validated without a query (but only by ETags).
+The generation changes with the writes to the primary, so lists read from the replica
+(which may not have the writes yet) are not validated.
+"""
+from __future__ import annotations
+
+import calendar
+import datetime
+import functools
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from issues import cache
+from issues.models import Issue
+from trackerino import routers
+
+
+def get_issue_version(request, pk) -> datetime.datetime | None:
+    """
+    Get the last update of the issue `pk` (a URL segment), or None if there is no such issue.
+    """
+    if not hasattr(request, '_issue_version'):
+        request._issue_version = (
+            Issue.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+            if str(pk).isdigit()
+            else None
+        )
+    return request._issue_version
+
+
+def _make_etag(request, *version) -> str:
+    # The response also depends on the query (e.g. the page) and the requested format.
+    key = repr((request.get_full_path(), request.META.get('HTTP_ACCEPT'), *version))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def issues_etag(request, *args, **kwargs) -> str | None:
+    if routers.reads_from_replica():
+        return None
+    return _make_etag(request, cache.get_list_generation())
+
+
+def issue_etag(request, pk, *args, **kwargs) -> str | None:
+    updated_at = get_issue_version(request, pk)
+    return _make_etag(request, pk, updated_at) if updated_at is not None else None
+
+
+def issue_last_modified(request, pk, *args, **kwargs) -> datetime.datetime | None:
+    return get_issue_version(request, pk)
+
+
+async def aissues_validators(request, *args, **kwargs) -> tuple[str | None, None]:
+    if routers.reads_from_replica():
+        return None, None
+    return _make_etag(request, await cache.aget_list_generation()), None
+
+
+async def aissue_validators(
+    request, pk, *args, **kwargs
+) -> tuple[str | None, datetime.datetime | None]:
+    updated_at = (
+        await Issue.objects.filter(pk=pk).values_list('updated_at', flat=True).afirst()
+    )
+    if updated_at is None:
+        return None, None
+    return _make_etag(request, pk, updated_at), updated_at
+
+
+def async_condition(validators_func):
+    """
+    `django.views.decorators.http.condition` for async views, with an async
+    `validators_func` returning both the ETag and the last modification of the response.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag, last_modified = await validators_func(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag else None
+            timestamp = calendar.timegm(last_modified.utctimetuple()) if last_modified else None
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                if etag and not response.has_header('ETag'):
+                    response.headers['ETag'] = etag
+                if timestamp and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(timestamp)
+            return response
+
+        return inner
+
+    return decorator
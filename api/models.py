@@ -1,10 +1,27 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
 
+from api.authentication import invalidate_tokens
+
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     if created:
         Token.objects.create(user=instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance=None, created=False, update_fields=None, **kwargs):
+    # Cached tokens hold their users (e.g. whether they are active or staff).
+    # Logins update only the time of the last login, which is not used by the API.
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    invalidate_tokens(Token.objects.filter(user=instance).values_list('key', flat=True))
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance=None, **kwargs):
+    invalidate_tokens([instance.key])
@@ -0,0 +1,65 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class IssueCursorPagination(CursorPagination):
+    """
+    Keyset pagination of issues, by default by their (unique) title, so that any page is read
+    from an index instead of skipping all the preceding issues. Issues ordered by the view
+    (e.g. by `?ordering=`) are paginated in that order.
+    """
+
+    ordering = ('title', 'id')
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self) -> int:
+        return settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        if queryset.query.order_by:
+            return tuple(queryset.query.order_by)
+        return super(IssueCursorPagination, self).get_ordering(request, queryset, view)
+
+
+class IssueSearchPagination(LimitOffsetPagination):
+    """
+    Offset pagination of found issues ordered from the best match. Their rank is a float
+    computed for each query (and changing with the issues), so it is not a reliable cursor.
+    The pages have the same parameters and fields as of `IssueCursorPagination`.
+    """
+
+    default_limit = settings.API_PAGE_SIZE
+    limit_query_param = 'page_size'
+
+    @property
+    def max_limit(self) -> int:
+        return settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        # An issue more tells whether there is a next page, without counting the found issues.
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            }
+        )
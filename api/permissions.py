@@ -0,0 +1,10 @@
+from rest_framework import permissions
+
+
+class CanChangeIssues(permissions.BasePermission):
+    """
+    Allows access only to users who may change issues (as in the admin).
+    """
+
+    def has_permission(self, request, view):
+        return request.user.has_perm('issues.change_issue')
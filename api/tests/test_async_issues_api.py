@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, TransactionTestCase
+from rest_framework.authtoken.models import Token
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+class TestAsyncIssuesAPI(TestCase):
+    LIST_ISSUES_URL = '/api/async/issues/'
+    ISSUE_DETAIL_URL = '/api/async/issues/%s/'
+    EXPORT_ISSUES_URL = '/api/async/issues/export/'
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = AsyncClient()
+        self.staff_user = User.objects.create_user(
+            username='staff', password='staff', is_staff=True
+        )
+        self.common_user = User.objects.create_user(username='common', password='common')
+        self.token = Token.objects.get(user=self.staff_user).key
+        self.category = Category.objects.create(name='Category A')
+        self.issues = [
+            Issue.objects.create(
+                title=f'Issue {i}',
+                description=f'Description of issue {i}',
+                category=self.category,
+                reporter=self.staff_user,
+                assignee=self.common_user if i % 2 else self.staff_user,
+            )
+            for i in range(5)
+        ]
+
+    async def test_issues_list_token(self):
+        """
+        Check that issues are listed page by page to a staff user, using token login.
+        """
+        response = await self.client.get(
+            self.LIST_ISSUES_URL, {'page_size': 2}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([issue['title'] for issue in data['results']], ['Issue 0', 'Issue 1'])
+        self.assertEqual(
+            data['results'][0],
+            {
+                'id': self.issues[0].id,
+                'title': 'Issue 0',
+                'description': 'Description of issue 0',
+                'category': 'Category A',
+                'current_state': 'TO DO',
+                'reporter': 'staff',
+                'assignee': 'staff',
+            },
+        )
+        titles = []
+        url = data['next']
+        while url:
+            response = await self.client.get(url, AUTHORIZATION=f'Token {self.token}')
+            data = response.json()
+            titles += [issue['title'] for issue in data['results']]
+            url = data['next']
+        self.assertEqual(titles, ['Issue 2', 'Issue 3', 'Issue 4'])
+
+    async def test_issues_list_filters(self):
+        """
+        Check that listed issues can be filtered and searched as in the sync API.
+        """
+        response = await self.client.get(
+            self.LIST_ISSUES_URL, {'assignee': 'common'}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(
+            [issue['title'] for issue in response.json()['results']], ['Issue 1', 'Issue 3']
+        )
+        response = await self.client.get(
+            self.LIST_ISSUES_URL, {'q': 'issue 4'}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual([issue['title'] for issue in response.json()['results']], ['Issue 4'])
+        response = await self.client.get(
+            self.LIST_ISSUES_URL, {'page_size': 0}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('page_size', response.json())
+
+    async def test_issues_list_not_modified(self):
+        """
+        Check that an unchanged list of issues is not sent again to a conditional request.
+        """
+        response = await self.client.get(
+            self.LIST_ISSUES_URL, AUTHORIZATION=f'Token {self.token}'
+        )
+        etag = response.headers['ETag']
+        response = await self.client.get(
+            self.LIST_ISSUES_URL, AUTHORIZATION=f'Token {self.token}', IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_issues_list_unauthorized(self):
+        """
+        Check that issues are not listed to anonymous and non-staff users or by invalid tokens.
+        """
+        response = await self.client.get(self.LIST_ISSUES_URL)
+        self.assertEqual(response.status_code, 401)
+        response = await self.client.get(self.LIST_ISSUES_URL, AUTHORIZATION='Token invalid')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'detail': 'Invalid token.'})
+        await sync_to_async(self.client.login)(username='common', password='common')
+        response = await self.client.get(self.LIST_ISSUES_URL)
+        self.assertEqual(response.status_code, 403)
+
+    async def test_issues_list_session(self):
+        """
+        Check that issues are listed to a staff user using session login.
+        """
+        await sync_to_async(self.client.login)(username='staff', password='staff')
+        response = await self.client.get(self.LIST_ISSUES_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    async def test_issues_list_read_only(self):
+        """
+        Check that issues cannot be created by the async API.
+        """
+        response = await self.client.post(
+            self.LIST_ISSUES_URL, {'title': 'Issue'}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 405)
+
+    async def test_issue_detail(self):
+        """
+        Check that an issue is fetched, with its current state.
+        """
+        issue = self.issues[2]
+        await sync_to_async(issue.update_state)(IssueStateChange.State.DONE)
+        response = await self.client.get(
+            self.ISSUE_DETAIL_URL % issue.id, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['current_state'], 'DONE')
+        response = await self.client.get(
+            self.ISSUE_DETAIL_URL % 0, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_issues_export(self):
+        """
+        Check that all issues are exported as newline-delimited JSON.
+        """
+        response = await self.client.get(
+            self.EXPORT_ISSUES_URL, {'assignee': 'staff'}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'application/x-ndjson')
+        lines = response.content.decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)['title'] for line in lines], ['Issue 0', 'Issue 2', 'Issue 4']
+        )
+
+    async def test_issues_export_parts(self):
+        """
+        Check that issues are exported in parts of a limited size, linked by the `Link` header.
+        """
+        response = await self.client.get(
+            self.EXPORT_ISSUES_URL, {'page_size': 2}, AUTHORIZATION=f'Token {self.token}'
+        )
+        titles = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            titles.extend(json.loads(line)['title'] for line in response.content.splitlines())
+            if 'Link' not in response.headers:
+                break
+            url = re.fullmatch(r'<(.+)>; rel="next"', response.headers['Link'])[1]
+            response = await self.client.get(url, AUTHORIZATION=f'Token {self.token}')
+        self.assertEqual(titles, [f'Issue {i}' for i in range(5)])
+        response = await self.client.get(
+            self.EXPORT_ISSUES_URL, {'page_size': 0}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestIssuesExportASGI(TransactionTestCase):
+    """
+    Exports served by the ASGI handler itself, which (unlike `AsyncClient`) iterates streamed
+    responses in the event loop, and runs the views of each request in their own thread.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        user = User.objects.create_user(username='staff', is_staff=True)
+        self.token = Token.objects.get(user=user).key
+        category = Category.objects.create(name='Category A')
+        for i in range(3):
+            Issue.objects.create(
+                title=f'Issue {i}', category=category, reporter=user, assignee=user
+            )
+
+    async def _get(self, path: str) -> tuple[int, bytes]:
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'query_string': b'',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Token {self.token}'.encode()),
+            ],
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await get_asgi_application()(scope, receive, send)
+        return messages[0]['status'], b''.join(message.get('body', b'') for message in messages)
+
+    async def test_issues_export(self):
+        """
+        Check that issues are exported by the async API, and that the streaming export
+        of the sync API (which would read the database in the event loop) refers to it.
+        """
+        status, body = await self._get('/api/async/issues/export/')
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            [json.loads(line)['title'] for line in body.splitlines()],
+            ['Issue 0', 'Issue 1', 'Issue 2'],
+        )
+        status, body = await self._get('/api/issues/export/')
+        self.assertEqual(status, 501)
+        self.assertIn('/api/async/issues/export/', json.loads(body)['detail'])
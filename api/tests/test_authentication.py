@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+
+class TestCachedTokenAuthentication(TestCase):
+    """
+    Test the authentication of API requests by cached tokens.
+    """
+
+    URL = '/api/issues/'
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user('staff', '', 'staff', is_staff=True)
+        self.token = Token.objects.get(user=self.user)
+
+    def _get(self, key: str):
+        return self.client.get(self.URL, HTTP_AUTHORIZATION=f'Token {key}')
+
+    def assertNoAuthQueries(self, queries):
+        for query in queries:
+            self.assertNotIn('auth', query['sql'])
+
+    def test_token_cached(self):
+        """
+        Check that a token is looked up in the database only by the first request.
+        """
+        self.assertEqual(self._get(self.token.key).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get(self.token.key)
+        self.assertNoAuthQueries(queries)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user, self.user)
+        self.assertEqual(self._get('invalid').status_code, 401)
+
+    def test_token_rotated(self):
+        """
+        Check that a deleted token is rejected, and its replacement accepted, right away.
+        """
+        self.assertEqual(self._get(self.token.key).status_code, 200)
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        self.assertEqual(self._get(self.token.key).status_code, 401)
+        self.assertEqual(self._get(new_token.key).status_code, 200)
+
+    def test_user_changed(self):
+        """
+        Check that the token of a changed user is not used with the old user, while logins
+        keep it cached.
+        """
+        self.assertEqual(self._get(self.token.key).status_code, 200)
+        self.client.login(username='staff', password='staff')
+        self.client.logout()
+        with CaptureQueriesContext(connection) as queries:
+            self._get(self.token.key)
+        self.assertNoAuthQueries(queries)
+
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self._get(self.token.key).status_code, 403)
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        self.assertEqual(self._get(self.token.key).status_code, 401)
@@ -0,0 +1,82 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+class TestDwellTimesAPI(TestCase):
+    DWELL_TIMES_URL = '/api/dwell-times/'
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser('admin', 'admin@trackerino.cz', 'admin')
+        self.common_user = User.objects.create_user(
+            username='common', email='common@trackerino.cz', password='common'
+        )
+        category = Category.objects.create(name='Cat1')
+        created_at = timezone.make_aware(datetime.datetime(2023, 1, 2, 10))
+        Issue.objects.bulk_create_with_history(
+            [
+                Issue(
+                    title='Testing issue 1',
+                    category=category,
+                    reporter=self.superuser,
+                    assignee=self.superuser,
+                )
+            ],
+            [
+                [
+                    (IssueStateChange.State.TO_DO, created_at),
+                    (IssueStateChange.State.DONE, created_at + datetime.timedelta(hours=2)),
+                ]
+            ],
+        )
+
+    def _get(self, user: User, **params):
+        return self.client.get(
+            self.DWELL_TIMES_URL,
+            params,
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=user).key}',
+        )
+
+    def test_dwell_times_grouped_by_category(self):
+        """
+        Check that the API returns the dwell time statistics per state and category.
+        """
+        response = self._get(self.superuser, group_by='category')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                'TO_DO': [
+                    {
+                        'group': 'Cat1',
+                        'count': 1,
+                        'shortest': '02:00:00',
+                        'longest': '02:00:00',
+                        'avg': '02:00:00',
+                    }
+                ]
+            },
+        )
+        response = self._get(self.superuser, include_current='true')
+        self.assertEqual(set(response.json()), {'TO_DO', 'DONE'})
+
+    def test_dwell_times_invalid_group_by(self):
+        """
+        Check that grouping by an unsupported value is rejected.
+        """
+        response = self._get(self.superuser, group_by='title')
+        self.assertEqual(response.status_code, 400)
+
+    def test_dwell_times_common_user(self):
+        """
+        Check that the API cannot be called by a non-staff user.
+        """
+        response = self._get(self.common_user)
+        self.assertEqual(response.status_code, 403)
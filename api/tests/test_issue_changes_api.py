@@ -0,0 +1,125 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+@override_settings(API_CHANGES_DELAY=0)
+class TestIssueChangesAPI(TestCase):
+    CHANGES_URL = '/api/issues/changes/'
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser('admin', 'admin@trackerino.cz', 'password')
+        self.client.force_authenticate(self.superuser)
+        category = Category.objects.create(name='Category A')
+        self.issues = [
+            Issue.objects.create(
+                title=f'Issue {i}',
+                category=category,
+                reporter=self.superuser,
+                assignee=self.superuser,
+            )
+            for i in range(3)
+        ]
+
+    def _get_changes(self, **params) -> dict:
+        response = self.client.get(self.CHANGES_URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_changes(self):
+        """
+        Check that issues are listed in the order of their changes, and then only the ones
+        changed (edited, or their states changed) after the cursor.
+        """
+        data = self._get_changes(page_size=2)
+        self.assertEqual([issue['title'] for issue in data['results']], ['Issue 0', 'Issue 1'])
+        self.assertTrue(data['more'])
+        data = self._get_changes(cursor=data['cursor'], page_size=2)
+        self.assertEqual([issue['title'] for issue in data['results']], ['Issue 2'])
+        self.assertFalse(data['more'])
+        cursor = data['cursor']
+        self.assertEqual(
+            self._get_changes(cursor=cursor), {'cursor': cursor, 'more': False, 'results': []}
+        )
+
+        self.issues[1].update_state(IssueStateChange.State.DONE)
+        self.issues[0].description = 'Edited'
+        self.issues[0].save()
+        data = self._get_changes(cursor=cursor)
+        self.assertEqual(
+            [
+                (issue['title'], issue['current_state'], issue['description'])
+                for issue in data['results']
+            ],
+            [('Issue 1', 'DONE', None), ('Issue 0', 'TO DO', 'Edited')],
+        )
+        self.assertEqual(self._get_changes(cursor=data['cursor'])['results'], [])
+
+    def test_changes_renames(self):
+        """
+        Check that issues change with the names of their category and users, but not
+        with other changes of them.
+        """
+        cursor = self._get_changes()['cursor']
+        self.superuser.set_password('changed')
+        self.superuser.email = 'changed@trackerino.cz'
+        self.superuser.save()
+        category = Category.objects.get()
+        category.save()
+        self.assertEqual(self._get_changes(cursor=cursor)['results'], [])
+
+        self.superuser.username = 'renamed'
+        self.superuser.save()
+        data = self._get_changes(cursor=cursor)
+        self.assertEqual(len(data['results']), 3)
+        category.name = 'Renamed category'
+        category.save()
+        self.assertEqual(
+            {issue['category'] for issue in self._get_changes(cursor=data['cursor'])['results']},
+            {'Renamed category'},
+        )
+
+    def test_changes_same_time(self):
+        """
+        Check that issues changed at the same time are not skipped between pages.
+        """
+        updated_at = timezone.now() - datetime.timedelta(minutes=1)
+        Issue.objects.update(updated_at=updated_at)
+        data = self._get_changes(page_size=1)
+        titles = [issue['title'] for issue in data['results']]
+        while data['more']:
+            data = self._get_changes(cursor=data['cursor'], page_size=1)
+            titles += [issue['title'] for issue in data['results']]
+        self.assertEqual(titles, ['Issue 0', 'Issue 1', 'Issue 2'])
+
+    @override_settings(API_CHANGES_DELAY=60)
+    def test_changes_delay(self):
+        """
+        Check that issues appear in the feed only once their changes are old enough
+        (so that changes committed late are not skipped).
+        """
+        self.assertEqual(self._get_changes()['results'], [])
+        Issue.objects.filter(pk=self.issues[2].pk).update(
+            updated_at=timezone.now() - datetime.timedelta(minutes=2)
+        )
+        self.assertEqual(
+            [issue['title'] for issue in self._get_changes()['results']], ['Issue 2']
+        )
+
+    def test_changes_invalid_cursor(self):
+        """
+        Check that malformed cursors and cursors out of range are rejected.
+        """
+        for cursor in ('abc', '1.', '-1.1', '9' * 30 + '.1', '1.' + '9' * 30):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.CHANGES_URL, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.json())
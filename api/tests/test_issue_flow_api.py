@@ -0,0 +1,118 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+class TestIssueFlowAPI(TestCase):
+    ISSUE_FLOW_URL = '/api/issue-flow/'
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser('admin', 'admin@trackerino.cz', 'admin')
+        self.common_user = User.objects.create_user(
+            username='common', email='common@trackerino.cz', password='common'
+        )
+        category = Category.objects.create(name='Cat1')
+        Issue.objects.bulk_create_with_history(
+            [
+                Issue(
+                    title='Testing issue 1',
+                    category=category,
+                    reporter=self.superuser,
+                    assignee=self.superuser,
+                )
+            ],
+            [
+                [
+                    (
+                        IssueStateChange.State.TO_DO,
+                        timezone.make_aware(datetime.datetime(2023, 1, 2, 10)),
+                    ),
+                    (
+                        IssueStateChange.State.DONE,
+                        timezone.make_aware(datetime.datetime(2023, 1, 3, 10)),
+                    ),
+                ]
+            ],
+        )
+
+    def _get(self, user: User, **params):
+        return self.client.get(
+            self.ISSUE_FLOW_URL,
+            params,
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=user).key}',
+        )
+
+    def test_issue_flow_per_day(self):
+        """
+        Check that the API returns the flow of issues per day in the requested range.
+        """
+        response = self._get(self.superuser, period='day', until='2023-01-04')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    'start': '2023-01-02',
+                    'created': 1,
+                    'resolved': 0,
+                    'wip': 0,
+                    'states': {'TO_DO': 1, 'IN_PROGRESS': 0, 'DONE': 0, 'CANCELED': 0},
+                },
+                {
+                    'start': '2023-01-03',
+                    'created': 0,
+                    'resolved': 1,
+                    'wip': 0,
+                    'states': {'TO_DO': 0, 'IN_PROGRESS': 0, 'DONE': 1, 'CANCELED': 0},
+                },
+                {
+                    'start': '2023-01-04',
+                    'created': 0,
+                    'resolved': 0,
+                    'wip': 0,
+                    'states': {'TO_DO': 0, 'IN_PROGRESS': 0, 'DONE': 1, 'CANCELED': 0},
+                },
+            ],
+        )
+
+    def test_issue_flow_invalid_period(self):
+        """
+        Check that an unsupported period is rejected.
+        """
+        response = self._get(self.superuser, period='year')
+        self.assertEqual(response.status_code, 400)
+
+    def test_issue_flow_range(self):
+        """
+        Check that ranges which are reversed or have too many periods are rejected,
+        and that the periods reach up to the last representable week.
+        """
+        for params in (
+            {'since': '2023-01-04', 'until': '2023-01-03'},
+            {'since': '2000-01-01', 'until': '2300-01-01'},
+            {'until': '2300-01-01'},
+            {'period': 'week', 'until': '9999-12-31'},
+            {'period': 'week', 'since': '0001-01-01'},
+        ):
+            with self.subTest(**params):
+                self.assertEqual(self._get(self.superuser, **params).status_code, 400)
+        response = self._get(self.superuser, period='week', since='9999-12-20', until='9999-12-31')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(bucket['start'], bucket['states']['DONE']) for bucket in response.json()],
+            [('9999-12-20', 1), ('9999-12-27', 1)],
+        )
+
+    def test_issue_flow_common_user(self):
+        """
+        Check that the API cannot be called by a non-staff user.
+        """
+        response = self._get(self.common_user)
+        self.assertEqual(response.status_code, 403)
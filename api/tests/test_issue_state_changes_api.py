@@ -0,0 +1,157 @@
+import asyncio
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+def parse_events(response) -> list[dict]:
+    """
+    Parse server-sent events into dicts of their fields (with the data decoded from JSON).
+    """
+    events = []
+    for message in response.content.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.splitlines())
+        if 'data' in fields:
+            fields['data'] = json.loads(fields['data'])
+        if fields:
+            events.append(fields)
+    return events
+
+
+@override_settings(API_EVENTS_TIMEOUT=0, API_CHANGES_DELAY=0)
+class TestIssueStateChangesAPI(TestCase):
+    STATE_CHANGES_URL = '/api/issue-state-changes/'
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = AsyncClient()
+        self.staff_user = User.objects.create_user(username='staff', is_staff=True)
+        self.token = Token.objects.get(user=self.staff_user).key
+        self.issue = Issue.objects.create(
+            title='Issue',
+            category=Category.objects.create(name='Category A'),
+            reporter=self.staff_user,
+            assignee=self.staff_user,
+        )
+        self.first_change = self.issue.last_state_change
+        self.issue.update_state(IssueStateChange.State.IN_PROGRESS)
+        self.issue.update_state(IssueStateChange.State.DONE)
+
+    async def test_state_changes_after(self):
+        """
+        Check that the state changes after a given one are sent as events, oldest first.
+        """
+        response = await self.client.get(
+            self.STATE_CHANGES_URL,
+            {'after': self.first_change.id},
+            AUTHORIZATION=f'Token {self.token}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'text/event-stream')
+        events = parse_events(response)
+        self.assertEqual(events[0], {'retry': '100'})
+        self.assertEqual(
+            [(event['data']['issue'], event['data']['new_state']) for event in events[1:]],
+            [(self.issue.id, 'IN_PROGRESS'), (self.issue.id, 'DONE')],
+        )
+        self.assertEqual(events[-1]['id'], str(self.issue.last_state_change_id))
+        self.assertEqual(events[-1]['data']['id'], self.issue.last_state_change_id)
+
+    async def test_state_changes_last_event_id(self):
+        """
+        Check that a reconnecting client gets the state changes after its last event.
+        """
+        response = await self.client.get(
+            self.STATE_CHANGES_URL,
+            {'after': self.first_change.id},
+            AUTHORIZATION=f'Token {self.token}',
+            LAST_EVENT_ID=str(self.issue.last_state_change_id - 1),
+        )
+        events = parse_events(response)
+        self.assertEqual([event['data']['new_state'] for event in events[1:]], ['DONE'])
+
+    async def test_state_changes_none(self):
+        """
+        Check that a client without new state changes gets the ID to resume from.
+        """
+        response = await self.client.get(
+            self.STATE_CHANGES_URL, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(
+            parse_events(response),
+            [{'retry': '100'}, {'id': str(self.issue.last_state_change_id)}],
+        )
+
+    @override_settings(API_EVENTS_TIMEOUT=10, API_EVENTS_POLL_INTERVAL=0.01)
+    async def test_state_changes_wait(self):
+        """
+        Check that the response waits for a new state change.
+        """
+
+        async def change_state():
+            await asyncio.sleep(0.1)
+            await sync_to_async(self.issue.update_state)(IssueStateChange.State.CANCELED)
+
+        response, _ = await asyncio.gather(
+            self.client.get(self.STATE_CHANGES_URL, AUTHORIZATION=f'Token {self.token}'),
+            change_state(),
+        )
+        events = parse_events(response)
+        self.assertEqual([event['data']['new_state'] for event in events[1:]], ['CANCELED'])
+
+    @override_settings(API_CHANGES_DELAY=60)
+    async def test_state_changes_delay(self):
+        """
+        Check that state changes are sent only once they are old enough, and not before
+        the older changes with lower IDs (which may be committed late).
+        """
+
+        async def get_states() -> list[str]:
+            response = await self.client.get(
+                self.STATE_CHANGES_URL,
+                {'after': self.first_change.id},
+                AUTHORIZATION=f'Token {self.token}',
+            )
+            return [
+                event['data']['new_state'] for event in parse_events(response) if 'data' in event
+            ]
+
+        self.assertEqual(await get_states(), [])
+        # Only the last change is old enough.
+        await IssueStateChange.objects.filter(pk=self.issue.last_state_change_id).aupdate(
+            occurred_at=timezone.now() - datetime.timedelta(minutes=2)
+        )
+        self.assertEqual(await get_states(), [])
+        await IssueStateChange.objects.filter(pk__gt=self.first_change.id).aupdate(
+            occurred_at=timezone.now() - datetime.timedelta(minutes=2)
+        )
+        self.assertEqual(await get_states(), ['IN_PROGRESS', 'DONE'])
+        # Without a cursor, from the latest change which is old enough.
+        response = await self.client.get(
+            self.STATE_CHANGES_URL, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(parse_events(response)[-1], {'id': str(self.issue.last_state_change_id)})
+
+    async def test_state_changes_invalid(self):
+        """
+        Check that state changes are not sent to anonymous users or after an invalid ID.
+        """
+        response = await self.client.get(self.STATE_CHANGES_URL)
+        self.assertEqual(response.status_code, 401)
+        response = await self.client.get(
+            self.STATE_CHANGES_URL, AUTHORIZATION=f'Token {self.token}', LAST_EVENT_ID='x'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('after', response.json())
+        response = await self.client.get(
+            self.STATE_CHANGES_URL, {'after': '9' * 30}, AUTHORIZATION=f'Token {self.token}'
+        )
+        self.assertEqual(response.status_code, 400)
@@ -1,5 +1,12 @@
+import datetime
+import json
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
@@ -11,6 +18,7 @@ class TestIssuesAPI(TestCase):
     ISSUE_DETAIL_URL = '/api/issues/%s/'
 
     def setUp(self) -> None:
+        cache.clear()
         self.client = APIClient()
         self.superuser_raw_password = 'password1234'
         self.superuser = User.objects.create_superuser(
@@ -36,7 +44,7 @@ class TestIssuesAPI(TestCase):
         )
         response = self.client.get(self.LIST_ISSUES_URL)
         self.assertEqual(response.status_code, 200)
-        assert response.json() == []
+        assert response.json()['results'] == []
 
     def test_issues_list_staff_token(self):
         """
@@ -47,7 +55,7 @@ class TestIssuesAPI(TestCase):
             HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=self.staff_user).key}',
         )
         self.assertEqual(response.status_code, 200)
-        assert response.json() == []
+        assert response.json()['results'] == []
 
     def test_issues_list_common_token(self):
         """
@@ -86,7 +94,7 @@ class TestIssuesAPI(TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            response.json(),
+            response.json()['results'],
             [
                 {
                     'id': issue1.id,
@@ -185,3 +193,518 @@ class TestIssuesAPI(TestCase):
         # An issue with this ID does not exist.
         response = self.client.get(self.ISSUE_DETAIL_URL % 666)
         self.assertEqual(response.status_code, 404)
+
+
+class TestIssuesAPIQueries(TestCase):
+    LIST_ISSUES_URL = '/api/issues/'
+    ISSUE_DETAIL_URL = '/api/issues/%s/'
+    EXPORT_ISSUES_URL = '/api/issues/export/'
+    TRANSITION_ISSUES_URL = '/api/issues/transition/'
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser('admin', 'admin@trackerino.cz', 'admin')
+        self.authorization = f'Token {Token.objects.get(user=self.superuser).key}'
+        self.category = Category.objects.create(name='Cat1')
+
+    def _create_issues(self, count: int) -> None:
+        """
+        Quickly create `count` issues, each with a single state change.
+        """
+        first = Issue.objects.count()
+        issues = Issue.objects.bulk_create(
+            Issue(
+                title=f'Testing issue {first + i}',
+                description='',
+                category=self.category,
+                reporter=self.superuser,
+                assignee=self.superuser,
+            )
+            for i in range(count)
+        )
+        state_changes = IssueStateChange.objects.bulk_create(
+            IssueStateChange(issue=issue) for issue in issues
+        )
+        for issue, state_change in zip(issues, state_changes):
+            issue.last_state_change = state_change
+        Issue.objects.bulk_update(issues, ('last_state_change',))
+
+    def _list_issues(self, url: str = LIST_ISSUES_URL, **params) -> dict:
+        response = self.client.get(
+            url,
+            params,
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=self.superuser).key}',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_issues_list_constant_number_of_queries(self):
+        """
+        Check that listing 1000 issues takes as many queries as listing 10 issues.
+        """
+        self._create_issues(10)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(self._list_issues(page_size=1000)['results']), 10)
+        self._create_issues(990)
+        cache.clear()
+        with self.assertNumQueries(len(queries)):
+            self.assertEqual(len(self._list_issues(page_size=1000)['results']), 1000)
+
+    def test_issues_list_pagination(self):
+        """
+        Check that all issues can be listed page by page, following the `next` links.
+        """
+        self._create_issues(25)
+        titles = []
+        page = self._list_issues(page_size=10)
+        self.assertIsNone(page['previous'])
+        while True:
+            titles.extend(issue['title'] for issue in page['results'])
+            if page['next'] is None:
+                break
+            page = self._list_issues(page['next'])
+        self.assertEqual(titles, sorted(Issue.objects.values_list('title', flat=True)))
+
+    def test_issues_search(self):
+        """
+        Check that issues are searched by their titles and descriptions, from the best match
+        and page by page.
+        """
+        self._create_issues(25)
+        Issue.objects.filter(title__in=('Testing issue 3', 'Testing issue 4')).update(
+            description='Crash on startup'
+        )
+        Issue.objects.filter(title='Testing issue 5').update(title='Crash of the crash reporter')
+        page = self._list_issues(q='crash', page_size=2)
+        self.assertEqual(page['results'][0]['title'], 'Crash of the crash reporter')
+        titles = [issue['title'] for issue in page['results']]
+        page = self._list_issues(page['next'])
+        self.assertIsNone(page['next'])
+        titles.extend(issue['title'] for issue in page['results'])
+        self.assertEqual(
+            titles, ['Crash of the crash reporter', 'Testing issue 3', 'Testing issue 4']
+        )
+        self.assertEqual(self._list_issues(q='nothing')['results'], [])
+
+    def test_issues_search_pagination(self):
+        """
+        Check that all found issues are listed page by page, also the ones matching equally
+        and when their ranks change meanwhile.
+        """
+        self._create_issues(20)
+        found = list(Issue.objects.order_by('pk').values_list('pk', 'title')[:7])
+        for i, (pk, _title) in enumerate(found):
+            # From the best match, some of the issues matching equally.
+            Issue.objects.filter(pk=pk).update(description='Crash ' * (7 - i // 2) + 'on startup')
+        titles = []
+        page = self._list_issues(q='crash', page_size=2)
+        self.assertIsNone(page['previous'])
+        while True:
+            titles.extend(issue['title'] for issue in page['results'])
+            if page['next'] is None:
+                break
+            # More issues change the ranks of all found issues (but not their order).
+            Issue.objects.create(
+                title=f'Other issue {len(titles)}',
+                category=self.category,
+                reporter=self.superuser,
+                assignee=self.superuser,
+            )
+            page = self._list_issues(page['next'])
+        self.assertIsNotNone(page['previous'])
+        self.assertEqual(titles, [title for _pk, title in found])
+
+    def test_issues_filters(self):
+        """
+        Check that issues are filtered by their category, users, state and the time they got
+        into their state.
+        """
+        self._create_issues(5)
+        other_user = User.objects.create_user('other')
+        other_category = Category.objects.create(name='Cat2')
+        Issue.objects.filter(title='Testing issue 1').update(
+            category=other_category, assignee=other_user
+        )
+        Issue.objects.filter(title='Testing issue 2').update(reporter=other_user)
+        Issue.objects.get(title='Testing issue 3').update_state(IssueStateChange.State.DONE)
+        Issue.objects.filter(title='Testing issue 4').update(
+            state_changed_at=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+
+        def titles(**params):
+            return [issue['title'] for issue in self._list_issues(**params)['results']]
+
+        self.assertEqual(titles(category='Cat2'), ['Testing issue 1'])
+        self.assertEqual(titles(assignee='other'), ['Testing issue 1'])
+        self.assertEqual(titles(reporter='other'), ['Testing issue 2'])
+        self.assertEqual(titles(state='DONE'), ['Testing issue 3'])
+        self.assertEqual(titles(state='TO_DO', assignee='other'), ['Testing issue 1'])
+        self.assertEqual(titles(state_changed_before='2021-01-01T00:00:00Z'), ['Testing issue 4'])
+        self.assertEqual(
+            titles(state_changed_after='2021-01-01T00:00:00Z', category='Cat1', state='TO_DO'),
+            ['Testing issue 0', 'Testing issue 2'],
+        )
+        self.assertEqual(titles(category='Nonexistent'), [])
+
+    def test_issues_ordering(self):
+        """
+        Check that issues are listed page by page in the requested order, and that only
+        the supported orderings and filters are accepted.
+        """
+        self._create_issues(7)
+        for i, issue in enumerate(Issue.objects.order_by('-title')):
+            # The times of some issues are the same.
+            state_changed_at = datetime.datetime(2020, 1, 1 + i // 2, tzinfo=datetime.timezone.utc)
+            Issue.objects.filter(pk=issue.pk).update(state_changed_at=state_changed_at)
+        expected = list(
+            Issue.objects.order_by('-state_changed_at', '-id').values_list('title', flat=True)
+        )
+        titles = []
+        page = self._list_issues(ordering='-state_changed_at', page_size=2)
+        while True:
+            titles.extend(issue['title'] for issue in page['results'])
+            if page['next'] is None:
+                break
+            page = self._list_issues(page['next'])
+        self.assertEqual(titles, expected)
+        self.assertEqual(
+            [issue['title'] for issue in self._list_issues(ordering='-title')['results']],
+            sorted(expected, reverse=True),
+        )
+        for params in ({'ordering': 'description'}, {'state': 'UNKNOWN'}):
+            response = self.client.get(
+                self.LIST_ISSUES_URL, params, HTTP_AUTHORIZATION=self.authorization
+            )
+            self.assertEqual(response.status_code, 400)
+
+    @override_settings(API_MAX_PAGE_SIZE=20)
+    def test_issues_list_max_page_size(self):
+        """
+        Check that the page size cannot exceed the configured maximum.
+        """
+        self._create_issues(25)
+        self.assertEqual(len(self._list_issues(page_size=1000)['results']), 20)
+
+    @override_settings(API_EXPORT_CHUNK_SIZE=7)
+    def test_issues_export(self):
+        """
+        Check that the export streams all issues as NDJSON, in the same format as the list.
+        """
+        self._create_issues(25)
+        Issue.objects.first().update_state(IssueStateChange.State.DONE)
+        response = self.client.get(
+            self.EXPORT_ISSUES_URL,
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=self.superuser).key}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertTrue(response.streaming)
+        exported = [
+            json.loads(line) for line in b''.join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(exported, self._list_issues(page_size=100)['results'])
+
+    def _get(self, url: str, **headers):
+        return self.client.get(url, HTTP_AUTHORIZATION=self.authorization, **headers)
+
+    def test_issues_list_conditional_get(self):
+        """
+        Check that an unchanged list of issues is not sent again to a client which has it.
+        """
+        self._create_issues(3)
+        response = self._get(self.LIST_ISSUES_URL)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        # Validated by the cache only (the token is cached too).
+        with self.assertNumQueries(0):
+            response = self._get(self.LIST_ISSUES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Other pages have other ETags.
+        response = self._get(self.LIST_ISSUES_URL + '?page_size=1', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Any change of an issue changes the ETag.
+        Issue.objects.first().update_state(IssueStateChange.State.DONE)
+        response = self._get(self.LIST_ISSUES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.category.name = 'Renamed category'
+        self.category.save()
+        response = self._get(self.LIST_ISSUES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['category'], 'Renamed category')
+
+    def test_issue_detail_conditional_get(self):
+        """
+        Check that an unchanged issue is not sent again to a client which has it.
+        """
+        self._create_issues(2)
+        issue, other_issue = Issue.objects.order_by('pk')
+        url = self.ISSUE_DETAIL_URL % issue.pk
+        response = self._get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self._get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Changes of other issues do not matter.
+        other_issue.title = 'Renamed issue'
+        other_issue.save()
+        response = self._get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        issue.title = 'Renamed issue 2'
+        issue.save()
+        response = self._get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Renamed issue 2')
+
+        self.superuser.username = 'renamed'
+        self.superuser.save()
+        response = self._get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['reporter'], 'renamed')
+
+    def test_issues_cached(self):
+        """
+        Check that repeated reads of issues are served from the cache until the issues change.
+        """
+        self._create_issues(3)
+        issue = Issue.objects.order_by('title').first()
+        url = self.ISSUE_DETAIL_URL % issue.pk
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                list_response = self._get(self.LIST_ISSUES_URL)
+                detail_response = self._get(url)
+        # The version query of the detail only (the token is cached).
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(list_response.json()['results'][0], detail_response.json())
+
+        issue.update_state(IssueStateChange.State.IN_PROGRESS)
+        self.assertEqual(
+            self._get(self.LIST_ISSUES_URL).json()['results'][0]['current_state'],
+            'IN PROGRESS',
+        )
+        self.assertEqual(self._get(url).json()['current_state'], 'IN PROGRESS')
+
+        self.category.name = 'Renamed category'
+        self.category.save()
+        self.assertEqual(self._get(url).json()['category'], 'Renamed category')
+
+        # The same issue by another URL.
+        zero_padded_url = self.ISSUE_DETAIL_URL % f'0{issue.pk}'
+        self.assertEqual(self._get(zero_padded_url).json()['title'], issue.title)
+        issue.title = 'Renamed issue'
+        issue.save()
+        self.assertEqual(self._get(zero_padded_url).json()['title'], 'Renamed issue')
+
+    def test_issues_transition(self):
+        """
+        Check that the state of many issues can be changed at once.
+        """
+        self._create_issues(5)
+        issue_ids = list(Issue.objects.values_list('pk', flat=True)[:3])
+        response = self.client.post(
+            self.TRANSITION_ISSUES_URL,
+            {'issues': issue_ids, 'state': IssueStateChange.State.DONE},
+            format='json',
+            HTTP_AUTHORIZATION=self.authorization,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'count': 3})
+        self.assertEqual(
+            Issue.objects.filter(last_state_change__new_state=IssueStateChange.State.DONE).count(),
+            3,
+        )
+        response = self._get(self.ISSUE_DETAIL_URL % issue_ids[0])
+        self.assertEqual(response.json()['current_state'], 'DONE')
+
+    def test_issues_transition_invalid(self):
+        """
+        Check that invalid state transitions are rejected.
+        """
+        self._create_issues(1)
+        issue_id = Issue.objects.get().pk
+        for data in (
+            {'issues': [issue_id], 'state': 'FINISHED'},
+            {'issues': [], 'state': IssueStateChange.State.DONE},
+            {'issues': [issue_id, 12345], 'state': IssueStateChange.State.DONE},
+            {'issues': [2 ** 70], 'state': IssueStateChange.State.DONE},
+            {
+                'issues': [issue_id],
+                'state': IssueStateChange.State.DONE,
+                'occurred_at': (timezone.now() + datetime.timedelta(hours=1)).isoformat(),
+            },
+        ):
+            response = self.client.post(
+                self.TRANSITION_ISSUES_URL,
+                data,
+                format='json',
+                HTTP_AUTHORIZATION=self.authorization,
+            )
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(IssueStateChange.objects.count(), 1)
+
+    def test_issues_transition_without_permission(self):
+        """
+        Check that staff users who cannot change issues cannot change their states.
+        """
+        self._create_issues(1)
+        staff_user = User.objects.create_user(username='staff', password='staff', is_staff=True)
+        response = self.client.post(
+            self.TRANSITION_ISSUES_URL,
+            {'issues': [Issue.objects.get().pk], 'state': IssueStateChange.State.DONE},
+            format='json',
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=staff_user).key}',
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class TestIssuesWriteAPI(TestCase):
+    LIST_ISSUES_URL = '/api/issues/'
+    ISSUE_DETAIL_URL = '/api/issues/%s/'
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser('admin', 'admin@trackerino.cz', 'admin')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=self.superuser).key}'
+        )
+        self.staff_user = User.objects.create_user(
+            username='staff', email='staff@trackerino.cz', password='staff', is_staff=True
+        )
+        self.category = Category.objects.create(name='Cat1')
+
+    def _count_writes(self, queries: CaptureQueriesContext) -> int:
+        """
+        Count statements writing issues or their states.
+        """
+        return sum(
+            1
+            for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE'))
+            and ('"issues_issue"' in query['sql'] or '"issues_issuestatechange"' in query['sql'])
+        )
+
+    def test_create_issue(self):
+        """
+        Check that an issue can be created with a state, with a minimum of statements.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.LIST_ISSUES_URL,
+                {
+                    'title': 'New issue',
+                    'description': 'Description',
+                    'category': 'Cat1',
+                    'reporter': 'admin',
+                    'assignee': 'staff',
+                    'state': IssueStateChange.State.IN_PROGRESS,
+                },
+                format='json',
+            )
+        self.assertEqual(response.status_code, 201)
+        issue = Issue.objects.get()
+        self.assertEqual(
+            response.json(),
+            {
+                'id': issue.id,
+                'title': 'New issue',
+                'description': 'Description',
+                'category': 'Cat1',
+                'current_state': 'IN PROGRESS',
+                'reporter': 'admin',
+                'assignee': 'staff',
+            },
+        )
+        self.assertEqual(issue.issuestatechange_set.count(), 1)
+        # Insert the issue (with its state), insert its state change and point the issue to it.
+        self.assertEqual(self._count_writes(queries), 3)
+        (update,) = (
+            query['sql']
+            for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "issues_issue"')
+        )
+        self.assertRegex(update, r'^UPDATE "issues_issue" SET "last_state_change_id" = \S+ WHERE')
+
+        # Without a state, the issue gets the default one.
+        response = self.client.post(
+            self.LIST_ISSUES_URL,
+            {'title': 'New issue 2', 'category': 'Cat1', 'reporter': 'admin', 'assignee': 'admin'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['current_state'], 'TO DO')
+
+    def test_update_issue(self):
+        """
+        Check that an issue and its state can be updated with a minimum of statements.
+        """
+        issue = Issue.objects.create(
+            title='Issue',
+            description='',
+            category=self.category,
+            reporter=self.superuser,
+            assignee=self.superuser,
+        )
+        url = self.ISSUE_DETAIL_URL % issue.pk
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                url, {'assignee': 'staff', 'state': IssueStateChange.State.IN_PROGRESS}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['assignee'], 'staff')
+        self.assertEqual(response.json()['current_state'], 'IN PROGRESS')
+        # Insert the new state and update the issue.
+        self.assertEqual(self._count_writes(queries), 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(
+                url,
+                {
+                    'title': 'Renamed issue',
+                    'description': 'Description',
+                    'category': 'Cat1',
+                    'reporter': 'staff',
+                    'assignee': 'staff',
+                },
+                format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Renamed issue')
+        self.assertEqual(response.json()['current_state'], 'IN PROGRESS')
+        self.assertEqual(self._count_writes(queries), 1)
+        self.assertEqual(issue.issuestatechange_set.count(), 2)
+        self.assertEqual(self.client.get(url).json()['title'], 'Renamed issue')
+
+    def test_write_issue_invalid(self):
+        """
+        Check that invalid issues are rejected.
+        """
+        response = self.client.post(
+            self.LIST_ISSUES_URL,
+            {'title': 'New issue', 'category': 'Cat2', 'reporter': 'admin', 'assignee': 'nobody'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'category', 'assignee'})
+        self.assertFalse(Issue.objects.exists())
+
+    def test_write_issue_without_permission(self):
+        """
+        Check that staff users without the permissions cannot create or update issues.
+        """
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=self.staff_user).key}'
+        )
+        response = self.client.post(
+            self.LIST_ISSUES_URL,
+            {'title': 'New issue', 'category': 'Cat1', 'reporter': 'admin', 'assignee': 'admin'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get(self.LIST_ISSUES_URL).status_code, 200)
@@ -0,0 +1,149 @@
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from issues.models import Issue, Category
+from trackerino import routers
+
+
+@override_settings(DATABASE_REPLICA='replica')
+class TestReplicaReads(TestCase):
+    """
+    Test the routing of reads to a replica of the database, in a separate SQLite file
+    which is not replicated (so whatever is read from it comes from the replica).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestReplicaReads, cls).setUpClass()
+        # Added after the set-up of the test databases, which knows only the configured ones.
+        cls.directory = tempfile.TemporaryDirectory()
+        connections.settings['replica'] = {
+            **connections.settings['default'],
+            'NAME': os.path.join(cls.directory.name, 'replica.sqlite3'),
+        }
+        call_command('migrate', database='replica', verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.directory.cleanup()
+        super(TestReplicaReads, cls).tearDownClass()
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user_a = User.objects.create_superuser('userA', '', 'password')
+        self.user_b = User.objects.create_superuser('userB', '', 'password')
+        self.category = Category.objects.create(name='Category A')
+        Issue.objects.create(
+            title='Issue on the primary',
+            category=self.category,
+            reporter=self.user_a,
+            assignee=self.user_a,
+        )
+
+    def _list_titles(self, user: User) -> list[str]:
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/issues/')
+        self.assertEqual(response.status_code, 200)
+        return [issue['title'] for issue in response.json()['results']]
+
+    def test_api_reads_from_replica(self):
+        """
+        Check that read-only API requests and reports read from the replica.
+        """
+        self.assertEqual(self._list_titles(self.user_a), [])
+        client = APIClient()
+        client.force_authenticate(self.user_a)
+        with CaptureQueriesContext(connections['replica']) as queries:
+            response = client.get('/api/resolving-times/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries)
+
+    def test_reads_after_write(self):
+        """
+        Check that a user who wrote something reads from the primary, unlike other users.
+        """
+        client = APIClient()
+        client.force_authenticate(self.user_a)
+        response = client.post(
+            '/api/issues/',
+            {
+                'title': 'New issue',
+                'category': 'Category A',
+                'reporter': 'userA',
+                'assignee': 'userB',
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self._list_titles(self.user_a), ['Issue on the primary', 'New issue'])
+        self.assertEqual(self._list_titles(self.user_b), [])
+        # The response read from the replica is not served to the user who wrote.
+        self.assertEqual(self._list_titles(self.user_a), ['Issue on the primary', 'New issue'])
+
+    def test_lists_from_replica_not_validated(self):
+        """
+        Check that lists read from the replica are sent without the ETag of the current issues
+        (so that a stale list is not confirmed to a client who has the current one).
+        """
+        client_a = APIClient()
+        client_a.force_authenticate(self.user_a)
+        client_a.post(
+            '/api/issues/',
+            {
+                'title': 'New issue',
+                'category': 'Category A',
+                'reporter': 'userA',
+                'assignee': 'userB',
+            },
+            format='json',
+        )
+        response = client_a.get('/api/issues/')
+        self.assertIn('ETag', response)
+        client_b = APIClient()
+        client_b.force_authenticate(self.user_b)
+        response = client_b.get('/api/issues/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+        self.assertNotIn('ETag', response)
+
+    def test_replica_cache_check(self):
+        """
+        Check that a cache of a single process is reported when reads go to a replica.
+        """
+        self.assertEqual(
+            [message.id for message in routers.check_replica_cache()], ['trackerino.W001']
+        )
+        redis_cache = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        with override_settings(CACHES=redis_cache):
+            self.assertEqual(routers.check_replica_cache(), [])
+        with override_settings(DATABASE_REPLICA=None):
+            self.assertEqual(routers.check_replica_cache(), [])
+
+    def test_router(self):
+        """
+        Check that reads go to the replica only where it is allowed and until a write.
+        """
+        self.assertEqual(Issue.objects.all().db, 'default')
+        with routers.database_routing():
+            self.assertEqual(Issue.objects.all().db, 'default')
+            routers.allow_replica_reads()
+            self.assertEqual(Issue.objects.all().db, 'replica')
+            issue = Issue.objects.using('default').get()
+            issue.description = 'Changed'
+            issue.save()
+            self.assertEqual(Issue.objects.all().db, 'default')
+        with override_settings(DATABASE_REPLICA=None), routers.database_routing():
+            routers.allow_replica_reads()
+            self.assertEqual(Issue.objects.all().db, 'default')
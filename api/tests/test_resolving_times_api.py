@@ -0,0 +1,71 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+class TestResolvingTimesAPI(TestCase):
+    RESOLVING_TIMES_URL = '/api/resolving-times/'
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser('admin', 'admin@trackerino.cz', 'admin')
+        self.common_user = User.objects.create_user(
+            username='common', email='common@trackerino.cz', password='common'
+        )
+        category = Category.objects.create(name='Cat1')
+        issue = Issue.objects.create(
+            title='Testing issue 1',
+            description='',
+            category=category,
+            reporter=self.superuser,
+            assignee=self.superuser,
+        )
+        issue.update_state(
+            IssueStateChange.State.DONE,
+            occurred_at=issue.last_state_change.occurred_at + datetime.timedelta(hours=2),
+        )
+
+    def _get(self, user: User, **params):
+        return self.client.get(
+            self.RESOLVING_TIMES_URL,
+            params,
+            HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=user).key}',
+        )
+
+    def test_resolving_times_grouped_by_category(self):
+        """
+        Check that the API returns the resolving time statistics per category.
+        """
+        response = self._get(self.superuser, group_by='category')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            [
+                {
+                    'group': 'Cat1',
+                    'count': 1,
+                    'shortest': '02:00:00',
+                    'longest': '02:00:00',
+                    'avg': '02:00:00',
+                }
+            ],
+        )
+
+    def test_resolving_times_invalid_group_by(self):
+        """
+        Check that grouping by an unsupported value is rejected.
+        """
+        response = self._get(self.superuser, group_by='title')
+        self.assertEqual(response.status_code, 400)
+
+    def test_resolving_times_common_user(self):
+        """
+        Check that the API cannot be called by a non-staff user.
+        """
+        response = self._get(self.common_user)
+        self.assertEqual(response.status_code, 403)
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from api import views
+from api import async_views, views
 
 app_name = 'issues'
 
@@ -10,4 +10,12 @@ router.register(r'issues', views.IssueViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('resolving-times/', views.ResolvingTimesView.as_view(), name='resolving-times'),
+    path('issue-flow/', views.IssueFlowView.as_view(), name='issue-flow'),
+    path('dwell-times/', views.DwellTimesView.as_view(), name='dwell-times'),
+    # Async views for ASGI.
+    path('issue-state-changes/', async_views.issue_state_changes, name='issue-state-changes'),
+    path('async/issues/', async_views.issue_list, name='async-issue-list'),
+    path('async/issues/export/', async_views.issue_export, name='async-issue-export'),
+    path('async/issues/<int:pk>/', async_views.issue_detail, name='async-issue-detail'),
 ]
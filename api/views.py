@@ -1,15 +1,287 @@
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework import mixins
 from rest_framework import viewsets
 from rest_framework import permissions
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from api.conditions import (
+    get_issue_version,
+    issues_etag,
+    issue_etag,
+    issue_last_modified,
+)
+from api.pagination import IssueCursorPagination, IssueSearchPagination
+from api.permissions import CanChangeIssues
+from issues import cache
+from issues.analytics import get_issue_flow, get_dwell_time_summary
 from issues.models import Issue
-from issues.serializers import IssueSerializer
+from issues.search import search_issues
+from issues.serializers import (
+    DwellTimesQuerySerializer,
+    IssueChangesQuerySerializer,
+    FlowBucketSerializer,
+    IssueFilterSerializer,
+    IssueFlowQuerySerializer,
+    IssueRowSerializer,
+    IssueStateTransitionSerializer,
+    IssueWriteSerializer,
+    TimeDeltasSummarySerializer,
+    ISSUE_ROW_FIELDS,
+    get_state_labels,
+    issue_row_to_dict,
+)
+from trackerino import routers
+
+
+class ReplicaReadsMixin:
+    """
+    Read-only requests read from the database replica, unless the user wrote something
+    recently; after a request which wrote something, the user reads from the primary.
+    """
 
+    def dispatch(self, request, *args, **kwargs):
+        with routers.database_routing():
+            response = super(ReplicaReadsMixin, self).dispatch(request, *args, **kwargs)
+            if routers.wrote():
+                routers.pin_to_primary(self.request.user)
+            return response
 
-class IssueViewSet(viewsets.ReadOnlyModelViewSet):
+    def initial(self, request, *args, **kwargs):
+        # The user is authenticated (and their permissions checked) from the primary.
+        super(ReplicaReadsMixin, self).initial(request, *args, **kwargs)
+        if request.method in permissions.SAFE_METHODS and not routers.is_pinned_to_primary(
+            request.user
+        ):
+            routers.allow_replica_reads()
+
+
+def _get_cached(key: str, default):
+    # Data read from the replica may be stale, so it is not shared with readers
+    # of the primary and it is cached only for a short time.
+    if routers.reads_from_replica():
+        return cache.get_or_set(f'{key}:replica', default, timeout=settings.DATABASE_REPLICA_LAG)
+    return cache.get_or_set(key, default)
+
+
+class IssueViewSet(
+    ReplicaReadsMixin,
+    mixins.CreateModelMixin,
+    mixins.UpdateModelMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """
-    API endpoint that allows issues to be viewed.
+    API endpoint that allows issues to be viewed, created and updated.
+    Listed (and exported) issues can be filtered (see `IssueFilterSerializer`), ordered
+    (`?ordering=`) and searched by their titles and descriptions (`?q=`).
+    """
+
+    LIST_ACTIONS = ('list', 'export')
+    WRITE_ACTIONS = ('create', 'update', 'partial_update')
+
+    # Issues are read as rows with the related objects joined in SQL
+    # and serialized without creating model instances.
+    queryset = Issue.objects.values(*ISSUE_ROW_FIELDS).order_by('title', 'id')
+    serializer_class = IssueRowSerializer
+    pagination_class = IssueCursorPagination
+    permission_classes = [permissions.IsAdminUser, permissions.DjangoModelPermissions]
+
+    def get_queryset(self):
+        if self.action in self.WRITE_ACTIONS:
+            # Issues are written as model instances, with everything needed for the response.
+            return Issue.objects.select_related('category', 'reporter', 'assignee')
+        queryset = super(IssueViewSet, self).get_queryset()
+        if self.action not in self.LIST_ACTIONS:
+            return queryset
+        filters = IssueFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        queryset = filters.filter(queryset)
+        ordering = filters.validated_data.get('ordering', '').lstrip('-')
+        if ordering and ordering not in ISSUE_ROW_FIELDS:
+            # The cursor of the next page is the value of the ordering field of the last row.
+            queryset = queryset.values(*ISSUE_ROW_FIELDS, ordering)
+        query = self.request.query_params.get('q')
+        if query:
+            queryset = search_issues(queryset, query)
+            if 'ordering' not in filters.validated_data:
+                # From the best match.
+                queryset = queryset.order_by('-rank', 'id')
+        return queryset
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('q') and 'ordering' not in params:
+                # Found issues ordered from the best match.
+                self._paginator = IssueSearchPagination()
+        return super(IssueViewSet, self).paginator
+
+    def get_serializer_class(self):
+        if self.action in self.WRITE_ACTIONS:
+            return IssueWriteSerializer
+        return super(IssueViewSet, self).get_serializer_class()
+
+    @method_decorator(condition(etag_func=issues_etag))
+    def list(self, request, *args, **kwargs):
+        data = _get_cached(
+            cache.get_list_key(request.build_absolute_uri()),
+            lambda: super(IssueViewSet, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    @method_decorator(condition(etag_func=issue_etag, last_modified_func=issue_last_modified))
+    def retrieve(self, request, *args, **kwargs):
+        updated_at = get_issue_version(request, kwargs['pk'])
+        if updated_at is None:
+            # No such issue.
+            return super(IssueViewSet, self).retrieve(request, *args, **kwargs)
+        data = _get_cached(
+            cache.get_detail_key(int(kwargs['pk']), updated_at),
+            lambda: super(IssueViewSet, self).retrieve(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    @action(detail=False)
+    def export(self, request):
+        """
+        Stream all issues as newline-delimited JSON, reading them from the database in chunks.
+
+        Not under ASGI, where Django iterates streamed responses in the event loop, in which
+        the database cannot be read. The async API exports the issues there instead.
+        """
+        if isinstance(request._request, ASGIRequest):
+            url = request.build_absolute_uri(reverse('api:async-issue-export'))
+            return Response(
+                {'detail': f'Issues are exported by {url} on this server.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        queryset = self.get_queryset()
+        # The rows are streamed after the request is routed, from the database chosen now.
+        rows = queryset.using(queryset.db).iterator(chunk_size=settings.API_EXPORT_CHUNK_SIZE)
+        state_labels = get_state_labels()
+        lines = (
+            json.dumps(
+                issue_row_to_dict(row, state_labels), ensure_ascii=False, separators=(',', ':')
+            )
+            + '\n'
+            for row in rows
+        )
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+    @action(detail=False)
+    def changes(self, request):
+        """
+        Issues changed (edited, or their states changed) after `?cursor=`, in the order
+        of their changes, with the cursor following them. Without a cursor, all issues
+        are listed from the least recently changed.
+        """
+        query = IssueChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        rows = list(query.filter(self.get_queryset().values(*ISSUE_ROW_FIELDS, 'updated_at')))
+        state_labels = get_state_labels()
+        return Response(
+            {
+                'cursor': (
+                    query.make_cursor(rows[-1]['updated_at'], rows[-1]['id'])
+                    if rows
+                    else query.validated_data.get('cursor')
+                ),
+                'more': len(rows) == query.validated_data['page_size'],
+                'results': [
+                    {**issue_row_to_dict(row, state_labels), 'updated_at': row['updated_at']}
+                    for row in rows
+                ],
+            }
+        )
+
+    @action(
+        detail=False,
+        methods=['post'],
+        serializer_class=IssueStateTransitionSerializer,
+        permission_classes=[permissions.IsAdminUser, CanChangeIssues],
+    )
+    def transition(self, request):
+        """
+        Change the state of many issues at once.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            count = Issue.objects.bulk_update_state(
+                serializer.validated_data['issues'],
+                serializer.validated_data['state'],
+                occurred_at=serializer.validated_data.get('occurred_at'),
+            )
+        except ValueError as e:
+            raise ValidationError({'issues': str(e)})
+        return Response({'count': count})
+
+
+class ResolvingTimesView(ReplicaReadsMixin, APIView):
+    """
+    API endpoint with statistics of resolving times of "DONE" issues,
+    optionally grouped by `?group_by=category|assignee|day|week|month`.
     """
 
-    queryset = Issue.objects.all().order_by('title')
-    serializer_class = IssueSerializer
     permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        group_by = request.query_params.get('group_by')
+        try:
+            summaries = Issue.objects.get_resolving_time_summary(group_by)
+        except ValueError as e:
+            raise ValidationError({'group_by': str(e)})
+        return Response(TimeDeltasSummarySerializer(summaries, many=True).data)
+
+
+class IssueFlowView(ReplicaReadsMixin, APIView):
+    """
+    API endpoint with the flow of issues (created, resolved, in progress and in each state)
+    per `?period=day|week`, optionally `?since=` and `?until=` given dates.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        query = IssueFlowQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        try:
+            # The range may be open, up to the days with any state changes.
+            buckets = get_issue_flow(
+                **query.validated_data, max_periods=settings.API_MAX_FLOW_PERIODS
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+        return Response(FlowBucketSerializer(buckets, many=True).data)
+
+
+class DwellTimesView(ReplicaReadsMixin, APIView):
+    """
+    API endpoint with statistics of the time issues spent in each state, optionally
+    grouped by `?group_by=category|assignee` and including the current states of issues
+    (`?include_current=true`).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        query = DwellTimesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        summaries = get_dwell_time_summary(**query.validated_data)
+        return Response(
+            {
+                state: TimeDeltasSummarySerializer(state_summaries, many=True).data
+                for state, state_summaries in summaries.items()
+            }
+        )
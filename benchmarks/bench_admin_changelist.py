@@ -0,0 +1,69 @@
+"""
+Measure how the time to render the admin changelist of issues grows with the number of issues,
+with the issue admin as it is and with an exact count and all columns loaded.
+
+Usage:
+    $ python -m benchmarks.bench_admin_changelist [largest number of issues]
+"""
+import sys
+import time
+
+from benchmarks.utils import setup_django, create_issues
+
+REPEAT = 5
+
+
+def main(largest_count: int) -> None:
+    setup_django()
+
+    from django.contrib import admin
+    from django.contrib.admin.views.main import ChangeList
+    from django.contrib.auth.models import User
+    from django.core.paginator import Paginator
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    from issues.admin import IssueAdmin
+    from issues.models import Issue
+
+    setup_test_environment()
+    client = Client()
+    client.force_login(User.objects.create_superuser('benchmark-admin', '', 'benchmark'))
+    url = reverse('admin:issues_issue_changelist')
+    issue_admin = admin.site._registry[Issue]
+    variants = {
+        'IssueAdmin': {},
+        'exact count': {
+            'paginator': Paginator,
+            'show_full_result_count': True,
+            'get_changelist': lambda request, **kwargs: ChangeList,
+        },
+    }
+
+    if largest_count < 1:
+        sys.exit('The number of issues must be positive.')
+    # Powers of ten from 1000, and the largest number of issues.
+    targets = [10 ** power for power in range(3, len(str(largest_count)))]
+    targets = [target for target in targets if target < largest_count] + [largest_count]
+    count = 0
+    for target in targets:
+        create_issues(target - count)
+        count = target
+        for label, overrides in variants.items():
+            for name, value in overrides.items():
+                setattr(issue_admin, name, value)
+            client.get(url)
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                assert client.get(url).status_code == 200
+            elapsed = (time.perf_counter() - started) / REPEAT
+            for name in overrides:
+                delattr(issue_admin, name)
+            print(f'{count:>8} issues, {label:>11}: {elapsed * 1000:7.1f} ms/page')
+    # Keep the class attributes of the admin untouched.
+    assert issue_admin.paginator is IssueAdmin.paginator
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
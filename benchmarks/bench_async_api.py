@@ -0,0 +1,154 @@
+"""
+Load test of the issue list by concurrent pollers: the sync API served by WSGI
+with a fixed number of worker threads (as e.g. gunicorn's gthread workers), and the sync
+and async APIs served by one ASGI process (an event loop). The applications are called
+in the process, without a server (and the network) in front of them.
+
+Usage:
+    $ python -m benchmarks.bench_async_api [pollers] [requests per poller] [WSGI threads]
+"""
+import asyncio
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import setup_django, create_issues
+
+ISSUES = 10000
+
+URLS = {
+    'sync': '/api/issues/',
+    'async': '/api/async/issues/',
+}
+
+
+def _query_string(request: int) -> str:
+    # A distinct query per request, so that the sync API does not serve cached pages.
+    return f'page_size=100&poll={request}'
+
+
+def run_wsgi(path: str, token: str, pollers: int, requests: int, threads: int) -> list[float]:
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def get(request: int) -> None:
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': _query_string(request),
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'HTTP_HOST': 'testserver',
+            'HTTP_AUTHORIZATION': f'Token {token}',
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+        }
+        statuses = []
+        b''.join(application(environ, lambda status, headers: statuses.append(status)))
+        assert statuses[0].startswith('200'), statuses[0]
+
+    with ThreadPoolExecutor(max_workers=threads) as server:
+
+        def poll(poller: int) -> list[float]:
+            # The latency includes waiting for a free worker thread.
+            latencies = []
+            for request in range(requests):
+                started = time.perf_counter()
+                server.submit(get, poller * requests + request).result()
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        with ThreadPoolExecutor(max_workers=pollers) as clients:
+            latencies = clients.map(poll, range(pollers))
+            return [latency for poller_latencies in latencies for latency in poller_latencies]
+
+
+def run_asgi(path: str, token: str, pollers: int, requests: int) -> list[float]:
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def get(request: int) -> float:
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'query_string': _query_string(request).encode(),
+            'headers': [(b'host', b'testserver'), (b'authorization', f'Token {token}'.encode())],
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 0),
+        }
+        statuses = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        started = time.perf_counter()
+        await application(scope, receive, send)
+        assert statuses[0] == 200, statuses[0]
+        return time.perf_counter() - started
+
+    async def poll(poller: int) -> list[float]:
+        return [await get(poller * requests + request) for request in range(requests)]
+
+    async def run() -> list[float]:
+        latencies = await asyncio.gather(*(poll(poller) for poller in range(pollers)))
+        return [latency for poller_latencies in latencies for latency in poller_latencies]
+
+    return asyncio.run(run())
+
+
+def main(pollers: int, requests: int, threads: int) -> None:
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import connection
+    from rest_framework.authtoken.models import Token
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    with tempfile.TemporaryDirectory() as directory:
+        # The database is shared by the threads serving the requests (unlike in-memory ones).
+        settings.DATABASES['default']['NAME'] = os.path.join(directory, 'db.sqlite3')
+        connection.close()
+        call_command('migrate', verbosity=0)
+        create_issues(ISSUES)
+        token = Token.objects.get(user=User.objects.create_user('poller', is_staff=True)).key
+        connection.close()
+        print(f'{ISSUES} issues, {pollers} pollers x {requests} requests, {threads} WSGI threads')
+        runs = {
+            'WSGI sync': lambda: run_wsgi(URLS['sync'], token, pollers, requests, threads),
+            'ASGI sync': lambda: run_asgi(URLS['sync'], token, pollers, requests),
+            'ASGI async': lambda: run_asgi(URLS['async'], token, pollers, requests),
+        }
+        for label, run in runs.items():
+            started = time.perf_counter()
+            latencies = run()
+            elapsed = time.perf_counter() - started
+            print(
+                f'{label:>10}: {len(latencies) / elapsed:6.0f} requests/s, latency '
+                f'median {statistics.median(latencies) * 1000:6.1f} ms, '
+                f'max {max(latencies) * 1000:6.1f} ms'
+            )
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 8,
+    )
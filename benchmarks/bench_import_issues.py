@@ -0,0 +1,75 @@
+"""
+Measure the throughput of importing issues with histories by the `import_issues` command,
+compared with saving the issues and changing their states one by one.
+
+Usage:
+    $ python -m benchmarks.bench_import_issues [number of issues]
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.utils import setup_django
+
+HISTORY = (
+    ('TO_DO', '2020-01-01T10:00:00+00:00'),
+    ('IN_PROGRESS', '2020-01-02T10:00:00+00:00'),
+    ('DONE', '2020-01-03T10:00:00+00:00'),
+)
+
+
+def main(count: int) -> None:
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.utils.dateparse import parse_datetime
+
+    from issues.models import Issue, Category, IssueStateChange
+
+    user = User.objects.create_user('benchmark')
+    category = Category.objects.create(name='Benchmark')
+    print(f'{count} issues with {len(HISTORY)} state changes each')
+
+    started = time.perf_counter()
+    for i in range(count):
+        issue = Issue(
+            title=f'Saved issue {i}',
+            description='Description of a benchmark issue.',
+            category=category,
+            reporter=user,
+            assignee=user,
+        )
+        states = [(IssueStateChange.State(s), parse_datetime(t)) for s, t in HISTORY]
+        issue.save(state=states[0][0])
+        for state, occurred_at in states[1:]:
+            issue.update_state(state, occurred_at)
+    elapsed = time.perf_counter() - started
+    print(f'{"save + update_state":>20}: {count / elapsed:8.0f} issues/s')
+
+    file_descriptor, path = tempfile.mkstemp(suffix='.ndjson')
+    try:
+        with os.fdopen(file_descriptor, 'w') as file:
+            for i in range(count):
+                record = {
+                    'title': f'Imported issue {i}',
+                    'description': 'Description of a benchmark issue.',
+                    'category': category.name,
+                    'reporter': user.username,
+                    'assignee': user.username,
+                    'history': [{'state': s, 'occurred_at': t} for s, t in HISTORY],
+                }
+                file.write(json.dumps(record) + '\n')
+        started = time.perf_counter()
+        call_command('import_issues', path, stdout=io.StringIO())
+        elapsed = time.perf_counter() - started
+    finally:
+        os.remove(path)
+    print(f'{"import_issues":>20}: {count / elapsed:8.0f} issues/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
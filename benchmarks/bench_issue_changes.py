@@ -0,0 +1,73 @@
+"""
+Compare syncing issues by exporting all of them and by reading the change feed
+(the issues changed after the cursor of the previous sync): the time and the number
+of bytes transferred per sync.
+
+Usage:
+    $ python -m benchmarks.bench_issue_changes [number of issues] [changes between syncs]
+"""
+import random
+import sys
+import time
+
+from benchmarks.utils import setup_django, create_issues
+
+SYNCS = 10
+
+
+def main(issues: int, changes: int) -> None:
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from issues.models import Issue, IssueState
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.API_CHANGES_DELAY = 0
+    create_issues(issues)
+    user = User.objects.create_user('sync', is_staff=True)
+    client = APIClient(HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=user).key}')
+
+    def sync_export(cursor) -> tuple:
+        response = client.get('/api/issues/export/')
+        return sum(len(chunk) for chunk in response.streaming_content), cursor
+
+    def sync_changes(cursor) -> tuple:
+        size = 0
+        more = True
+        while more:
+            params = {'page_size': 1000, **({'cursor': cursor} if cursor else {})}
+            response = client.get('/api/issues/changes/', params)
+            size += len(response.content)
+            data = response.json()
+            cursor, more = data['cursor'], data['more']
+        return size, cursor
+
+    print(f'{issues} issues, {changes} changed issues between syncs')
+    for label, sync in (('export', sync_export), ('changes', sync_changes)):
+        # The initial sync reads all issues.
+        _, cursor = sync(None)
+        elapsed = 0
+        size = 0
+        for _ in range(SYNCS):
+            Issue.objects.bulk_update_state(
+                random.sample(range(1, issues + 1), changes), random.choice(IssueState.values)
+            )
+            started = time.perf_counter()
+            sync_size, cursor = sync(cursor)
+            elapsed += time.perf_counter() - started
+            size += sync_size
+        print(
+            f'{label:>8}: {elapsed / SYNCS * 1000:8.1f} ms/sync, '
+            f'{size / SYNCS / 1024:8.1f} KiB/sync'
+        )
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
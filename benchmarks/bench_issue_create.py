@@ -0,0 +1,65 @@
+"""
+Measure the throughput of creating issues by the model and by the API.
+
+Usage:
+    $ python -m benchmarks.bench_issue_create [number of issues]
+"""
+import sys
+import time
+
+from benchmarks.utils import setup_django
+
+
+def _report(label: str, count: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f'{label:>22}: {count / elapsed:8.0f} issues/s')
+
+
+def main(count: int) -> None:
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.test.utils import setup_test_environment
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from issues.models import Issue, Category, IssueStateChange
+
+    setup_test_environment()
+    user = User.objects.create_superuser('benchmark', '', 'benchmark')
+    category = Category.objects.create(name='Benchmark')
+    print(f'{count} issues')
+
+    started = time.perf_counter()
+    for i in range(count):
+        Issue(
+            title=f'Model issue {i}',
+            description='Description of a benchmark issue.',
+            category=category,
+            reporter=user,
+            assignee=user,
+        ).save(state=IssueStateChange.State.IN_PROGRESS)
+    _report('Issue.save(state=...)', count, started)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=user).key}')
+    started = time.perf_counter()
+    for i in range(count):
+        response = client.post(
+            '/api/issues/',
+            {
+                'title': f'API issue {i}',
+                'description': 'Description of a benchmark issue.',
+                'category': category.name,
+                'reporter': user.username,
+                'assignee': user.username,
+                'state': IssueStateChange.State.IN_PROGRESS,
+            },
+            format='json',
+        )
+        assert response.status_code == 201, response.content
+    _report('POST /api/issues/', count, started)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
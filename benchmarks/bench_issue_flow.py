@@ -0,0 +1,69 @@
+"""
+Measure the time to compute the daily and weekly flow of issues over a year of history,
+to recount the transitions between states from the history, and to compute the time
+spent in each state from the history.
+
+Usage:
+    $ python -m benchmarks.bench_issue_flow [number of issues]
+"""
+import datetime
+import random
+import sys
+import time
+
+from benchmarks.utils import setup_django
+
+
+def main(count: int) -> None:
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from issues.analytics import get_issue_flow, get_dwell_time_summary
+    from issues.models import Issue, Category, IssueStateChange, IssueTransitionCount
+
+    user = User.objects.create_user('benchmark')
+    category = Category.objects.create(name='Benchmark')
+    random.seed(0)
+    year_start = timezone.now() - datetime.timedelta(days=365)
+    for first in range(0, count, 10000):
+        issues = []
+        histories = []
+        for i in range(first, min(first + 10000, count)):
+            created_at = year_start + datetime.timedelta(seconds=random.randrange(365 * 86400))
+            started_at = created_at + datetime.timedelta(hours=random.randrange(1, 200))
+            resolved_at = started_at + datetime.timedelta(hours=random.randrange(1, 500))
+            issues.append(
+                Issue(title=f'Issue {i}', category=category, reporter=user, assignee=user)
+            )
+            histories.append(
+                [
+                    (IssueStateChange.State.TO_DO, created_at),
+                    (IssueStateChange.State.IN_PROGRESS, started_at),
+                    (IssueStateChange.State.DONE, resolved_at),
+                ]
+            )
+        Issue.objects.bulk_create_with_history(issues, histories)
+    print(f'{count} issues with 3 state changes each over a year')
+
+    for period in ('day', 'week'):
+        started = time.perf_counter()
+        buckets = get_issue_flow(period)
+        elapsed = time.perf_counter() - started
+        print(f'{period:>7}: {len(buckets):4} buckets in {elapsed:.3f} s')
+
+    started = time.perf_counter()
+    IssueTransitionCount.objects.rebuild()
+    elapsed = time.perf_counter() - started
+    print(f'{"rebuild":>7}: {elapsed:.3f} s')
+
+    for group_by in (None, 'category'):
+        started = time.perf_counter()
+        get_dwell_time_summary(group_by)
+        elapsed = time.perf_counter() - started
+        print(f'dwell times by {group_by}: {elapsed:.3f} s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
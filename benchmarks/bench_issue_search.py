@@ -0,0 +1,69 @@
+"""
+Measure the time to search issues by a word in their titles and descriptions
+with the full-text search index and with a `LIKE` scan of the texts,
+and the time to get the first page of the best matches.
+
+Usage:
+    $ python -m benchmarks.bench_issue_search [number of issues]
+"""
+import random
+import sys
+import time
+
+from benchmarks.utils import setup_django
+
+REPEAT = 5
+WORDS = [f'word{i}' for i in range(10000)]
+
+
+def measure(label: str, function) -> None:
+    function()
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        result = function()
+    elapsed = (time.perf_counter() - started) / REPEAT
+    print(f'{label:>24}: {elapsed * 1000:8.2f} ms ({result} issues)')
+
+
+def main(count: int) -> None:
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.db.models import Q
+
+    from issues.models import Issue, Category
+
+    user = User.objects.create_user('benchmark')
+    category = Category.objects.create(name='Benchmark')
+    random.seed(0)
+    for first in range(0, count, 10000):
+        Issue.objects.bulk_create_with_history(
+            [
+                Issue(
+                    title=f'Issue {i} ' + ' '.join(random.choices(WORDS, k=3)),
+                    description=' '.join(random.choices(WORDS, k=50)),
+                    category=category,
+                    reporter=user,
+                    assignee=user,
+                )
+                for i in range(first, min(first + 10000, count))
+            ],
+            [[]] * min(10000, count - first),
+        )
+    print(f'{count} issues with 50 words each')
+
+    measure('full-text search', lambda: Issue.objects.search('word9999').count())
+    measure(
+        'LIKE scan',
+        lambda: Issue.objects.filter(
+            Q(title__icontains='word9999') | Q(description__icontains='word9999')
+        ).count(),
+    )
+    measure(
+        'first page by rank',
+        lambda: len(Issue.objects.search('word9999').order_by('-rank', 'pk')[:20]),
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,54 @@
+"""
+Compare the cost of serializing issues by `IssueSerializer` and `IssueRowSerializer`.
+
+Usage:
+    $ python -m benchmarks.bench_issue_serializers [number of issues]
+"""
+import sys
+import time
+
+from benchmarks.utils import setup_django, create_issues
+
+
+def main(count: int) -> None:
+    setup_django()
+    create_issues(count)
+
+    from rest_framework.renderers import JSONRenderer
+
+    from issues.models import Issue
+    from issues.serializers import IssueSerializer, IssueRowSerializer, ISSUE_ROW_FIELDS
+
+    renderer = JSONRenderer()
+    benchmarks = (
+        (
+            'IssueSerializer',
+            lambda: (
+                Issue.objects.select_related('category', 'reporter', 'assignee').order_by('title')
+            ),
+            IssueSerializer,
+        ),
+        (
+            'IssueRowSerializer',
+            lambda: Issue.objects.values(*ISSUE_ROW_FIELDS).order_by('title'),
+            IssueRowSerializer,
+        ),
+    )
+    print(f'{count} issues')
+    for label, get_queryset, serializer_class in benchmarks:
+        started = time.perf_counter()
+        issues = list(get_queryset())
+        fetched = time.perf_counter()
+        data = serializer_class(issues, many=True).data
+        serialized = time.perf_counter()
+        renderer.render(data)
+        rendered = time.perf_counter()
+        print(
+            f'{label:>18}: fetch {(fetched - started) / count * 1e6:6.1f} us/issue, '
+            f'serialize {(serialized - fetched) / count * 1e6:6.1f} us/issue, '
+            f'render {(rendered - serialized) / count * 1e6:6.1f} us/issue'
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,117 @@
+"""
+Load test of a SQLite database file by concurrent readers (reading pages of issues)
+and writers (changing states of issues), each operation done like a request
+(with the connection closed afterwards unless it is persistent), with the default pragmas
+of SQLite and a connection per request, and with the settings of trackerino.
+
+Usage:
+    $ python -m benchmarks.bench_sqlite_load [seconds] [readers] [writers]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import setup_django, create_issues
+
+ISSUES = 10000
+
+VARIANTS = {
+    'defaults': {
+        'CONN_MAX_AGE': 0,
+        # The default settings of SQLite (and the busy timeout of Django).
+        'SQLITE_PRAGMAS': {
+            'journal_mode': 'DELETE',
+            'synchronous': 'FULL',
+            'mmap_size': 0,
+            'cache_size': -2000,
+            'busy_timeout': 5000,
+        },
+    },
+    'trackerino': {},
+}
+
+
+def run_load(seconds: float, readers: int, writers: int) -> dict[str, list[int]]:
+    from django.db import close_old_connections, connection, OperationalError
+
+    from issues.models import Issue, IssueState
+    from issues.serializers import ISSUE_ROW_FIELDS
+
+    def read():
+        title = f'Benchmark issue {random.randrange(ISSUES)}'
+        rows = Issue.objects.filter(title__gte=title).order_by('title').values(*ISSUE_ROW_FIELDS)
+        list(rows[:100])
+
+    def write():
+        Issue.objects.bulk_update_state(
+            [random.randrange(1, ISSUES + 1)], random.choice(IssueState.values)
+        )
+
+    counts = {'read': [0, 0], 'write': [0, 0]}
+    stop_at = time.perf_counter() + seconds
+
+    def worker(kind, operation):
+        try:
+            while time.perf_counter() < stop_at:
+                # As at the start and the end of a request.
+                close_old_connections()
+                try:
+                    operation()
+                    counts[kind][0] += 1
+                except OperationalError:
+                    # The database is locked.
+                    counts[kind][1] += 1
+                close_old_connections()
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=('read', read)) for _ in range(readers)]
+    threads += [threading.Thread(target=worker, args=('write', write)) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main(seconds: float, readers: int, writers: int) -> None:
+    setup_django()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    default_pragmas = settings.SQLITE_PRAGMAS
+    default_max_age = settings.DATABASES['default']['CONN_MAX_AGE']
+    print(f'{ISSUES} issues, {readers} readers, {writers} writers, {seconds} s')
+    for label, overrides in VARIANTS.items():
+        settings.SQLITE_PRAGMAS = overrides.get('SQLITE_PRAGMAS', default_pragmas)
+        settings.DATABASES['default']['CONN_MAX_AGE'] = overrides.get(
+            'CONN_MAX_AGE', default_max_age
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            # (In-memory databases are not closed.)
+            settings.DATABASES['default']['NAME'] = os.path.join(directory, 'db.sqlite3')
+            connection.close()
+            call_command('migrate', verbosity=0)
+            create_issues(ISSUES)
+            connection.close()
+            counts = run_load(seconds, readers, writers)
+        print(
+            f'{label:>10}: '
+            + ', '.join(
+                f'{done / seconds:7.0f} {kind}s/s ({failed} locked)'
+                for kind, (done, failed) in counts.items()
+            )
+        )
+
+
+if __name__ == '__main__':
+    main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 2,
+    )
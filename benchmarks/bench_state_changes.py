@@ -0,0 +1,74 @@
+"""
+Compare discovering new state changes of issues by re-polling the whole list of issues
+and by asking for the state changes after the last seen one: the time and the number
+of bytes transferred per poll.
+
+Usage:
+    $ python -m benchmarks.bench_state_changes [number of issues] [changes between polls]
+"""
+import random
+import sys
+import time
+
+from benchmarks.utils import setup_django, create_issues
+
+POLLS = 20
+
+
+def main(issues: int, changes: int) -> None:
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    from django.db.models import Max
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from issues.models import Issue, IssueState, IssueStateChange
+
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.API_EVENTS_TIMEOUT = 0
+    settings.API_CHANGES_DELAY = 0
+    create_issues(issues)
+    user = User.objects.create_user('poller', is_staff=True)
+    client = APIClient(HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=user).key}')
+
+    def poll_list() -> int:
+        size = 0
+        url = '/api/issues/?page_size=1000'
+        while url:
+            response = client.get(url)
+            size += len(response.content)
+            url = response.json()['next']
+        return size
+
+    def poll_state_changes() -> int:
+        response = client.get('/api/issue-state-changes/', HTTP_LAST_EVENT_ID=str(last_seen))
+        return len(response.content)
+
+    print(f'{issues} issues, {changes} state changes between polls')
+    for label, poll in (('list', poll_list), ('state changes', poll_state_changes)):
+        elapsed = 0
+        size = 0
+        for _ in range(POLLS):
+            last_seen = IssueStateChange.objects.aggregate(id=Max('pk'))['id']
+            Issue.objects.bulk_update_state(
+                random.sample(range(1, issues + 1), changes), random.choice(IssueState.values)
+            )
+            # New state changes invalidate the cached lists anyway.
+            cache.clear()
+            started = time.perf_counter()
+            size += poll()
+            elapsed += time.perf_counter() - started
+        print(
+            f'{label:>15}: {elapsed / POLLS * 1000:8.1f} ms/poll, '
+            f'{size / POLLS / 1024:8.1f} KiB/poll'
+        )
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,54 @@
+"""
+Compare `TimeDeltas` and `CompactTimeDeltas` on a large number of resolving times.
+
+Usage:
+    $ python -m benchmarks.bench_time_deltas [number of time deltas]
+"""
+import datetime
+import random
+import sys
+import time
+import tracemalloc
+
+from issues.time_deltas import TimeDeltas, CompactTimeDeltas
+
+
+def _measure(label: str, build, stats) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    timedeltas = build()
+    built = time.perf_counter()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for stat in stats:
+        getattr(timedeltas, stat)
+    finished = time.perf_counter()
+    print(
+        f'{label:>18}: build {built - started:7.3f} s, '
+        f'{len(stats)} stats {finished - built:7.3f} s, '
+        f'peak memory {peak_memory / 2 ** 20:8.1f} MiB'
+    )
+
+
+def main(count: int) -> None:
+    seconds = [random.randint(60, 90 * 24 * 3600) for _ in range(count)]
+    print(f'{count} time deltas')
+    _measure(
+        'TimeDeltas',
+        lambda: TimeDeltas([datetime.timedelta(seconds=s) for s in seconds]),
+        ('shortest', 'longest', 'avg'),
+    )
+    _measure(
+        'CompactTimeDeltas',
+        lambda: CompactTimeDeltas(seconds),
+        ('shortest', 'longest', 'avg'),
+    )
+    _measure(
+        'Compact, all stats',
+        lambda: CompactTimeDeltas(seconds),
+        ('shortest', 'longest', 'avg', 'median', 'p90', 'p95', 'p99', 'stddev'),
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,50 @@
+"""
+Compare the time to authenticate an API request by `TokenAuthentication`
+and `CachedTokenAuthentication`, and the number of queries it takes.
+
+Usage:
+    $ python -m benchmarks.bench_token_auth [number of requests]
+"""
+import sys
+import time
+
+from benchmarks.utils import setup_django
+
+
+def main(count: int) -> None:
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api.authentication import CachedTokenAuthentication
+
+    user = User.objects.create_user('benchmark', is_staff=True)
+    request = Request(
+        APIRequestFactory().get(
+            '/api/issues/', HTTP_AUTHORIZATION=f'Token {Token.objects.get(user=user).key}'
+        )
+    )
+    print(f'{count} requests')
+    for authentication_class in (TokenAuthentication, CachedTokenAuthentication):
+        authentication = authentication_class()
+        authentication.authenticate(request)
+        with CaptureQueriesContext(connection) as queries:
+            authentication.authenticate(request)
+        started = time.perf_counter()
+        for _ in range(count):
+            authentication.authenticate(request)
+        elapsed = time.perf_counter() - started
+        print(
+            f'{authentication_class.__name__:>25}: {elapsed / count * 1e6:7.1f} us/request, '
+            f'{len(queries)} queries/request'
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
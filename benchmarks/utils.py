@@ -0,0 +1,52 @@
+import os
+
+import django
+
+
+def setup_django() -> None:
+    """
+    Set up Django with a fresh in-memory database for a benchmark.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'trackerino.settings')
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = ':memory:'
+    django.setup()
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+
+
+def create_issues(count: int) -> None:
+    """
+    Quickly create `count` issues, each with a single state change.
+    """
+    from django.contrib.auth.models import User
+
+    from issues.models import Issue, Category, IssueStateChange
+
+    user, _ = User.objects.get_or_create(username='benchmark')
+    category, _ = Category.objects.get_or_create(name='Benchmark')
+    first = Issue.objects.count()
+    issues = Issue.objects.bulk_create(
+        (
+            Issue(
+                title=f'Benchmark issue {first + i}',
+                description='Description of a benchmark issue. ' * 5,
+                category=category,
+                reporter=user,
+                assignee=user,
+            )
+            for i in range(count)
+        ),
+        batch_size=1000,
+    )
+    state_changes = IssueStateChange.objects.bulk_create(
+        (IssueStateChange(issue=issue) for issue in issues), batch_size=1000
+    )
+    for issue, state_change in zip(issues, state_changes):
+        issue.last_state_change = state_change
+        issue.state_changed_at = state_change.occurred_at
+    Issue.objects.bulk_update(
+        issues, ('last_state_change', 'state_changed_at'), batch_size=1000
+    )
@@ -1,7 +1,33 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList, ORDER_VAR
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
 
+from issues.analytics import PERIODS, get_issue_flow
 from issues.forms import IssueForm
-from issues.models import Category, Issue
+from issues.models import Category, Issue, IssueState
+from issues.paginators import EstimatedCountPaginator
+from issues.search import search_issues
+
+
+class IssueChangeList(ChangeList):
+    def get_queryset(self, request):
+        # Load only the columns shown in the list (e.g. not the long descriptions).
+        queryset = super(IssueChangeList, self).get_queryset(request)
+        return queryset.only(
+            'title',
+            'category__name',
+            'assignee__username',
+            'reporter__username',
+            'state',
+        )
+
+    def get_ordering(self, request, queryset):
+        # Found issues are listed from the best match, unless ordered by a column.
+        if self.query and ORDER_VAR not in self.params:
+            return ['-rank', 'pk']
+        return super(IssueChangeList, self).get_ordering(request, queryset)
 
 
 @admin.register(Issue)
@@ -13,9 +39,17 @@ class IssueAdmin(admin.ModelAdmin):
         'reporter',
         'current_state',
     )
-    ordering = ('last_state_change__new_state', 'last_state_change__occurred_at')
+    list_select_related = ('category', 'assignee', 'reporter')
+    # The ID makes the ordering deterministic and follows the index on states
+    # (which ends with the row ID on SQLite).
+    ordering = ('state', 'state_changed_at', 'pk')
+    # Large lists are not counted exactly, and the unfiltered list is not counted
+    # in addition to a filtered one.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_filter = ('category',)
-    search_fields = ('description__startswith',)
+    # Searched by the full-text search index (see `get_search_results`).
+    search_fields = ('title', 'description')
     form = IssueForm
 
     def _has_view_permission(self, request) -> bool:
@@ -29,9 +63,54 @@ class IssueAdmin(admin.ModelAdmin):
     def has_module_permission(self, request):
         return self._has_view_permission(request)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_issues(queryset, search_term), False
+
+    def get_changelist(self, request, **kwargs):
+        return IssueChangeList
+
+    def save_model(self, request, obj, form, change):
+        obj.save(state=form.get_state())
+
+    def get_urls(self):
+        return [
+            path(
+                'flow/',
+                self.admin_site.admin_view(self.flow_view),
+                name='issues_issue_flow',
+            ),
+            *super(IssueAdmin, self).get_urls(),
+        ]
+
+    def flow_view(self, request):
+        """
+        Page with the flow of issues per day or week (`?period=`).
+        """
+        if not self._has_view_permission(request):
+            raise PermissionDenied
+        period = request.GET.get('period')
+        if period not in PERIODS:
+            period = PERIODS[0]
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Flow of issues',
+            'periods': PERIODS,
+            'period': period,
+            'states': IssueState.choices,
+            # Templates cannot look up the states of buckets by variables.
+            'rows': [
+                (bucket, [bucket.states[state] for state in IssueState.values])
+                for bucket in get_issue_flow(period)
+            ],
+        }
+        return TemplateResponse(request, 'admin/issues/issue/flow.html', context)
+
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
-        extra_context['resolving_times'] = Issue.objects.get_resolving_times()
+        extra_context['resolving_times'] = Issue.objects.get_resolving_time_stats()
         return super(IssueAdmin, self).changelist_view(request, extra_context=extra_context)
 
 
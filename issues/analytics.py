@@ -0,0 +1,226 @@
+"""
+Analytics of the flow of issues through their states and of the time they spend in them.
+"""
+from __future__ import annotations
+
+import collections
+import dataclasses
+import datetime
+
+from django.db import connections, models
+from django.db.models.functions import Coalesce, Lead
+from django.utils import timezone
+
+from issues.models import IssueState, IssueStateChange, IssueTransitionCount
+from issues.time_deltas import TimeDeltasSummary
+
+PERIODS = ('day', 'week')
+
+
+@dataclasses.dataclass
+class FlowBucket:
+    """
+    Flow of issues during the day or week starting on `start`: the numbers of created
+    and resolved issues, and the numbers of issues in progress and in each state
+    at the end of the period (cumulative flow).
+    """
+
+    start: datetime.date
+    created: int
+    resolved: int
+    wip: int
+    states: dict[str, int]
+
+
+def get_period_start(day: datetime.date, period: str) -> datetime.date:
+    if period == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    return day
+
+
+def count_periods(since: datetime.date, until: datetime.date, period: str) -> int:
+    """
+    Count the days or weeks from the one of `since` to the one of `until` (both included).
+    """
+    step = 7 if period == 'week' else 1
+    return (get_period_start(until, period) - get_period_start(since, period)).days // step + 1
+
+
+def get_issue_flow(
+    period: str = 'day',
+    since: datetime.date | None = None,
+    until: datetime.date | None = None,
+    max_periods: int | None = None,
+) -> list[FlowBucket]:
+    """
+    Get the flow of issues per day or week (starting on Monday) from `since` to `until`
+    (by default from the first to the last day with any state changes), including the periods
+    without changes. Days are in the default time zone. Raise ValueError if there would be
+    more than `max_periods` of them.
+
+    The flow is computed from the daily counts of transitions between states,
+    so it takes one query over (at most) a few rows per day, regardless of the number of issues.
+    """
+    if period not in PERIODS:
+        raise ValueError(f'Cannot compute the flow of issues per {period!r}.')
+    transition_counts = IssueTransitionCount.objects.exclude(count=0)
+    if until is not None:
+        transition_counts = transition_counts.filter(day__lte=until)
+
+    created = collections.Counter()
+    resolved = collections.Counter()
+    state_deltas = collections.defaultdict(collections.Counter)
+    for day, previous_state, new_state, count in transition_counts.values_list(
+        'day', 'previous_state', 'new_state', 'count'
+    ):
+        start = get_period_start(day, period)
+        state_deltas[start][new_state] += count
+        if previous_state:
+            state_deltas[start][previous_state] -= count
+        else:
+            created[start] += count
+        if new_state == IssueState.DONE and previous_state != IssueState.DONE:
+            resolved[start] += count
+    if not state_deltas:
+        return []
+
+    step = datetime.timedelta(days=7 if period == 'week' else 1)
+    first = min(state_deltas) if since is None else get_period_start(since, period)
+    end = max(state_deltas) if until is None else get_period_start(until, period)
+    periods = count_periods(first, end, period)
+    if max_periods is not None and periods > max_periods:
+        raise ValueError(f'Cannot compute the flow of issues for more than {max_periods} periods.')
+    # The states at the beginning of the first period include all earlier transitions.
+    states = dict.fromkeys(IssueState.values, 0)
+    for start, deltas in state_deltas.items():
+        if start < first:
+            for state, delta in deltas.items():
+                states[state] += delta
+    buckets = []
+    # Counted rather than stepped past the end, which may be the last representable week.
+    for i in range(periods):
+        start = first + i * step
+        for state, delta in state_deltas.get(start, {}).items():
+            states[state] += delta
+        buckets.append(
+            FlowBucket(
+                start=start,
+                created=created[start],
+                resolved=resolved[start],
+                wip=states[IssueState.IN_PROGRESS],
+                states=dict(states),
+            )
+        )
+    return buckets
+
+
+DWELL_TIME_GROUP_BY_EXPRESSIONS = {
+    'category': models.F('issue__category__name'),
+    'assignee': models.F('issue__assignee__username'),
+}
+
+
+class TimeBetween(models.Func):
+    """
+    Time from the first to the second datetime expression, rounded to whole seconds
+    and computed natively by the database (Django subtracts datetimes on SQLite
+    by a function written in Python, which is several times slower).
+    """
+
+    arity = 2
+    output_field = models.DurationField()
+
+    template = '(%(end)s - %(start)s)'
+
+    def as_sql(self, compiler, connection, template=None, **extra_context):
+        (start_sql, start_params), (end_sql, end_params) = (
+            compiler.compile(expression) for expression in self.source_expressions
+        )
+        sql = (template or self.template) % {'start': start_sql, 'end': end_sql}
+        return sql, (*end_params, *start_params)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Durations are stored in microseconds on SQLite.
+        return self.as_sql(
+            compiler,
+            connection,
+            template=(
+                'CAST(ROUND((julianday(%(end)s) - julianday(%(start)s)) * 86400) AS INTEGER)'
+                ' * 1000000'
+            ),
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template='MAKE_INTERVAL(secs => ROUND(EXTRACT(EPOCH FROM %(end)s - %(start)s)))',
+        )
+
+
+def _to_timedelta(value) -> datetime.timedelta | None:
+    # Durations computed by raw SQL are not converted by the database backend:
+    # SQLite returns microseconds, other databases intervals.
+    if isinstance(value, (int, float)):
+        return datetime.timedelta(microseconds=value)
+    return value
+
+
+def get_dwell_time_summary(
+    group_by: str | None = None, include_current: bool = False
+) -> dict[str, list[TimeDeltasSummary]]:
+    """
+    Calculate the count, shortest, longest and average time issues spent in each state
+    (until their next state change), either for all issues or for each category or assignee,
+    in a single pass over the history of states using a window function. The time spent
+    in the current states of issues is included (until now) only if `include_current` is set.
+
+    The time spent in "IN_PROGRESS" is the cycle time of issues; the lead time is their
+    resolving time (see `IssueManager.get_resolving_time_summary`).
+    """
+    left_at = models.Window(
+        Lead('occurred_at'),
+        partition_by=models.F('issue'),
+        order_by=(models.F('occurred_at').asc(), models.F('pk').asc()),
+    )
+    if include_current:
+        left_at = Coalesce(left_at, models.Value(timezone.now()))
+    if group_by is None:
+        group = models.Value(None, output_field=models.CharField())
+    elif group_by in DWELL_TIME_GROUP_BY_EXPRESSIONS:
+        group = DWELL_TIME_GROUP_BY_EXPRESSIONS[group_by]
+    else:
+        raise ValueError(f'Cannot group dwell times by {group_by!r}.')
+    dwell_times = (
+        IssueStateChange.objects.annotate(
+            group_name=group,
+            dwell_time=TimeBetween('occurred_at', left_at),
+        )
+        .values('new_state', 'group_name', 'dwell_time')
+        .order_by()
+    )
+    # The ORM cannot aggregate over a window function, so the grouping is done around it.
+    sql, params = dwell_times.query.sql_with_params()
+    with connections[dwell_times.db].cursor() as cursor:
+        cursor.execute(
+            f'SELECT new_state, group_name, COUNT(dwell_time), MIN(dwell_time), '
+            f'MAX(dwell_time), AVG(dwell_time) FROM ({sql}) dwell_times '
+            f'WHERE dwell_time IS NOT NULL GROUP BY new_state, group_name '
+            f'ORDER BY group_name',
+            params,
+        )
+        rows = cursor.fetchall()
+
+    summaries = collections.defaultdict(list)
+    for state, group_name, count, shortest, longest, avg in rows:
+        avg = _to_timedelta(avg)
+        summaries[state].append(
+            TimeDeltasSummary(
+                group=group_name,
+                count=count,
+                shortest=_to_timedelta(shortest),
+                longest=_to_timedelta(longest),
+                avg=datetime.timedelta(seconds=round(avg.total_seconds())),
+            )
+        )
+    return {state: summaries[state] for state in IssueState.values if summaries[state]}
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.core import checks
+from django.db.models.signals import post_migrate
 
 
 class IssuesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'issues'
+
+    def ready(self):
+        from issues.search import restore_search_index
+        from trackerino.routers import check_replica_cache
+
+        post_migrate.connect(restore_search_index, sender=self)
+        checks.register(check_replica_cache, checks.Tags.caches)
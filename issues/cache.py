@@ -0,0 +1,80 @@
+"""
+Cache of serialized issues (e.g. API responses), invalidated whenever the issues change.
+"""
+from __future__ import annotations
+
+import datetime
+import hashlib
+import uuid
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Lists of issues are cached under the current generation, which changes with any issue.
+LIST_GENERATION_KEY = 'issues:list-generation'
+
+
+def get_list_generation() -> str:
+    """
+    Get the current generation of the lists of issues, e.g. as a version of all issues.
+    """
+    generation = cache.get(LIST_GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        cache.set(LIST_GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+async def aget_list_generation() -> str:
+    generation = await cache.aget(LIST_GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        await cache.aset(LIST_GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def get_detail_key(issue_id: int, updated_at: datetime.datetime) -> str:
+    """
+    Get the cache key of an issue in the version of its last update (so that it needs not
+    be invalidated, e.g. by requests which read it before the update and cache it after).
+    """
+    return f'issues:detail:{issue_id}:{updated_at.isoformat()}'
+
+
+def get_list_key(query: str) -> str:
+    """
+    Get the cache key of a list of issues identified by `query` (e.g. the requested URL).
+    """
+    query_hash = hashlib.sha256(query.encode()).hexdigest()
+    return f'issues:list:{get_list_generation()}:{query_hash}'
+
+
+def get_or_set(key: str, default, timeout: int | None = None):
+    """
+    Get the cached value, or cache (for `timeout` seconds, by default `ISSUES_CACHE_TIMEOUT`)
+    and return the result of calling `default`.
+    """
+    value = cache.get(key)
+    if value is None:
+        value = default()
+        if timeout is None:
+            timeout = settings.ISSUES_CACHE_TIMEOUT
+        cache.set(key, value, timeout=timeout)
+    return value
+
+
+def invalidate_issues(issue_ids: Iterable[int]) -> None:
+    """
+    Drop all cached lists of issues, as the given issues changed. Their cached details
+    are not hit anymore, as the issues are updated (see `get_detail_key`).
+    """
+
+    def invalidate():
+        cache.set(LIST_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+    # Invalidate right away so that the rest of the current transaction does not see stale data,
+    # and again after the commit, as other requests may have cached the old data meanwhile.
+    invalidate()
+    transaction.on_commit(invalidate)
@@ -10,23 +10,26 @@ class IssueForm(forms.ModelForm):
 
     state = forms.ChoiceField(choices=IssueStateChange.State.choices)
 
+    class Meta:
+        # The state is changed by saving the issue with the chosen state (see `save`),
+        # not by setting the field of the model.
+        exclude = ('state',)
+
     def get_initial_for_field(self, field: forms.Field, field_name: str):
         if field_name == 'state':
-            if (
-                hasattr(self.instance, 'last_state_change')
-                and self.instance.last_state_change is not None
-            ):
-                # Current state of the issue.
-                return self.instance.last_state_change.new_state
-            # Default state.
-            return IssueStateChange.DEFAULT_STATE
+            # Current state of the issue (the default state of a new one).
+            return self.instance.state
         return super(IssueForm, self).get_initial_for_field(field, field_name)
 
     def save(self, commit=True):
-        new_state = IssueStateChange.State(self.cleaned_data['state'])
-        issue = super(IssueForm, self).save(commit=commit)
-        # Save the new state to the Issue instance so that
-        # it is created in the `save` method on the model.
-        # FIXME: This is pretty awful and needs a better solution.
-        issue._set_new_state = new_state
+        issue = super(IssueForm, self).save(commit=False)
+        if commit:
+            issue.save(state=self.get_state())
+            self._save_m2m()
         return issue
+
+    def get_state(self) -> IssueStateChange.State:
+        """
+        Get the state of the issue chosen in the form.
+        """
+        return IssueStateChange.State(self.cleaned_data['state'])
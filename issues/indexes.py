@@ -0,0 +1,29 @@
+from django.db import models
+from django.db.models.functions import Collate
+
+
+class PrefixSearchIndex(models.Index):
+    """
+    Index of a text field usable for prefix searches (`startswith` lookups),
+    regardless of the length of the texts. What that takes depends on the database:
+
+    - SQLite: its LIKE is case-insensitive, so the index must use the NOCASE collation.
+    - PostgreSQL: a GIN trigram index (B-tree entries are limited in size);
+      requires the `pg_trgm` extension.
+    - Other databases: a plain index.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        (field_name,) = self.fields
+        vendor = schema_editor.connection.vendor
+        if vendor == 'sqlite':
+            index = models.Index(Collate(models.F(field_name), 'NOCASE'), name=self.name)
+        elif vendor == 'postgresql':
+            from django.contrib.postgres.indexes import GinIndex, OpClass
+
+            index = GinIndex(OpClass(models.F(field_name), 'gin_trgm_ops'), name=self.name)
+        else:
+            return super(PrefixSearchIndex, self).create_sql(
+                model, schema_editor, using=using, **kwargs
+            )
+        return index.create_sql(model, schema_editor, using=using, **kwargs)
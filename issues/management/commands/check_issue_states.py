@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from issues.models import Issue
+
+
+class Command(BaseCommand):
+    help = (
+        'Check that the state and the time of the last state change stored on issues match '
+        'their last state changes, optionally repairing them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repair', action='store_true', help='Copy the states of drifted issues again.'
+        )
+
+    def handle(self, *args, repair, **options):
+        if repair:
+            count = Issue.objects.repair_state_drift()
+            self.stdout.write(self.style.SUCCESS(f'Repaired states of {count} issues.'))
+            return
+        issue_ids = list(Issue.objects.with_state_drift().values_list('pk', flat=True))
+        if issue_ids:
+            raise CommandError(
+                f'States of {len(issue_ids)} issues differ from their last state changes: '
+                f'{issue_ids[:100]}. Run with --repair to fix them.'
+            )
+        self.stdout.write(self.style.SUCCESS('States of all issues are consistent.'))
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import itertools
+import json
+import time
+from typing import Iterator
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from issues.models import Issue, Category, IssueStateChange
+
+FORMATS = ('csv', 'ndjson')
+
+
+class Command(BaseCommand):
+    help = (
+        'Import issues with their histories of states from a CSV or NDJSON file. '
+        'Each record has a title, description, category, reporter, assignee (usernames) '
+        'and history. In NDJSON, the history is a list of objects with a state and occurred_at; '
+        'in CSV, it is a list of STATE:occurred_at separated by semicolons. '
+        'Missing categories are created; users must exist.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import.')
+        parser.add_argument(
+            '--format',
+            dest='file_format',
+            choices=FORMATS,
+            help='Format of the file (by default, by its extension).',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of issues imported by each transaction.',
+        )
+
+    def handle(self, *args, path, file_format, chunk_size, **options):
+        if file_format is None:
+            file_format = path.rsplit('.', 1)[-1].lower()
+            if file_format not in FORMATS:
+                raise CommandError(f'Cannot tell the format of {path}, use --format.')
+        if chunk_size < 1:
+            raise CommandError('The chunk size must be positive.')
+        self.category_ids = dict(Category.objects.values_list('name', 'id'))
+        self.user_ids = dict(User.objects.values_list('username', 'id'))
+
+        issue_count = state_change_count = 0
+        started_at = time.monotonic()
+        with open(path, newline='', encoding='utf-8') as file:
+            records = read_csv(file) if file_format == 'csv' else read_ndjson(file)
+            while chunk := list(itertools.islice(records, chunk_size)):
+                issues, categories, histories = self._build_chunk(
+                    chunk, first_number=issue_count + 1
+                )
+                try:
+                    with transaction.atomic():
+                        # Created categories are rolled back together with a failed chunk.
+                        category_ids = self._get_category_ids(set(categories))
+                        for issue, category in zip(issues, categories):
+                            issue.category_id = category_ids[category]
+                        Issue.objects.bulk_create_with_history(issues, histories)
+                except DatabaseError as error:
+                    raise CommandError(
+                        f'Cannot import records {issue_count + 1}-{issue_count + len(chunk)} '
+                        f'({error}), {issue_count} issues were imported.'
+                    )
+                self.category_ids = category_ids
+                issue_count += len(issues)
+                state_change_count += sum(max(len(history), 1) for history in histories)
+                elapsed = time.monotonic() - started_at
+                self.stdout.write(
+                    f'Imported {issue_count} issues and {state_change_count} state changes '
+                    f'({(issue_count + state_change_count) / elapsed:.0f} rows/s).'
+                )
+        self.stdout.write(self.style.SUCCESS(f'Imported {issue_count} issues.'))
+
+    def _build_chunk(self, records: list[dict], first_number: int) -> tuple[
+        list[Issue], list[str], list[list[tuple[IssueStateChange.State, datetime.datetime]]]
+    ]:
+        """
+        Build the issues of the records (without their categories), the names of their
+        categories and their histories.
+        """
+        issues = []
+        categories = []
+        histories = []
+        for number, record in enumerate(records, start=first_number):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError(f'{record!r} is not an object.')
+                if not isinstance(record['category'], str):
+                    raise ValueError(f'{record["category"]!r} is not a category name.')
+                issues.append(
+                    Issue(
+                        title=record['title'],
+                        description=record.get('description') or None,
+                        reporter_id=self._get_user_id(record['reporter']),
+                        assignee_id=self._get_user_id(record['assignee']),
+                    )
+                )
+                categories.append(record['category'])
+                histories.append(
+                    sorted(
+                        (
+                            (IssueStateChange.State(state), parse_occurred_at(occurred_at))
+                            for state, occurred_at in record.get('history') or ()
+                        ),
+                        key=lambda state_change: state_change[1],
+                    )
+                )
+            except (KeyError, ValueError, TypeError) as error:
+                raise CommandError(f'Invalid record {number}: {error!r}')
+        return issues, categories, histories
+
+    def _get_category_ids(self, names: set[str]) -> dict[str, int]:
+        """
+        Get the IDs of categories by their names, including the ones created for missing names.
+        """
+        category_ids = dict(self.category_ids)
+        missing_names = names - category_ids.keys()
+        if missing_names:
+            # `Category.save` would also update the (nonexistent) issues of each category.
+            Category.objects.bulk_create(Category(name=name) for name in missing_names)
+            category_ids.update(
+                Category.objects.filter(name__in=missing_names).values_list('name', 'id')
+            )
+        return category_ids
+
+    def _get_user_id(self, username: str) -> int:
+        try:
+            return self.user_ids[username]
+        except (KeyError, TypeError):
+            raise ValueError(f'User {username!r} does not exist.')
+
+
+def parse_occurred_at(value: str) -> datetime.datetime:
+    occurred_at = parse_datetime(value)
+    if occurred_at is None:
+        raise ValueError(f'{value!r} is not a valid date and time.')
+    if timezone.is_naive(occurred_at):
+        occurred_at = timezone.make_aware(occurred_at)
+    return occurred_at
+
+
+def read_csv(file) -> Iterator[dict]:
+    for row in csv.DictReader(file):
+        history = row.get('history') or ''
+        row['history'] = [
+            state_change.split(':', 1)
+            for state_change in map(str.strip, history.split(';'))
+            if state_change
+        ]
+        yield row
+
+
+def read_ndjson(file) -> Iterator[dict]:
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f'{record!r} is not an object.')
+            record['history'] = [
+                (state_change['state'], state_change['occurred_at'])
+                for state_change in record.get('history') or ()
+            ]
+        except (ValueError, KeyError, TypeError) as error:
+            raise CommandError(f'Invalid line {number}: {error!r}')
+        yield record
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from issues.models import IssueTransitionCount
+
+
+class Command(BaseCommand):
+    help = 'Recount the daily transitions of issues between states from the history of states.'
+
+    def handle(self, *args, **options):
+        count = IssueTransitionCount.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Counted {count} transitions of issues.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from issues.models import IssueResolution
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the resolving times of issues in state "DONE" from the history of states.'
+
+    def handle(self, *args, **options):
+        count = IssueResolution.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt resolving times of {count} issues.'))
@@ -0,0 +1,102 @@
+# Generated by Django 4.1.5 on 2026-10-18 13:39
+
+import datetime
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def populate_resolving_times(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Issue = apps.get_model('issues', 'Issue')
+    IssueResolution = apps.get_model('issues', 'IssueResolution')
+    ResolvingTimeStats = apps.get_model('issues', 'ResolvingTimeStats')
+    done_issues = (
+        Issue.objects.using(db_alias).filter(last_state_change__new_state='DONE')
+        .annotate(created_at=models.Min('issuestatechange__occurred_at'))
+        .values_list('id', 'created_at', 'last_state_change__occurred_at')
+    )
+    IssueResolution.objects.using(db_alias).bulk_create(
+        (
+            IssueResolution(
+                issue_id=issue_id,
+                resolved_at=resolved_at,
+                resolving_time=datetime.timedelta(
+                    seconds=round((resolved_at - created_at).total_seconds())
+                ),
+            )
+            for issue_id, created_at, resolved_at in done_issues.iterator()
+        ),
+        batch_size=1000,
+    )
+    aggregates = IssueResolution.objects.using(db_alias).aggregate(
+        count=models.Count('pk'),
+        total=models.Sum('resolving_time'),
+        shortest=models.Min('resolving_time'),
+        longest=models.Max('resolving_time'),
+    )
+    ResolvingTimeStats.objects.using(db_alias).create(
+        pk=1,
+        count=aggregates['count'],
+        total=aggregates['total'] or datetime.timedelta(),
+        shortest=aggregates['shortest'],
+        longest=aggregates['longest'],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0002_alter_issuestatechange_issue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueResolution',
+            fields=[
+                (
+                    'issue',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='resolution',
+                        serialize=False,
+                        to='issues.issue',
+                    ),
+                ),
+                ('resolved_at', models.DateTimeField()),
+                ('resolving_time', models.DurationField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResolvingTimeStats',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('count', models.PositiveBigIntegerField(default=0)),
+                ('total', models.DurationField(default=datetime.timedelta)),
+                ('shortest', models.DurationField(null=True)),
+                ('longest', models.DurationField(null=True)),
+            ],
+            options={'verbose_name_plural': 'resolving time stats'},
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='issuestatechange',
+            name='occurred_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(populate_resolving_times, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.5 on 2026-10-18 13:42
+
+from django.db import migrations, models
+import issues.indexes
+
+
+def create_trigram_extension(apps, schema_editor):
+    # Needed by `PrefixSearchIndex` on PostgreSQL.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0003_resolving_times'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issuestatechange',
+            index=models.Index(
+                fields=['issue', 'occurred_at'], name='issues_isc_issue_occurred_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='issuestatechange',
+            index=models.Index(
+                fields=['new_state', 'occurred_at'], name='issues_isc_state_occurred_idx'
+            ),
+        ),
+        migrations.RunPython(create_trigram_extension, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='issue',
+            index=issues.indexes.PrefixSearchIndex(
+                fields=['description'], name='issues_issue_descr_prefix_idx'
+            ),
+        ),
+    ]
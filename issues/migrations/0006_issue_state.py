@@ -0,0 +1,50 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:02
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def copy_last_states(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Issue = apps.get_model('issues', 'Issue')
+    IssueStateChange = apps.get_model('issues', 'IssueStateChange')
+    last_state_change = IssueStateChange.objects.filter(pk=models.OuterRef('last_state_change'))
+    Issue.objects.using(db_alias).filter(last_state_change__isnull=False).update(
+        state=models.Subquery(last_state_change.values('new_state')),
+        state_changed_at=models.Subquery(last_state_change.values('occurred_at')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0005_issue_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='state',
+            field=models.CharField(
+                choices=[
+                    ('TO_DO', 'TO DO'),
+                    ('IN_PROGRESS', 'IN PROGRESS'),
+                    ('DONE', 'DONE'),
+                    ('CANCELED', 'CANCELED'),
+                ],
+                default='TO_DO',
+                editable=False,
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='state_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunPython(copy_last_states, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['state', 'state_changed_at'], name='issues_issue_state_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:08
+
+import collections
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def count_transitions(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    IssueStateChange = apps.get_model('issues', 'IssueStateChange')
+    IssueTransitionCount = apps.get_model('issues', 'IssueTransitionCount')
+    counts = collections.Counter()
+    previous_issue_id = previous_state = None
+    for issue_id, new_state, occurred_at in (
+        IssueStateChange.objects.using(db_alias).order_by('issue_id', 'occurred_at', 'pk')
+        .values_list('issue_id', 'new_state', 'occurred_at')
+        .iterator()
+    ):
+        if issue_id != previous_issue_id:
+            previous_issue_id, previous_state = issue_id, ''
+        day = timezone.localdate(occurred_at, timezone.get_default_timezone())
+        counts[day, previous_state, new_state] += 1
+        previous_state = new_state
+    IssueTransitionCount.objects.using(db_alias).bulk_create(
+        (
+            IssueTransitionCount(
+                day=day, previous_state=previous_state, new_state=new_state, count=count
+            )
+            for (day, previous_state, new_state), count in counts.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0006_issue_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueTransitionCount',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('day', models.DateField()),
+                (
+                    'previous_state',
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ('TO_DO', 'TO DO'),
+                            ('IN_PROGRESS', 'IN PROGRESS'),
+                            ('DONE', 'DONE'),
+                            ('CANCELED', 'CANCELED'),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    'new_state',
+                    models.CharField(
+                        choices=[
+                            ('TO_DO', 'TO DO'),
+                            ('IN_PROGRESS', 'IN PROGRESS'),
+                            ('DONE', 'DONE'),
+                            ('CANCELED', 'CANCELED'),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='issuetransitioncount',
+            constraint=models.UniqueConstraint(
+                fields=('day', 'previous_state', 'new_state'),
+                name='issues_itc_day_transition_uniq',
+            ),
+        ),
+        migrations.RunPython(count_transitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+import issues.search
+
+
+def create_search_index(apps, schema_editor):
+    issues.search.create_search_index(apps.get_model('issues', 'Issue'), schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    issues.search.drop_search_index(apps.get_model('issues', 'Issue'), schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0007_issue_transition_counts'),
+    ]
+
+    operations = [
+        # Replaced by the full-text search.
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issues_issue_descr_prefix_idx',
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.CreateModel(
+            name='IssueSearchEntry',
+            fields=[
+                (
+                    'issue',
+                    models.OneToOneField(
+                        db_column='rowid',
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name='search_entry',
+                        serialize=False,
+                        to='issues.issue',
+                    ),
+                ),
+                ('document', issues.search.FullTextField(db_column='issues_issue_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'issues_issue_fts',
+                'managed': False,
+            },
+        ),
+    ]
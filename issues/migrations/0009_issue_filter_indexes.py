@@ -0,0 +1,35 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0008_issue_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['state_changed_at'], name='issues_issue_changed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(
+                fields=['category', 'state', 'state_changed_at'], name='issues_issue_category_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(
+                fields=['assignee', 'state', 'state_changed_at'], name='issues_issue_assignee_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(
+                fields=['reporter', 'state', 'state_changed_at'], name='issues_issue_reporter_idx'
+            ),
+        ),
+    ]
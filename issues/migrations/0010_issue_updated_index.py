@@ -0,0 +1,22 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0009_issue_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='issue',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['updated_at', 'id'], name='issues_issue_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('issues', '0010_issue_updated_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='issue',
+            name='assignee',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name='assigned_issues',
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name='issue',
+            name='category',
+            field=models.ForeignKey(
+                db_index=False, on_delete=django.db.models.deletion.RESTRICT, to='issues.category'
+            ),
+        ),
+        migrations.AlterField(
+            model_name='issue',
+            name='reporter',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name='reported_issues',
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import collections
 import datetime
+from typing import Iterable
 
 from django.contrib.auth.models import User
-from django.db import models, transaction, connection
+from django.db import connections, models, transaction
+from django.db.models.functions import Lag, Trunc
+from django.db.models.signals import pre_delete, pre_save, post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.translation import gettext_lazy
 
-from issues.time_deltas import TimeDeltas
+from issues.cache import invalidate_issues
+from issues.search import FullTextField, SQLITE_SEARCH_TABLE, search_issues
+from issues.time_deltas import TimeDeltas, CompactTimeDeltas, TimeDeltasSummary
 
 
 class Category(models.Model):
@@ -26,46 +33,200 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        with transaction.atomic():
+            stored_name = Category.objects.filter(pk=self.pk).values_list('name', flat=True).first()
+            super(Category, self).save(*args, **kwargs)
+            if stored_name is not None and stored_name != self.name:
+                # The name of the category is a part of its issues.
+                self.issue_set.update(updated_at=timezone.now())
+                invalidate_issues(self.issue_set.values_list('pk', flat=True))
+
 
 class IssueManager(models.Manager):
+    def search(self, query: str) -> models.QuerySet:
+        """
+        Full-text search of issues by their titles and descriptions, annotated with the `rank`
+        of the match (see `issues.search`).
+        """
+        return search_issues(self.get_queryset(), query)
+
     def get_resolving_times(self) -> TimeDeltas:
         """
-        For each issue in state "DONE", calculate the time it took for it do be marked as "DONE"
+        For each issue in state "DONE", get the time it took for it do be marked as "DONE"
         (from the moment the issue was created).
         """
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                select round((
-                    julianday(max(done.occurred_at))
-                    - julianday(min(created.occurred_at))
-                ) * 86400)
-                from issues_issue i
-                join issues_issuestatechange done on done.id = i.last_state_change_id
-                join issues_issuestatechange created on created.issue_id = i.id
-                where done.new_state = %s
-                group by i.id
-                """,
-                (IssueStateChange.State.DONE.value,),
-            )
-            results = cursor.fetchall()
-        return TimeDeltas([datetime.timedelta(seconds=r[0]) for r in results])
+        return TimeDeltas(list(IssueResolution.objects.values_list('resolving_time', flat=True)))
+
+    def get_resolving_time_distribution(self) -> CompactTimeDeltas:
+        """
+        Like `get_resolving_times`, but stored compactly and with percentiles and histograms.
+        """
+        return CompactTimeDeltas.from_timedeltas(
+            IssueResolution.objects.values_list('resolving_time', flat=True).iterator()
+        )
+
+    def get_resolving_time_summary(self, group_by: str | None = None) -> list[TimeDeltasSummary]:
+        """
+        Aggregate the resolving times of issues in state "DONE" in the database,
+        optionally grouped (see `IssueResolutionQuerySet.summarize`).
+        """
+        return IssueResolution.objects.summarize(group_by)
+
+    def get_resolving_time_stats(self) -> ResolvingTimeStats:
+        """
+        Get the shortest, longest and average resolving time of all issues in state "DONE"
+        without scanning them.
+        """
+        return ResolvingTimeStats.objects.get_current()
+
+    def bulk_update_state(
+        self,
+        issue_ids: Iterable[int],
+        new_state: IssueStateChange.State,
+        occurred_at: datetime.datetime | None = None,
+    ) -> int:
+        """
+        Like `Issue.update_state`, but for many issues at once: all the state changes are
+        inserted by one statement and the issues are pointed to them by another one,
+        in a single transaction. Return the number of updated issues.
+        """
+        new_state = IssueStateChange.State(new_state)
+        if occurred_at is None:
+            occurred_at = timezone.now()
+        issue_ids = list(dict.fromkeys(issue_ids))
+        with transaction.atomic():
+            previous_states = dict(
+                self.select_for_update().filter(pk__in=issue_ids).values_list('pk', 'state')
+            )
+            missing_ids = [issue_id for issue_id in issue_ids if issue_id not in previous_states]
+            if missing_ids:
+                raise ValueError(f'Issues {missing_ids} do not exist.')
+            IssueStateChange.objects.bulk_create(
+                IssueStateChange(issue_id=issue_id, new_state=new_state, occurred_at=occurred_at)
+                for issue_id in issue_ids
+            )
+            # The changes just created are the latest ones of their issues.
+            self.filter(pk__in=issue_ids).update(
+                last_state_change=models.Subquery(
+                    IssueStateChange.objects.filter(issue=models.OuterRef('pk'))
+                    .order_by('-pk')
+                    .values('pk')[:1]
+                ),
+                state=new_state,
+                state_changed_at=occurred_at,
+                updated_at=timezone.now(),
+            )
+            IssueTransitionCount.objects.add(
+                (occurred_at, previous_states[issue_id], new_state) for issue_id in issue_ids
+            )
+            if new_state == IssueStateChange.State.DONE:
+                IssueResolution.objects.record(dict.fromkeys(issue_ids, occurred_at))
+            else:
+                IssueResolution.objects.discard(issue_ids)
+            invalidate_issues(issue_ids)
+        return len(issue_ids)
+
+    def bulk_create_with_history(
+        self,
+        issues: list[Issue],
+        histories: list[list[tuple[IssueStateChange.State, datetime.datetime]]],
+    ) -> list[Issue]:
+        """
+        Insert new issues together with their histories of states (pairs of a state and the time
+        it was entered, in chronological order) by a few statements for all of them,
+        in a single transaction. An issue with an empty history gets the default state.
+        """
+        now = timezone.now()
+        histories = [history or [(IssueStateChange.DEFAULT_STATE, now)] for history in histories]
+        for issue, history in zip(issues, histories):
+            issue.state, issue.state_changed_at = history[-1]
+        with transaction.atomic():
+            # The returned issues have their IDs set (on databases which return inserted rows).
+            issues = self.bulk_create(issues)
+            state_changes = IssueStateChange.objects.bulk_create(
+                IssueStateChange(issue=issue, new_state=state, occurred_at=occurred_at)
+                for issue, history in zip(issues, histories)
+                for state, occurred_at in history
+            )
+            for state_change in state_changes:
+                # The history is in chronological order, so the last change is the current one.
+                state_change.issue.last_state_change = state_change
+            issue_ids = [issue.pk for issue in issues]
+            self.filter(pk__in=issue_ids).update(
+                last_state_change=models.Subquery(
+                    IssueStateChange.objects.filter(issue=models.OuterRef('pk'))
+                    .order_by('-occurred_at', '-pk')
+                    .values('pk')[:1]
+                )
+            )
+            IssueTransitionCount.objects.add(
+                transition for history in histories for transition in get_transitions(history)
+            )
+            IssueResolution.objects.record(
+                {
+                    issue.pk: issue.state_changed_at
+                    for issue in issues
+                    if issue.state == IssueStateChange.State.DONE
+                }
+            )
+            invalidate_issues(issue_ids)
+        return issues
+
+    def with_state_drift(self) -> models.QuerySet:
+        """
+        Get the issues whose copies of the state and of the time of the last state change
+        differ from their last state change.
+        """
+        return self.exclude(
+            state=models.F('last_state_change__new_state'),
+            state_changed_at=models.F('last_state_change__occurred_at'),
+        )
+
+    def repair_state_drift(self) -> int:
+        """
+        Copy the state and the time of the last state change of the issues with a drift again.
+        Return the number of repaired issues.
+        """
+        last_state_change = IssueStateChange.objects.filter(pk=models.OuterRef('last_state_change'))
+        with transaction.atomic():
+            issue_ids = list(self.with_state_drift().values_list('pk', flat=True))
+            self.filter(pk__in=issue_ids).update(
+                state=models.Subquery(last_state_change.values('new_state')),
+                state_changed_at=models.Subquery(last_state_change.values('occurred_at')),
+                updated_at=timezone.now(),
+            )
+            invalidate_issues(issue_ids)
+        return len(issue_ids)
+
+
+class IssueState(models.TextChoices):
+    """
+    States of issues (available as `IssueStateChange.State`).
+    """
+
+    TO_DO = 'TO_DO', gettext_lazy('TO DO')
+    IN_PROGRESS = 'IN_PROGRESS', gettext_lazy('IN PROGRESS')
+    DONE = 'DONE', gettext_lazy('DONE')
+    CANCELED = 'CANCELED', gettext_lazy('CANCELED')
+
+
+ISSUE_STATE_MAX_LENGTH = 20
 
 
 class Issue(models.Model):
 
     TITLE_MAX_LENGTH = 80
 
-    _set_new_state = None
-
     title = models.CharField(max_length=TITLE_MAX_LENGTH, unique=True)
     description = models.TextField(null=True, blank=True)
-    category = models.ForeignKey(Category, on_delete=models.RESTRICT)
+    # The foreign keys are indexed by the composite indexes starting with them (see `Meta`).
+    category = models.ForeignKey(Category, on_delete=models.RESTRICT, db_index=False)
     reporter = models.ForeignKey(
-        User, on_delete=models.RESTRICT, related_name='reported_issues'
+        User, on_delete=models.RESTRICT, related_name='reported_issues', db_index=False
     )
     assignee = models.ForeignKey(
-        User, on_delete=models.RESTRICT, related_name='assigned_issues'
+        User, on_delete=models.RESTRICT, related_name='assigned_issues', db_index=False
     )
     last_state_change = models.OneToOneField(
         'IssueStateChange',
@@ -75,40 +236,134 @@ class Issue(models.Model):
         blank=True,
         editable=False,
     )
+    # Copies of the state and the time of the last state change, so that reading and ordering
+    # issues by their states does not need a join. Kept in sync with `last_state_change`.
+    state = models.CharField(
+        max_length=ISSUE_STATE_MAX_LENGTH,
+        choices=IssueState.choices,
+        default=IssueState.TO_DO,
+        editable=False,
+    )
+    state_changed_at = models.DateTimeField(default=timezone.now, editable=False)
+    # When the issue, its state, or the names of its related objects were last changed.
+    updated_at = models.DateTimeField(auto_now=True)
     # TODO: Create a foreign key on (id, last_state_change_id)
     #  referencing IssueStateChange(issue_id, id).
 
     objects = IssueManager()
 
+    # Fields saved when the state of an issue changes.
+    STATE_FIELDS = ('last_state_change', 'state', 'state_changed_at', 'updated_at')
+
+    class Meta:
+        indexes = (
+            # Issues in a given state, ordered by the time they got into it (e.g. in the admin).
+            models.Index(fields=('state', 'state_changed_at'), name='issues_issue_state_idx'),
+            models.Index(fields=('state_changed_at',), name='issues_issue_changed_idx'),
+            # Issues of a category or a user, in a state, ordered or filtered by the time
+            # they got into it (filters of the API).
+            models.Index(
+                fields=('category', 'state', 'state_changed_at'),
+                name='issues_issue_category_idx',
+            ),
+            models.Index(
+                fields=('assignee', 'state', 'state_changed_at'),
+                name='issues_issue_assignee_idx',
+            ),
+            models.Index(
+                fields=('reporter', 'state', 'state_changed_at'),
+                name='issues_issue_reporter_idx',
+            ),
+            # Issues changed after a given one (the change feed of the API), or ordered by
+            # the time of their last change.
+            models.Index(fields=('updated_at', 'id'), name='issues_issue_updated_idx'),
+            # The full-text search index is created by a migration (see `issues.search`).
+        )
+
     @property
     def current_state(self) -> str:
         """
         Get human-freindly label of the current state of this issue.
         """
-        return self.last_state_change.new_state_choice.label
+        return IssueState(self.state).label
 
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs) -> None:
+    def save(self, *args, state: IssueStateChange.State | None = None, **kwargs) -> None:
+        """
+        Save the issue. If `state` differs from its current state, change the state, too.
+        A new issue gets the default state unless `state` is given.
+        """
         with transaction.atomic():
-            super(Issue, self).save(*args, **kwargs)
-            # If the issue does not have a state yet, or if its current change should be changed
-            # (see issues.forms.IssueForm.save method), create/update it.
-            if self.last_state_change is None or self._set_new_state is not None:
-                new_state = self._set_new_state or IssueStateChange.DEFAULT_STATE
-                self._set_new_state = None
-                self.update_state(new_state)
+            if self.last_state_change_id is None:
+                # The state is inserted with the issue. The state change needs the ID of the issue,
+                # so only the reference to it is saved afterwards.
+                state = state or IssueStateChange.DEFAULT_STATE
+                self.state = state
+                self.state_changed_at = timezone.now()
+                super(Issue, self).save(*args, **kwargs)
+                self._add_state_change(state, self.state_changed_at)
+                Issue.objects.filter(pk=self.pk).update(last_state_change=self.last_state_change)
+                self._update_resolution(is_new=True)
+            elif state is not None and state != self.state:
+                # Point the issue to its new state by the same statement which saves it.
+                self._add_state_change(state, timezone.now())
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], *self.STATE_FIELDS}
+                super(Issue, self).save(*args, **kwargs)
+                self._update_resolution()
+            else:
+                super(Issue, self).save(*args, **kwargs)
+            invalidate_issues([self.pk])
 
     def update_state(
         self, new_state: IssueStateChange.State, occurred_at: timezone.datetime | None = None
     ):
         if occurred_at is None:
             occurred_at = timezone.now()
+        with transaction.atomic():
+            self._add_state_change(new_state, occurred_at)
+            self.save(update_fields=self.STATE_FIELDS)
+            self._update_resolution()
+
+    def _add_state_change(self, new_state: IssueStateChange.State, occurred_at) -> None:
+        previous_state = self.state if self.last_state_change_id is not None else None
         self.last_state_change = IssueStateChange.objects.create(
             issue=self, new_state=new_state, occurred_at=occurred_at
         )
-        self.save(update_fields=('last_state_change_id',))
+        IssueTransitionCount.objects.add([(occurred_at, previous_state, new_state)])
+        self.state = new_state
+        self.state_changed_at = occurred_at
+
+    def _update_resolution(self, is_new: bool = False) -> None:
+        if self.last_state_change.new_state == IssueStateChange.State.DONE:
+            IssueResolution.objects.record({self.pk: self.last_state_change.occurred_at})
+        elif not is_new:
+            # A new issue cannot have a resolution yet.
+            IssueResolution.objects.discard([self.pk])
+
+
+class IssueSearchEntry(models.Model):
+    """
+    Entry of an issue in the full-text search index on SQLite: a row of the FTS5 table
+    created by a migration and kept in sync with issues by triggers (see `issues.search`).
+    """
+
+    issue = models.OneToOneField(
+        Issue,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_entry',
+    )
+    document = FullTextField(db_column=SQLITE_SEARCH_TABLE)
+    # The BM25 score of the match (lower is better), available when searching.
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = SQLITE_SEARCH_TABLE
 
 
 class IssueStateChange(models.Model):
@@ -116,13 +371,9 @@ class IssueStateChange(models.Model):
     Historized changes of issues' states.
     """
 
-    class State(models.TextChoices):
-        TO_DO = 'TO_DO', gettext_lazy('TO DO')
-        IN_PROGRESS = 'IN_PROGRESS', gettext_lazy('IN PROGRESS')
-        DONE = 'DONE', gettext_lazy('DONE')
-        CANCELED = 'CANCELED', gettext_lazy('CANCELED')
+    State = IssueState
 
-    STATE_MAX_LENGTH = 20
+    STATE_MAX_LENGTH = ISSUE_STATE_MAX_LENGTH
     DEFAULT_STATE = State.TO_DO
 
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE)
@@ -131,9 +382,409 @@ class IssueStateChange(models.Model):
     )
     occurred_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = (
+            # History of an issue, e.g. its first state change.
+            models.Index(fields=('issue', 'occurred_at'), name='issues_isc_issue_occurred_idx'),
+            # Issues in a given state, ordered by the time they got into it.
+            models.Index(
+                fields=('new_state', 'occurred_at'), name='issues_isc_state_occurred_idx'
+            ),
+        )
+
     def __str__(self):
         return self.new_state
 
     @property
     def new_state_choice(self) -> IssueStateChange.State:
         return IssueStateChange.State(self.new_state)
+
+
+def get_transitions(
+    history: Iterable[tuple[str, datetime.datetime]]
+) -> Iterable[tuple[datetime.datetime, str | None, str]]:
+    """
+    Get the transitions (times, previous states and new states) of an issue with the given
+    history of states in chronological order. The first previous state is None.
+    """
+    previous_state = None
+    for state, occurred_at in history:
+        yield occurred_at, previous_state, state
+        previous_state = state
+
+
+def get_resolving_time(created_at: datetime.datetime, resolved_at: datetime.datetime):
+    """
+    Time between the first state change of an issue and it being marked as "DONE",
+    rounded to whole seconds.
+    """
+    return datetime.timedelta(seconds=round((resolved_at - created_at).total_seconds()))
+
+
+class IssueResolutionQuerySet(models.QuerySet):
+
+    GROUP_BY_EXPRESSIONS = {
+        'category': models.F('issue__category__name'),
+        'assignee': models.F('issue__assignee__username'),
+        'day': Trunc('resolved_at', 'day'),
+        'week': Trunc('resolved_at', 'week'),
+        'month': Trunc('resolved_at', 'month'),
+    }
+
+    def summarize(self, group_by: str | None = None) -> list[TimeDeltasSummary]:
+        """
+        Calculate the count, shortest, longest and average resolving time in the database,
+        either for all resolutions or for each group of resolutions with the same category,
+        assignee, or day/week/month of resolution.
+        """
+        aggregates = {
+            'count': models.Count('pk'),
+            'shortest': models.Min('resolving_time'),
+            'longest': models.Max('resolving_time'),
+            'avg': models.Avg('resolving_time'),
+        }
+        if group_by is None:
+            rows = [{'group': None, **self.aggregate(**aggregates)}]
+        elif group_by in self.GROUP_BY_EXPRESSIONS:
+            rows = (
+                self.annotate(group=self.GROUP_BY_EXPRESSIONS[group_by])
+                .values('group')
+                .annotate(**aggregates)
+                .order_by('group')
+            )
+        else:
+            raise ValueError(f'Cannot group resolving times by {group_by!r}.')
+        return [
+            TimeDeltasSummary(
+                group=row['group'],
+                count=row['count'],
+                shortest=row['shortest'],
+                longest=row['longest'],
+                avg=(
+                    datetime.timedelta(seconds=round(row['avg'].total_seconds()))
+                    if row['avg'] is not None
+                    else None
+                ),
+            )
+            for row in rows
+        ]
+
+
+class IssueResolutionManager(models.Manager.from_queryset(IssueResolutionQuerySet)):
+    def record(self, resolved_at_by_issue: dict[int, datetime.datetime]) -> None:
+        """
+        Record that the given issues were marked as "DONE" at the given times.
+        Previous resolutions of these issues are replaced.
+        """
+        if not resolved_at_by_issue:
+            return
+        with transaction.atomic():
+            self.discard(resolved_at_by_issue.keys())
+            created_at_by_issue = dict(
+                IssueStateChange.objects.filter(issue_id__in=resolved_at_by_issue.keys())
+                .values('issue_id')
+                .annotate(created_at=models.Min('occurred_at'))
+                .values_list('issue_id', 'created_at')
+            )
+            resolutions = self.bulk_create(
+                IssueResolution(
+                    issue_id=issue_id,
+                    resolved_at=resolved_at,
+                    resolving_time=get_resolving_time(created_at_by_issue[issue_id], resolved_at),
+                )
+                for issue_id, resolved_at in resolved_at_by_issue.items()
+            )
+            ResolvingTimeStats.objects.add([r.resolving_time for r in resolutions])
+
+    def discard(self, issue_ids) -> None:
+        """
+        Forget the resolutions of the given issues (if they have any),
+        e.g. because they are no longer "DONE".
+        """
+        with transaction.atomic():
+            resolutions = self.filter(issue_id__in=issue_ids)
+            resolving_times = list(resolutions.values_list('resolving_time', flat=True))
+            if resolving_times:
+                resolutions.delete()
+                ResolvingTimeStats.objects.remove(resolving_times)
+
+    def rebuild(self) -> int:
+        """
+        Recalculate the resolutions of all issues in state "DONE" and the running statistics
+        from the history of state changes. Return the number of resolved issues.
+        """
+        with transaction.atomic():
+            self.all().delete()
+            done_issues = (
+                Issue.objects.filter(state=IssueStateChange.State.DONE)
+                .annotate(created_at=models.Min('issuestatechange__occurred_at'))
+                .values_list('id', 'created_at', 'state_changed_at')
+            )
+            self.bulk_create(
+                (
+                    IssueResolution(
+                        issue_id=issue_id,
+                        resolved_at=resolved_at,
+                        resolving_time=get_resolving_time(created_at, resolved_at),
+                    )
+                    for issue_id, created_at, resolved_at in done_issues.iterator()
+                ),
+                batch_size=1000,
+            )
+            return ResolvingTimeStats.objects.refresh().count
+
+
+class IssueResolution(models.Model):
+    """
+    Resolution of an issue which is currently in state "DONE".
+    """
+
+    issue = models.OneToOneField(
+        Issue, on_delete=models.CASCADE, primary_key=True, related_name='resolution'
+    )
+    resolved_at = models.DateTimeField()
+    resolving_time = models.DurationField(db_index=True)
+
+    objects = IssueResolutionManager()
+
+
+class ResolvingTimeStatsManager(models.Manager):
+    # The statistics are kept in a single row.
+    ROW_ID = 1
+
+    def get_current(self) -> ResolvingTimeStats:
+        return self.get_or_create(pk=self.ROW_ID)[0]
+
+    def _get_for_update(self) -> ResolvingTimeStats:
+        self.get_or_create(pk=self.ROW_ID)
+        return self.select_for_update().get(pk=self.ROW_ID)
+
+    def add(self, resolving_times: list[datetime.timedelta]) -> None:
+        if not resolving_times:
+            return
+        with transaction.atomic():
+            stats = self._get_for_update()
+            stats.count += len(resolving_times)
+            stats.total += sum(resolving_times, datetime.timedelta())
+            known_times = [t for t in (stats.shortest, stats.longest) if t is not None]
+            stats.shortest = min(known_times + resolving_times)
+            stats.longest = max(known_times + resolving_times)
+            stats.save()
+
+    def remove(self, resolving_times: list[datetime.timedelta]) -> None:
+        if not resolving_times:
+            return
+        with transaction.atomic():
+            stats = self._get_for_update()
+            stats.count -= len(resolving_times)
+            stats.total -= sum(resolving_times, datetime.timedelta())
+            # Only a removal of one of the extremes requires looking at the remaining
+            # resolutions (using the index on `resolving_time`).
+            if stats.shortest in resolving_times or stats.longest in resolving_times:
+                remaining = IssueResolution.objects.aggregate(
+                    shortest=models.Min('resolving_time'), longest=models.Max('resolving_time')
+                )
+                stats.shortest = remaining['shortest']
+                stats.longest = remaining['longest']
+            stats.save()
+
+    def refresh(self) -> ResolvingTimeStats:
+        """
+        Recalculate the statistics from all stored resolutions.
+        """
+        with transaction.atomic():
+            stats = self._get_for_update()
+            aggregates = IssueResolution.objects.aggregate(
+                count=models.Count('pk'),
+                total=models.Sum('resolving_time'),
+                shortest=models.Min('resolving_time'),
+                longest=models.Max('resolving_time'),
+            )
+            stats.count = aggregates['count']
+            stats.total = aggregates['total'] or datetime.timedelta()
+            stats.shortest = aggregates['shortest']
+            stats.longest = aggregates['longest']
+            stats.save()
+            return stats
+
+
+class ResolvingTimeStats(models.Model):
+    """
+    Running statistics of the resolving times of all issues in state "DONE",
+    maintained together with `IssueResolution`s.
+    """
+
+    count = models.PositiveBigIntegerField(default=0)
+    total = models.DurationField(default=datetime.timedelta)
+    shortest = models.DurationField(null=True)
+    longest = models.DurationField(null=True)
+
+    objects = ResolvingTimeStatsManager()
+
+    class Meta:
+        verbose_name_plural = 'resolving time stats'
+
+    @property
+    def avg(self) -> datetime.timedelta | None:
+        if not self.count:
+            return None
+        return datetime.timedelta(seconds=round(self.total.total_seconds() / self.count))
+
+
+def get_transition_day(occurred_at: datetime.datetime) -> datetime.date:
+    """
+    Get the day of a transition in the default time zone (which days of analytics are in).
+    """
+    return timezone.localdate(occurred_at, timezone.get_default_timezone())
+
+
+def _to_date(value) -> datetime.date:
+    # Values of raw SQL are not converted by the database backend: SQLite returns a string,
+    # other databases a date or a datetime.
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value[:10])
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+class IssueTransitionCountManager(models.Manager):
+    def add(
+        self,
+        transitions: Iterable[tuple[datetime.datetime, str | None, str]],
+        sign: int = 1,
+    ) -> None:
+        """
+        Count the given transitions (times, previous states, or None for new issues,
+        and new states). With `sign=-1`, stop counting them, e.g. when deleting issues.
+        """
+        counts = collections.Counter(
+            (get_transition_day(occurred_at), previous_state or '', new_state)
+            for occurred_at, previous_state, new_state in transitions
+        )
+        with transaction.atomic():
+            for (day, previous_state, new_state), count in counts.items():
+                key = {'day': day, 'previous_state': previous_state, 'new_state': new_state}
+                # Most transitions are counted in an existing row (of the same day).
+                if self.filter(**key).update(count=models.F('count') + sign * count):
+                    continue
+                _, created = self.get_or_create(**key, defaults={'count': sign * count})
+                if not created:
+                    self.filter(**key).update(count=models.F('count') + sign * count)
+
+    def rebuild(self) -> int:
+        """
+        Recount the transitions of all issues from the history of states, in a single pass
+        using a window function. Return the number of transitions.
+        """
+        transitions = (
+            IssueStateChange.objects.annotate(
+                bucket=Trunc(
+                    'occurred_at',
+                    'day',
+                    output_field=models.DateField(),
+                    tzinfo=timezone.get_default_timezone(),
+                ),
+                previous_state=models.Window(
+                    Lag('new_state'),
+                    partition_by=models.F('issue'),
+                    order_by=(models.F('occurred_at').asc(), models.F('pk').asc()),
+                ),
+            )
+            .values('bucket', 'previous_state', 'new_state')
+            .order_by()
+        )
+        # The ORM cannot aggregate over a window function, so the grouping is done around it.
+        sql, params = transitions.query.sql_with_params()
+        with transaction.atomic():
+            with connections[transitions.db].cursor() as cursor:
+                cursor.execute(
+                    f'SELECT bucket, previous_state, new_state, COUNT(*) FROM ({sql}) transitions '
+                    f'GROUP BY bucket, previous_state, new_state',
+                    params,
+                )
+                rows = cursor.fetchall()
+            self.all().delete()
+            self.bulk_create(
+                (
+                    IssueTransitionCount(
+                        day=_to_date(day),
+                        previous_state=previous_state or '',
+                        new_state=new_state,
+                        count=count,
+                    )
+                    for day, previous_state, new_state, count in rows
+                ),
+                batch_size=1000,
+            )
+        return sum(row[-1] for row in rows)
+
+
+class IssueTransitionCount(models.Model):
+    """
+    Number of transitions of issues from one state to another on a day, maintained together
+    with the history of states for the analytics of the flow of issues.
+    """
+
+    day = models.DateField()
+    # Empty for the first states of issues (i.e. for created issues).
+    previous_state = models.CharField(
+        max_length=ISSUE_STATE_MAX_LENGTH, choices=IssueState.choices, blank=True
+    )
+    new_state = models.CharField(max_length=ISSUE_STATE_MAX_LENGTH, choices=IssueState.choices)
+    count = models.IntegerField(default=0)
+
+    objects = IssueTransitionCountManager()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('day', 'previous_state', 'new_state'),
+                name='issues_itc_day_transition_uniq',
+            ),
+        )
+
+
+@receiver(pre_save, sender=User)
+def load_stored_username(sender, instance=None, update_fields=None, **kwargs):
+    # Compared by `touch_user_issues` after the save.
+    instance._stored_username = (
+        User.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+        if instance.pk is not None and (update_fields is None or 'username' in update_fields)
+        else None
+    )
+
+
+@receiver(post_save, sender=User)
+def touch_user_issues(sender, instance=None, **kwargs):
+    # The username of the reporter and the assignee is a part of an issue.
+    stored_username = getattr(instance, '_stored_username', None)
+    if stored_username is None or stored_username == instance.username:
+        return
+    now = timezone.now()
+    Issue.objects.filter(reporter=instance).update(updated_at=now)
+    Issue.objects.filter(assignee=instance).update(updated_at=now)
+    invalidate_issues(
+        Issue.objects.filter(models.Q(reporter=instance) | models.Q(assignee=instance))
+        .values_list('pk', flat=True)
+    )
+
+
+@receiver(pre_delete, sender=Issue)
+def discard_issue_resolution(sender, instance=None, **kwargs):
+    # Keep the running statistics in sync when a resolved issue is deleted.
+    IssueResolution.objects.discard([instance.pk])
+
+
+@receiver(pre_delete, sender=Issue)
+def uncount_issue_transitions(sender, instance=None, **kwargs):
+    # The history of the issue is deleted with it.
+    history = instance.issuestatechange_set.order_by('occurred_at', 'pk').values_list(
+        'new_state', 'occurred_at'
+    )
+    IssueTransitionCount.objects.add(get_transitions(history), sign=-1)
+
+
+@receiver(post_delete, sender=Issue)
+def invalidate_deleted_issue(sender, instance=None, **kwargs):
+    invalidate_issues([instance.pk])
@@ -0,0 +1,48 @@
+"""
+Paginators for lists of objects too long to be counted on every page.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.utils.functional import cached_property
+
+
+def get_estimated_count(model: type[models.Model], using: str) -> int | None:
+    """
+    Estimate the number of rows of the table of `model` from the statistics of the database
+    without scanning the table, or return None if the database cannot do that.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [table])
+            row = cursor.fetchone()
+            # The table has never been analyzed if the estimate is negative.
+            return int(row[0]) if row and row[0] >= 0 else None
+        if connection.vendor == 'sqlite':
+            # The largest row ID is looked up in the B-tree of the table; the number of rows
+            # differs from it by the number of deleted rows.
+            cursor.execute(f'SELECT MAX(_rowid_) FROM {connection.ops.quote_name(table)}')
+            row = cursor.fetchone()
+            return row[0] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator which estimates the number of all objects of a model (i.e. when the list
+    is not filtered) if there are more than `settings.ADMIN_EXACT_COUNT_LIMIT` of them,
+    instead of counting them exactly. Filtered lists are counted exactly.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if isinstance(queryset, models.QuerySet) and not queryset.query.where:
+            estimate = get_estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > settings.ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return super(EstimatedCountPaginator, self).count
@@ -0,0 +1,184 @@
+"""
+Full-text search of issues by their titles and descriptions. The index depends on the database:
+
+- SQLite: an FTS5 table with the issues as its external content, kept in sync by triggers
+  (so that also bulk updates of issues are indexed).
+- PostgreSQL: a GIN index on the text search vector of the issues, which is kept in sync
+  by the database itself.
+- Other databases: no index, the texts are searched by `LIKE`.
+
+Search queries are split into words; issues containing all of them are found, and the last word
+matches also the beginnings of words (the query may be typed on every keystroke).
+"""
+from __future__ import annotations
+
+import re
+
+from django.db import connections, models
+
+# Language of the texts of issues (PostgreSQL text search configuration).
+SEARCH_CONFIG = 'english'
+
+SQLITE_SEARCH_TABLE = 'issues_issue_fts'
+
+SQLITE_CREATE_SEARCH_TABLE = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_SEARCH_TABLE} USING fts5('
+    f"title, description, content='issues_issue', content_rowid='id', "
+    f"tokenize='porter unicode61 remove_diacritics 2')"
+)
+
+# The index is changed only if the texts of an issue change (not e.g. its state).
+SQLITE_SEARCH_TRIGGERS = {
+    'issues_issue_fts_insert': (
+        f'AFTER INSERT ON issues_issue BEGIN '
+        f'INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, title, description) '
+        f'VALUES (new.id, new.title, new.description); END'
+    ),
+    'issues_issue_fts_delete': (
+        f'AFTER DELETE ON issues_issue BEGIN '
+        f'INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, title, description) '
+        f"VALUES ('delete', old.id, old.title, old.description); END"
+    ),
+    'issues_issue_fts_update': (
+        f'AFTER UPDATE OF title, description ON issues_issue BEGIN '
+        f'INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, title, description) '
+        f"VALUES ('delete', old.id, old.title, old.description); "
+        f'INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, title, description) '
+        f'VALUES (new.id, new.title, new.description); END'
+    ),
+}
+
+POSTGRESQL_SEARCH_INDEX = 'issues_issue_search_idx'
+
+# Matches in titles count more than matches in descriptions (as the default weights
+# of PostgreSQL for the weights "A" and "B").
+TITLE_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+
+class FullTextField(models.TextField):
+    """
+    The hidden column of an FTS5 table named as the table, which stands for the whole row
+    and is searched by the `match` lookup.
+    """
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs_sql} MATCH {rhs_sql}', (*lhs_params, *rhs_params)
+
+
+def get_search_vector():
+    """
+    Get the text search vector of issues on PostgreSQL (the expression of the search index).
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector('title', weight='A', config=SEARCH_CONFIG) + SearchVector(
+        'description', weight='B', config=SEARCH_CONFIG
+    )
+
+
+def _get_postgresql_search_index():
+    from django.contrib.postgres.indexes import GinIndex
+
+    return GinIndex(get_search_vector(), name=POSTGRESQL_SEARCH_INDEX)
+
+
+def create_search_index(model, schema_editor) -> None:
+    """
+    Create the search index of issues (`model`), including the issues which already exist.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE_SEARCH_TABLE)
+        for name, trigger in SQLITE_SEARCH_TRIGGERS.items():
+            schema_editor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {trigger}')
+        schema_editor.execute(
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rank) "
+            f"VALUES ('rank', 'bm25({TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.add_index(model, _get_postgresql_search_index())
+
+
+def drop_search_index(model, schema_editor) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for name in SQLITE_SEARCH_TRIGGERS:
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.remove_index(model, _get_postgresql_search_index())
+
+
+def restore_search_index(sender, using='default', **kwargs) -> None:
+    """
+    Recreate the search index on SQLite after migrations if its triggers are missing:
+    SQLite migrations altering issues rebuild their table, which drops its triggers.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'issues_issue'"
+        )
+        triggers = {name for (name,) in cursor.fetchall()}
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [SQLITE_SEARCH_TABLE],
+        )
+        if cursor.fetchone() is None or triggers >= SQLITE_SEARCH_TRIGGERS.keys():
+            # Not migrated yet, or intact.
+            return
+    from issues.models import Issue
+
+    with connection.schema_editor() as schema_editor:
+        create_search_index(Issue, schema_editor)
+
+
+def get_search_terms(query: str) -> list[str]:
+    return re.findall(r'\w+', query)
+
+
+def search_issues(queryset: models.QuerySet, query: str) -> models.QuerySet:
+    """
+    Filter issues by a full-text search `query` and annotate them with the `rank` of the match
+    (higher is better). Nothing is found if the query has no words.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.annotate(rank=models.Value(0.0)).none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        # Quoted terms are matched literally (not as the syntax of FTS5 queries).
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        # The BM25 scores of better matches are lower (negative).
+        return queryset.filter(search_entry__document__match=match).annotate(
+            rank=-models.F('search_entry__rank')
+        )
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(
+            ' & '.join(terms) + ':*', search_type='raw', config=SEARCH_CONFIG
+        )
+        return (
+            queryset.alias(search_vector=get_search_vector())
+            .filter(search_vector=search_query)
+            .annotate(rank=SearchRank(get_search_vector(), search_query))
+        )
+    for term in terms:
+        queryset = queryset.filter(
+            models.Q(title__icontains=term) | models.Q(description__icontains=term)
+        )
+    return queryset.annotate(rank=models.Value(0.0))
@@ -1,6 +1,12 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
 from rest_framework import serializers
 
-from issues.models import Issue
+from issues.analytics import PERIODS, DWELL_TIME_GROUP_BY_EXPRESSIONS, count_periods
+from issues.models import Issue, Category, IssueStateChange
 
 
 class IssueSerializer(serializers.ModelSerializer):
@@ -19,3 +25,296 @@ class IssueSerializer(serializers.ModelSerializer):
             'reporter',
             'assignee',
         )
+
+
+class IssueWriteSerializer(serializers.ModelSerializer):
+    """
+    Serializer for creating and updating issues. Related objects are referred to by their names,
+    the same way `IssueSerializer` outputs them (and so does this serializer).
+    """
+
+    category = serializers.SlugRelatedField(slug_field='name', queryset=Category.objects.all())
+    reporter = serializers.SlugRelatedField(slug_field='username', queryset=User.objects.all())
+    assignee = serializers.SlugRelatedField(slug_field='username', queryset=User.objects.all())
+    state = serializers.ChoiceField(
+        choices=IssueStateChange.State.choices, required=False, write_only=True
+    )
+
+    class Meta:
+        model = Issue
+        fields = ('id', 'title', 'description', 'category', 'reporter', 'assignee', 'state')
+
+    def create(self, validated_data):
+        state = validated_data.pop('state', None)
+        issue = Issue(**validated_data)
+        issue.save(state=state)
+        return issue
+
+    def update(self, instance, validated_data):
+        state = validated_data.pop('state', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(state=state)
+        return instance
+
+    def to_representation(self, instance):
+        return IssueSerializer(instance, context=self.context).data
+
+
+# Fields of `Issue.objects.values` with everything `IssueSerializer` outputs,
+# with the related objects resolved by joins.
+ISSUE_ROW_FIELDS = (
+    'id',
+    'title',
+    'description',
+    'category__name',
+    'state',
+    'reporter__username',
+    'assignee__username',
+)
+
+
+def get_state_labels() -> dict[str, str]:
+    """
+    Human-friendly labels of issue states (in the active language) by their values.
+    """
+    return {value: str(label) for value, label in IssueStateChange.State.choices}
+
+
+def issue_row_to_dict(row: dict, state_labels: dict[str, str]) -> dict:
+    """
+    Convert a row of `ISSUE_ROW_FIELDS` to the same dict `IssueSerializer` produces,
+    without the overhead of serializer fields and model instances.
+    """
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'description': row['description'],
+        'category': row['category__name'],
+        'current_state': state_labels[row['state']],
+        'reporter': row['reporter__username'],
+        'assignee': row['assignee__username'],
+    }
+
+
+class IssueRowListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        state_labels = get_state_labels()
+        return [issue_row_to_dict(row, state_labels) for row in data]
+
+
+class IssueRowSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer of rows of `ISSUE_ROW_FIELDS` with the same output as `IssueSerializer`.
+    """
+
+    class Meta:
+        list_serializer_class = IssueRowListSerializer
+
+    def to_representation(self, instance):
+        return issue_row_to_dict(instance, get_state_labels())
+
+
+class TimeDeltasSummarySerializer(serializers.Serializer):
+    group = serializers.ReadOnlyField()
+    count = serializers.IntegerField()
+    shortest = serializers.DurationField()
+    longest = serializers.DurationField()
+    avg = serializers.DurationField()
+
+
+class IssueFlowQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=PERIODS, default='day')
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        since, until = attrs.get('since'), attrs.get('until')
+        if since is not None and until is not None:
+            if until < since:
+                raise serializers.ValidationError({'until': 'Must not be before since.'})
+            if count_periods(since, until, attrs['period']) > settings.API_MAX_FLOW_PERIODS:
+                raise serializers.ValidationError(
+                    f'The range cannot have more than {settings.API_MAX_FLOW_PERIODS} periods.'
+                )
+        return attrs
+
+
+class FlowBucketSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    created = serializers.IntegerField()
+    resolved = serializers.IntegerField()
+    wip = serializers.IntegerField()
+    states = serializers.DictField(child=serializers.IntegerField())
+
+
+class DwellTimesQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(
+        choices=tuple(DWELL_TIME_GROUP_BY_EXPRESSIONS), required=False
+    )
+    include_current = serializers.BooleanField(default=False)
+
+
+# The largest ID of a row (a `BigAutoField`).
+MAX_ID = 2 ** 63 - 1
+
+# Orderings of listed issues, each served by an index (with the ID as the tie-breaker).
+ISSUE_ORDERINGS = (
+    'title',
+    '-title',
+    'state_changed_at',
+    '-state_changed_at',
+    'updated_at',
+    '-updated_at',
+)
+
+
+class IssueFilterSerializer(serializers.Serializer):
+    category = serializers.CharField(required=False)
+    assignee = serializers.CharField(required=False)
+    reporter = serializers.CharField(required=False)
+    state = serializers.ChoiceField(choices=IssueStateChange.State.choices, required=False)
+    state_changed_after = serializers.DateTimeField(required=False)
+    state_changed_before = serializers.DateTimeField(required=False)
+    ordering = serializers.ChoiceField(choices=ISSUE_ORDERINGS, required=False)
+
+    def filter(self, queryset):
+        """
+        Filter and order issues by the validated query.
+        """
+        data = self.validated_data
+        lookups = {
+            'category__name': data.get('category'),
+            'assignee__username': data.get('assignee'),
+            'reporter__username': data.get('reporter'),
+            'state': data.get('state'),
+            'state_changed_at__gte': data.get('state_changed_after'),
+            'state_changed_at__lt': data.get('state_changed_before'),
+        }
+        queryset = queryset.filter(
+            **{lookup: value for lookup, value in lookups.items() if value is not None}
+        )
+        if 'ordering' in data:
+            # The ID (the end of each index on SQLite) goes in the same direction.
+            ordering = data['ordering']
+            queryset = queryset.order_by(ordering, '-id' if ordering.startswith('-') else 'id')
+        return queryset
+
+
+class IssuePageQuerySerializer(IssueFilterSerializer):
+    """
+    Query of a page of filtered issues ordered by their (unique) titles: the issues following
+    the one titled `after`.
+    """
+
+    ordering = None
+    after = serializers.CharField(required=False)
+    page_size = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.API_MAX_PAGE_SIZE,
+        default=settings.API_PAGE_SIZE,
+    )
+
+    def filter(self, queryset):
+        queryset = super(IssuePageQuerySerializer, self).filter(queryset).order_by('title')
+        if 'after' in self.validated_data:
+            queryset = queryset.filter(title__gt=self.validated_data['after'])
+        return queryset
+
+
+class IssueExportQuerySerializer(IssuePageQuerySerializer):
+    """
+    Query of a part of exported issues: a page of them, by default as large as possible.
+    """
+
+    page_size = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.API_ASYNC_EXPORT_MAX_SIZE,
+        default=settings.API_ASYNC_EXPORT_MAX_SIZE,
+    )
+
+
+class IssueChangesQuerySerializer(serializers.Serializer):
+    """
+    Query of the issues changed (edited, or their states changed) after the `cursor`,
+    in the order of their changes.
+    """
+
+    EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+    cursor = serializers.RegexField(r'^\d+\.\d+$', required=False)
+    page_size = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.API_MAX_PAGE_SIZE,
+        default=settings.API_PAGE_SIZE,
+    )
+
+    @classmethod
+    def make_cursor(cls, updated_at: datetime.datetime, pk: int) -> str:
+        """
+        Make the cursor following the issue with the given last change and ID.
+        """
+        return f'{(updated_at - cls.EPOCH) // datetime.timedelta(microseconds=1)}.{pk}'
+
+    @classmethod
+    def parse_cursor(cls, cursor: str) -> tuple[datetime.datetime, int]:
+        """
+        Get the last change and the ID of the issue the cursor follows.
+        Raise ValueError if they are out of range.
+        """
+        microseconds, pk = map(int, cursor.split('.'))
+        if pk > MAX_ID:
+            raise ValueError(f'{pk} is not a valid ID.')
+        try:
+            return cls.EPOCH + datetime.timedelta(microseconds=microseconds), pk
+        except OverflowError:
+            raise ValueError(f'{microseconds} is not a valid time.')
+
+    def validate_cursor(self, value: str) -> str:
+        try:
+            self.parse_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError('Invalid cursor.')
+        return value
+
+    def filter(self, queryset):
+        """
+        Get the first page of the changed issues (as old as `API_CHANGES_DELAY` at least).
+        """
+        queryset = queryset.filter(
+            updated_at__lt=timezone.now() - datetime.timedelta(seconds=settings.API_CHANGES_DELAY)
+        )
+        if 'cursor' in self.validated_data:
+            updated_at, pk = self.parse_cursor(self.validated_data['cursor'])
+            # A range of the (updated_at, id) index.
+            queryset = queryset.filter(updated_at__gte=updated_at).exclude(
+                updated_at=updated_at, id__lte=pk
+            )
+        return queryset.order_by('updated_at', 'id')[: self.validated_data['page_size']]
+
+
+class IssueStateChangeEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IssueStateChange
+        fields = ('id', 'issue', 'new_state', 'occurred_at')
+
+
+class IssueStateChangesQuerySerializer(serializers.Serializer):
+    # The ID of the last state change the client has seen.
+    after = serializers.IntegerField(min_value=0, max_value=MAX_ID, required=False)
+
+
+class IssueStateTransitionSerializer(serializers.Serializer):
+    issues = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=MAX_ID),
+        allow_empty=False,
+        max_length=settings.API_MAX_BULK_SIZE,
+    )
+    state = serializers.ChoiceField(choices=IssueStateChange.State.choices)
+    occurred_at = serializers.DateTimeField(required=False)
+
+    def validate_occurred_at(self, value: datetime.datetime) -> datetime.datetime:
+        # Future state changes would hold back the following ones in the events of the API.
+        if value > timezone.now():
+            raise serializers.ValidationError('The state cannot change in the future.')
+        return value
@@ -0,0 +1,202 @@
+import datetime
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from issues.analytics import FlowBucket, get_issue_flow, get_dwell_time_summary
+from issues.models import Issue, Category, IssueStateChange, IssueTransitionCount
+from issues.time_deltas import TimeDeltasSummary
+
+State = IssueStateChange.State
+
+
+def at(day: int, hour: int = 12) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime(2023, 1, day, hour))
+
+
+class TestIssueFlow(TestCase):
+    """
+    Test the flow of issues computed from the counts of transitions between states.
+    """
+
+    def setUp(self) -> None:
+        user = User.objects.create_user('userA', '', 'password')
+        category = Category.objects.create(name='Category A')
+        # 2023-01-02 is a Monday.
+        histories = [
+            [(State.TO_DO, at(2)), (State.IN_PROGRESS, at(3)), (State.DONE, at(4))],
+            [(State.TO_DO, at(2)), (State.IN_PROGRESS, at(4))],
+            [(State.TO_DO, at(4)), (State.CANCELED, at(10))],
+        ]
+        self.issues = Issue.objects.bulk_create_with_history(
+            [
+                Issue(title=f'Testing issue {i}', category=category, reporter=user, assignee=user)
+                for i in range(len(histories))
+            ],
+            histories,
+        )
+
+    def _states(self, to_do=0, in_progress=0, done=0, canceled=0) -> dict[str, int]:
+        return {
+            State.TO_DO: to_do,
+            State.IN_PROGRESS: in_progress,
+            State.DONE: done,
+            State.CANCELED: canceled,
+        }
+
+    def test_daily_flow(self):
+        """
+        Check the created, resolved and in-progress issues and the cumulative flow per day,
+        including the days without any changes.
+        """
+        buckets = get_issue_flow('day', until=datetime.date(2023, 1, 11))
+        self.assertEqual(len(buckets), 10)
+        self.assertEqual(
+            buckets[:3],
+            [
+                FlowBucket(datetime.date(2023, 1, 2), 2, 0, 0, self._states(to_do=2)),
+                FlowBucket(
+                    datetime.date(2023, 1, 3), 0, 0, 1, self._states(to_do=1, in_progress=1)
+                ),
+                FlowBucket(
+                    datetime.date(2023, 1, 4),
+                    1,
+                    1,
+                    1,
+                    self._states(to_do=1, in_progress=1, done=1),
+                ),
+            ],
+        )
+        self.assertEqual(buckets[5].states, self._states(to_do=1, in_progress=1, done=1))
+        self.assertEqual(buckets[8].states, self._states(in_progress=1, done=1, canceled=1))
+        self.assertEqual(buckets[9].start, datetime.date(2023, 1, 11))
+        self.assertEqual(buckets[9].created, 0)
+
+    def test_weekly_flow_since(self):
+        """
+        Check that weeks start on Monday and that the states at the beginning of the first
+        requested week include the earlier transitions.
+        """
+        self.assertEqual(
+            get_issue_flow('week'),
+            [
+                FlowBucket(
+                    datetime.date(2023, 1, 2),
+                    3,
+                    1,
+                    1,
+                    self._states(to_do=1, in_progress=1, done=1),
+                ),
+                FlowBucket(
+                    datetime.date(2023, 1, 9),
+                    0,
+                    0,
+                    1,
+                    self._states(in_progress=1, done=1, canceled=1),
+                ),
+            ],
+        )
+        self.assertEqual(
+            get_issue_flow('week', since=datetime.date(2023, 1, 10)),
+            get_issue_flow('week')[1:],
+        )
+
+    def test_flow_follows_state_changes(self):
+        """
+        Check that the counts are kept in sync with single and bulk state changes and deletions,
+        and that rebuilding them from the history gives the same flow.
+        """
+        self.issues[1].update_state(State.DONE, at(11))
+        Issue.objects.bulk_update_state([self.issues[0].pk], State.IN_PROGRESS, at(11))
+        self.issues[2].delete()
+        flow = get_issue_flow('day')
+        self.assertEqual(flow[-1].start, datetime.date(2023, 1, 11))
+        self.assertEqual(flow[-1].states, self._states(in_progress=1, done=1))
+        self.assertEqual(flow[-1].resolved, 1)
+
+        IssueTransitionCount.objects.all().delete()
+        call_command('rebuild_issue_flow', stdout=io.StringIO())
+        self.assertEqual(get_issue_flow('day'), flow)
+
+    def test_invalid_period(self):
+        with self.assertRaises(ValueError):
+            get_issue_flow('month')
+
+
+class TestDwellTimes(TestCase):
+    """
+    Test the time issues spent in each state.
+    """
+
+    def setUp(self) -> None:
+        user = User.objects.create_user('userA', '', 'password')
+        category_a = Category.objects.create(name='Category A')
+        category_b = Category.objects.create(name='Category B')
+        Issue.objects.bulk_create_with_history(
+            [
+                Issue(title='Testing issue 1', category=category_a, reporter=user, assignee=user),
+                Issue(title='Testing issue 2', category=category_b, reporter=user, assignee=user),
+                Issue(title='Testing issue 3', category=category_b, reporter=user, assignee=user),
+            ],
+            [
+                [(State.TO_DO, at(2, 10)), (State.IN_PROGRESS, at(2, 12)), (State.DONE, at(3))],
+                [(State.TO_DO, at(2, 10)), (State.IN_PROGRESS, at(3, 10))],
+                [
+                    (State.TO_DO, at(2, 10)),
+                    (State.IN_PROGRESS, at(2, 11)),
+                    (State.TO_DO, at(2, 12)),
+                ],
+            ],
+        )
+
+    def test_dwell_times(self):
+        """
+        Check that the times between consecutive state changes are aggregated per state,
+        without the current states of issues.
+        """
+        self.assertEqual(
+            get_dwell_time_summary(),
+            {
+                State.TO_DO: [
+                    TimeDeltasSummary(
+                        None,
+                        3,
+                        datetime.timedelta(hours=1),
+                        datetime.timedelta(hours=24),
+                        datetime.timedelta(hours=9),
+                    )
+                ],
+                State.IN_PROGRESS: [
+                    TimeDeltasSummary(
+                        None,
+                        2,
+                        datetime.timedelta(hours=1),
+                        datetime.timedelta(hours=24),
+                        datetime.timedelta(hours=12, minutes=30),
+                    )
+                ],
+            },
+        )
+
+    def test_dwell_times_by_category(self):
+        """
+        Check that the dwell times are grouped by category, and that the current states
+        are included until now if requested.
+        """
+        summaries = get_dwell_time_summary('category', include_current=True)
+        self.assertEqual(
+            [(s.group, s.count) for s in summaries[State.TO_DO]],
+            [('Category A', 1), ('Category B', 3)],
+        )
+        self.assertEqual(
+            [(s.group, s.count, s.shortest) for s in summaries[State.DONE]],
+            [('Category A', 1, summaries[State.DONE][0].longest)],
+        )
+        self.assertGreater(summaries[State.DONE][0].shortest, datetime.timedelta(days=365))
+
+    def test_dwell_times_invalid_group_by(self):
+        with self.assertRaises(ValueError):
+            get_dwell_time_summary('title')
@@ -0,0 +1,212 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+class TestImportIssues(TestCase):
+    """
+    Test the `import_issues` command.
+    """
+
+    def setUp(self) -> None:
+        self.user_a = User.objects.create_user('userA', '', 'password')
+        self.user_b = User.objects.create_user('userB', '', 'password')
+        self.category = Category.objects.create(name='Category A')
+
+    def _write_file(self, suffix: str, content: str) -> str:
+        file_descriptor, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+            file.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def _import(self, path: str, *args) -> str:
+        stdout = io.StringIO()
+        call_command('import_issues', path, *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_import_ndjson(self):
+        """
+        Check that issues are imported with their full histories (without a synthetic state),
+        in chunks, and that the resolutions of the issues in state "DONE" are recorded.
+        """
+        records = [
+            {
+                'title': 'Imported issue 1',
+                'description': 'abc',
+                'category': 'Category A',
+                'reporter': 'userA',
+                'assignee': 'userB',
+                'history': [
+                    {'state': 'DONE', 'occurred_at': '2020-01-01T12:00:00+00:00'},
+                    {'state': 'TO_DO', 'occurred_at': '2020-01-01T10:00:00+00:00'},
+                ],
+            },
+            {
+                'title': 'Imported issue 2',
+                'category': 'Category B',
+                'reporter': 'userB',
+                'assignee': 'userB',
+                'history': [{'state': 'IN_PROGRESS', 'occurred_at': '2020-02-01T10:00:00'}],
+            },
+            {
+                'title': 'Imported issue 3',
+                'category': 'Category A',
+                'reporter': 'userA',
+                'assignee': 'userA',
+            },
+        ]
+        path = self._write_file('.ndjson', ''.join(json.dumps(r) + '\n' for r in records))
+
+        output = self._import(path, '--chunk-size', '2')
+
+        self.assertIn('rows/s', output)
+        self.assertEqual(Issue.objects.count(), 3)
+        issue_1 = Issue.objects.get(title='Imported issue 1')
+        self.assertEqual(issue_1.description, 'abc')
+        self.assertEqual(issue_1.category, self.category)
+        self.assertEqual(issue_1.reporter, self.user_a)
+        self.assertEqual(issue_1.assignee, self.user_b)
+        self.assertEqual(
+            list(issue_1.issuestatechange_set.order_by('pk').values_list('new_state', flat=True)),
+            [IssueStateChange.State.TO_DO, IssueStateChange.State.DONE],
+        )
+        self.assertEqual(issue_1.last_state_change.new_state, IssueStateChange.State.DONE)
+        self.assertEqual(issue_1.state, IssueStateChange.State.DONE)
+        self.assertEqual(issue_1.state_changed_at, issue_1.last_state_change.occurred_at)
+        self.assertEqual(
+            Issue.objects.get_resolving_times().times, [datetime.timedelta(hours=2)]
+        )
+        issue_2 = Issue.objects.get(title='Imported issue 2')
+        self.assertEqual(issue_2.category.name, 'Category B')
+        self.assertIsNone(issue_2.description)
+        self.assertEqual(issue_2.last_state_change.new_state, IssueStateChange.State.IN_PROGRESS)
+        self.assertEqual(
+            issue_2.last_state_change.occurred_at,
+            timezone.make_aware(datetime.datetime(2020, 2, 1, 10)),
+        )
+        issue_3 = Issue.objects.get(title='Imported issue 3')
+        self.assertEqual(issue_3.last_state_change.new_state, IssueStateChange.DEFAULT_STATE)
+
+    def test_import_csv(self):
+        """
+        Check that issues are imported from CSV with the history in one column.
+        """
+        path = self._write_file(
+            '.csv',
+            'title,description,category,reporter,assignee,history\n'
+            'Imported issue 1,abc,Category A,userA,userB,'
+            'TO_DO:2020-01-01T10:00:00+00:00; CANCELED:2020-01-03T10:00:00+00:00\n',
+        )
+
+        self._import(path)
+
+        issue = Issue.objects.get()
+        self.assertEqual(issue.title, 'Imported issue 1')
+        self.assertEqual(issue.issuestatechange_set.count(), 2)
+        self.assertEqual(issue.last_state_change.new_state, IssueStateChange.State.CANCELED)
+        self.assertEqual(Issue.objects.get_resolving_times().times, [])
+
+    def test_import_unknown_user(self):
+        """
+        Check that records with nonexistent users are rejected and nothing of the chunk is saved.
+        """
+        path = self._write_file(
+            '.ndjson',
+            json.dumps(
+                {
+                    'title': 'Imported issue 1',
+                    'category': 'Category A',
+                    'reporter': 'userA',
+                    'assignee': 'nobody',
+                }
+            ),
+        )
+
+        with self.assertRaisesMessage(CommandError, 'nobody'):
+            self._import(path)
+        self.assertFalse(Issue.objects.exists())
+
+    def test_import_invalid_records(self):
+        """
+        Check that records without required fields and lines which are not JSON objects
+        are reported as invalid.
+        """
+        record = {'title': 'Imported issue 1', 'reporter': 'userA', 'assignee': 'userA'}
+        for content, message in (
+            (json.dumps(record), 'Invalid record 1'),
+            (json.dumps({**record, 'category': ['Category A']}), 'Invalid record 1'),
+            ('[1, 2]', 'Invalid line 1'),
+            ('"issue"', 'Invalid line 1'),
+        ):
+            with self.subTest(content=content):
+                with self.assertRaisesMessage(CommandError, message):
+                    self._import(self._write_file('.ndjson', content))
+        self.assertFalse(Issue.objects.exists())
+
+    def test_import_failed_chunk_categories(self):
+        """
+        Check that the categories created for a chunk which fails to be imported are rolled back.
+        """
+        record = {
+            'title': 'Imported issue 1',
+            'category': 'New category',
+            'reporter': 'userA',
+            'assignee': 'userA',
+        }
+        path = self._write_file('.ndjson', f'{json.dumps(record)}\n{json.dumps(record)}\n')
+
+        with self.assertRaisesMessage(CommandError, 'Cannot import records 1-2'):
+            self._import(path)
+        self.assertFalse(Category.objects.filter(name='New category').exists())
+
+
+class TestCheckIssueStates(TestCase):
+    """
+    Test the `check_issue_states` command.
+    """
+
+    def setUp(self) -> None:
+        user = User.objects.create_user('userA', '', 'password')
+        category = Category.objects.create(name='Category A')
+        self.issues = [
+            Issue.objects.create(
+                title=f'Testing issue {i}',
+                reporter=user,
+                assignee=user,
+                description='',
+                category=category,
+            )
+            for i in range(3)
+        ]
+
+    def test_check_and_repair(self):
+        """
+        Check that issues whose stored state differs from their last state change are reported
+        and repaired by the command.
+        """
+        call_command('check_issue_states', stdout=io.StringIO())
+        Issue.objects.filter(pk=self.issues[0].pk).update(state=IssueStateChange.State.DONE)
+        Issue.objects.filter(pk=self.issues[1].pk).update(
+            state_changed_at=timezone.now() - datetime.timedelta(days=1)
+        )
+
+        with self.assertRaisesMessage(CommandError, 'States of 2 issues'):
+            call_command('check_issue_states', stdout=io.StringIO())
+        stdout = io.StringIO()
+        call_command('check_issue_states', '--repair', stdout=stdout)
+
+        self.assertIn('Repaired states of 2 issues', stdout.getvalue())
+        for issue in Issue.objects.select_related('last_state_change'):
+            self.assertEqual(issue.state, IssueStateChange.DEFAULT_STATE)
+            self.assertEqual(issue.state_changed_at, issue.last_state_change.occurred_at)
+        call_command('check_issue_states', stdout=io.StringIO())
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from django.db import connection, connections
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Pragmas are set on SQLite only.')
+class TestSqlitePragmas(SimpleTestCase):
+    """
+    Test the set-up of new SQLite connections and their transactions.
+    """
+
+    def _connect(self, **options):
+        # To a new database file (some pragmas do not apply to in-memory databases).
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        default = connections['default']
+        wrapper = default.__class__(
+            {
+                **default.settings_dict,
+                'NAME': os.path.join(directory.name, 'db.sqlite3'),
+                'OPTIONS': {**default.settings_dict['OPTIONS'], **options},
+            },
+            alias='pragmas',
+        )
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def _get_pragma(self, wrapper, name: str):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied(self):
+        """
+        Check that the configured pragmas are applied to a new connection.
+        """
+        wrapper = self._connect()
+        self.assertEqual(self._get_pragma(wrapper, 'journal_mode'), 'wal')
+        # NORMAL
+        self.assertEqual(self._get_pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(self._get_pragma(wrapper, 'busy_timeout'), 5000)
+        self.assertEqual(self._get_pragma(wrapper, 'cache_size'), -64 * 1024)
+
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 100, 'cache_size': -1000})
+    def test_pragmas_configured(self):
+        """
+        Check that only the pragmas in the settings are applied.
+        """
+        wrapper = self._connect()
+        self.assertEqual(self._get_pragma(wrapper, 'busy_timeout'), 100)
+        self.assertEqual(self._get_pragma(wrapper, 'cache_size'), -1000)
+        self.assertEqual(self._get_pragma(wrapper, 'mmap_size'), 0)
+
+    def test_transaction_mode(self):
+        """
+        Check that transactions take the write lock at once unless configured otherwise.
+        """
+        for options, begin in (
+            ({}, 'BEGIN IMMEDIATE'),
+            ({'transaction_mode': 'DEFERRED'}, 'BEGIN DEFERRED'),
+        ):
+            with self.subTest(options=options):
+                wrapper = self._connect(**options)
+                with CaptureQueriesContext(wrapper) as queries:
+                    wrapper._start_transaction_under_autocommit()
+                wrapper.connection.rollback()
+                self.assertEqual(queries[-1]['sql'], begin)
@@ -0,0 +1,114 @@
+import unittest
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Min
+from django.test import TestCase, RequestFactory
+
+from issues.admin import IssueAdmin
+from issues.models import Issue, IssueStateChange
+from issues.serializers import IssueChangesQuerySerializer, IssueFilterSerializer, ISSUE_ROW_FIELDS
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite only.')
+class TestIndexes(TestCase):
+    """
+    Check that the database uses the indexes for the common queries instead of full scans.
+    """
+
+    def assertUsesIndex(self, queryset, index_name: str):
+        plan = queryset.explain()
+        self.assertIn(f'INDEX {index_name}', plan)
+        self.assertNotRegex(plan, r'SCAN (issues_issue|issues_issuestatechange)\b(?! USING)')
+        self.assertNotRegex(plan, 'TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY')
+
+    def test_first_state_change_of_issues(self):
+        """
+        Check that the first state change of issues is found using the (issue, occurred_at) index.
+        """
+        self.assertUsesIndex(
+            IssueStateChange.objects.filter(issue_id__in=(1, 2))
+            .values('issue_id')
+            .annotate(created_at=Min('occurred_at')),
+            'issues_isc_issue_occurred_idx',
+        )
+
+    def test_state_changes_in_state(self):
+        """
+        Check that changes to a state are found using the (new_state, occurred_at) index.
+        """
+        self.assertUsesIndex(
+            IssueStateChange.objects.filter(new_state=IssueStateChange.State.DONE).order_by(
+                'occurred_at'
+            ),
+            'issues_isc_state_occurred_idx',
+        )
+
+    def test_full_text_search(self):
+        """
+        Check that issues are searched in the full-text index and then read by their IDs.
+        """
+        plan = Issue.objects.search('crash').explain()
+        self.assertIn('SCAN issues_issue_fts VIRTUAL TABLE INDEX', plan)
+        self.assertIn('SEARCH issues_issue USING INTEGER PRIMARY KEY', plan)
+
+    def test_admin_changelist_ordering(self):
+        """
+        Check that the admin changelist reads issues ordered by state from the state index,
+        without their descriptions.
+        """
+        request = RequestFactory().get('/')
+        request.user = User(is_staff=True, is_superuser=True)
+        changelist = IssueAdmin(Issue, admin.site).get_changelist_instance(request)
+        queryset = changelist.get_queryset(request)
+        self.assertUsesIndex(queryset, 'issues_issue_state_idx')
+        self.assertNotIn('description', str(queryset.query))
+
+    def test_issues_in_state(self):
+        """
+        Check that issues in a state are listed from the state index alone, without a join.
+        """
+        queryset = (
+            Issue.objects.filter(state=IssueStateChange.State.DONE)
+            .order_by('state_changed_at')
+            .values('id', 'state_changed_at')
+        )
+        self.assertUsesIndex(queryset, 'issues_issue_state_idx')
+        self.assertNotIn('JOIN', str(queryset.query))
+
+    def test_api_filters(self):
+        """
+        Check that the filters and orderings of the issues API are served by indexes.
+        """
+        cases = (
+            ({'state': 'DONE', 'ordering': '-state_changed_at'}, 'issues_issue_state_idx'),
+            ({'assignee': 'userA', 'state': 'IN_PROGRESS'}, 'issues_issue_assignee_idx'),
+            ({'category': 'Category A', 'state': 'TO_DO'}, 'issues_issue_category_idx'),
+            (
+                {'reporter': 'userA', 'state': 'DONE', 'ordering': 'state_changed_at'},
+                'issues_issue_reporter_idx',
+            ),
+            (
+                {'state_changed_after': '2020-01-01T00:00:00Z', 'ordering': 'state_changed_at'},
+                'issues_issue_changed_idx',
+            ),
+        )
+        for params, index_name in cases:
+            with self.subTest(params=params):
+                filters = IssueFilterSerializer(data=params)
+                filters.is_valid(raise_exception=True)
+                self.assertUsesIndex(
+                    filters.filter(Issue.objects.values(*ISSUE_ROW_FIELDS)), index_name
+                )
+
+    def test_api_changes(self):
+        """
+        Check that the issues changed after a cursor are read from the (updated_at, id) index.
+        """
+        query = IssueChangesQuerySerializer(data={'cursor': '1600000000000000.42'})
+        query.is_valid(raise_exception=True)
+        self.assertUsesIndex(
+            query.filter(Issue.objects.values(*ISSUE_ROW_FIELDS, 'updated_at')),
+            'issues_issue_updated_idx',
+        )
@@ -1,8 +1,10 @@
 from django.contrib.auth.models import User
-from django.test import TestCase, Client
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from issues.models import Issue, Category
+from issues.models import Issue, Category, IssueStateChange
 
 
 class TestIssueDetailView(TestCase):
@@ -62,6 +64,32 @@ class TestIssueDetailView(TestCase):
         response = self.client.get(self._get_url(self.issue.pk))
         self.assertEqual(response.status_code, 302)
 
+    def test_change_view_post__new_state(self):
+        """
+        Test that saving the issue change form changes the state only if a new one was chosen.
+        """
+        self.client.force_login(self.superuser)
+        data = {
+            'title': self.issue.title,
+            'description': self.issue.description,
+            'category': self.category.pk,
+            'reporter': self.superuser.pk,
+            'assignee': self.staff_user.pk,
+            'state': IssueStateChange.State.DONE,
+        }
+        response = self.client.post(self._get_url(self.issue.pk), data)
+        self.assertEqual(response.status_code, 302)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.last_state_change.new_state, IssueStateChange.State.DONE)
+        self.assertEqual(self.issue.issuestatechange_set.count(), 2)
+
+        data['description'] = 'New description'
+        response = self.client.post(self._get_url(self.issue.pk), data)
+        self.assertEqual(response.status_code, 302)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.description, 'New description')
+        self.assertEqual(self.issue.issuestatechange_set.count(), 2)
+
     def test_change_view_for__invalid_issue_id(self):
         """
         Test that issue form with invalid issue ID.
@@ -69,3 +97,115 @@ class TestIssueDetailView(TestCase):
         self.client.force_login(self.superuser)
         response = self.client.get(self._get_url(123))
         self.assertEqual(response.status_code, 302)
+
+
+class TestIssueChangelistView(TestCase):
+    """
+    Test the Issue changelist view.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.superuser = User.objects.create_superuser(
+            username='admin', password='admin', email='admin@trackerino.cz'
+        )
+        self.category = Category.objects.create(name='Testing category 1')
+
+    def _create_issues(self, count: int) -> None:
+        """
+        Quickly create `count` issues, each with a single state change.
+        """
+        first = Issue.objects.count()
+        issues = Issue.objects.bulk_create(
+            Issue(
+                title=f'Testing issue {first + i}',
+                description='',
+                category=self.category,
+                reporter=self.superuser,
+                assignee=self.superuser,
+            )
+            for i in range(count)
+        )
+        state_changes = IssueStateChange.objects.bulk_create(
+            IssueStateChange(issue=issue) for issue in issues
+        )
+        for issue, state_change in zip(issues, state_changes):
+            issue.last_state_change = state_change
+        Issue.objects.bulk_update(issues, ('last_state_change',))
+
+    def test_changelist_constant_number_of_queries(self):
+        """
+        Test that a full page of issues takes as many queries as a page with a few issues.
+        """
+        self.client.force_login(self.superuser)
+        url = reverse('admin:issues_issue_changelist')
+        self._create_issues(10)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self._create_issues(990)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=5)
+    def test_changelist_estimated_count(self):
+        """
+        Test that a long unfiltered list of issues is not counted exactly,
+        while a filtered list is.
+        """
+        self.client.force_login(self.superuser)
+        url = reverse('admin:issues_issue_changelist')
+        self._create_issues(10)
+        Issue.objects.filter(pk__in=Issue.objects.order_by('-pk').values('pk')[:2]).delete()
+        Issue.objects.filter(pk=Issue.objects.order_by('pk')[0].pk).delete()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if 'COUNT(' in q['sql']])
+        # The estimate does not reflect the deleted issues with the largest IDs.
+        self.assertEqual(response.context['cl'].result_count, 8)
+
+        # The list of issues can be filtered only by one of several categories.
+        Category.objects.create(name='Testing category 2')
+        response = self.client.get(url, {'category__id__exact': self.category.pk})
+        self.assertEqual(response.context['cl'].result_count, 7)
+
+    def test_changelist_search(self):
+        """
+        Test that issues are searched by their titles and descriptions and listed
+        from the best match.
+        """
+        self.client.force_login(self.superuser)
+        self._create_issues(3)
+        Issue.objects.filter(title='Testing issue 1').update(description='Crash on startup')
+        Issue.objects.filter(title='Testing issue 2').update(title='Crash of the crash reporter')
+        response = self.client.get(reverse('admin:issues_issue_changelist'), {'q': 'crash'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [issue.title for issue in response.context['cl'].result_list],
+            ['Crash of the crash reporter', 'Testing issue 1'],
+        )
+
+    def test_flow_view(self):
+        """
+        Test that the flow of issues is shown for each period and linked from the changelist.
+        """
+        self.client.force_login(self.superuser)
+        self._create_issues(3)
+        url = reverse('admin:issues_issue_flow')
+        response = self.client.get(reverse('admin:issues_issue_changelist'))
+        self.assertContains(response, url)
+        for period in ('day', 'week'):
+            response = self.client.get(url, {'period': period})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['period'], period)
+
+    def test_flow_view__common_user(self):
+        """
+        Test that a non-staff user cannot see the flow of issues.
+        """
+        common_user = User.objects.create_user(username='common', password='common')
+        self.client.force_login(common_user)
+        response = self.client.get(reverse('admin:issues_issue_flow'))
+        self.assertEqual(response.status_code, 302)
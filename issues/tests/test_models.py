@@ -1,10 +1,21 @@
 import datetime
+import io
 
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from django.contrib.auth.models import User
 
-from issues.models import Issue, Category, IssueStateChange
+from issues.models import (
+    Issue,
+    Category,
+    IssueStateChange,
+    IssueResolution,
+    ResolvingTimeStats,
+)
 from issues.time_deltas import TimeDeltas
 
 
@@ -47,10 +58,10 @@ class TestIssue(TestCase):
         self.assertIsNotNone(issue.last_state_change)
         self.assertEqual(issue.last_state_change.new_state, IssueStateChange.DEFAULT_STATE)
 
-    def test_save_set_new_state(self):
+    def test_save_new_state(self):
         """
-        Check that calling the `save` method on an `Issue` instance with `_set_new_state`
-        set to a new `IssueStateChange.State`, the current state of the issue is updated.
+        Check that calling the `save` method on an `Issue` instance with a new `state`,
+        the current state of the issue is updated.
         """
         issue = Issue.objects.create(
             title='Testing issue C',
@@ -59,9 +70,52 @@ class TestIssue(TestCase):
             description='',
             category=self.category,
         )
-        issue._set_new_state = IssueStateChange.State.DONE
-        issue.save()
+        issue.save(state=IssueStateChange.State.DONE)
         self.assertEqual(issue.last_state_change.new_state, IssueStateChange.State.DONE)
+        self.assertEqual(issue.issuestatechange_set.count(), 2)
+        # Saving the issue in the same state does not create a new state change.
+        issue.save(state=IssueStateChange.State.DONE)
+        self.assertEqual(issue.issuestatechange_set.count(), 2)
+
+    def test_state_copied_to_issue(self):
+        """
+        Check that the state and the time of the last state change are stored on the issue
+        whenever the state changes.
+        """
+        issue = Issue.objects.create(
+            title='Testing issue E',
+            reporter=self.user,
+            assignee=self.user,
+            description='',
+            category=self.category,
+        )
+        self.assertEqual(issue.state, IssueStateChange.DEFAULT_STATE)
+        occurred_at = timezone.now() + datetime.timedelta(hours=1)
+        issue.update_state(IssueStateChange.State.IN_PROGRESS, occurred_at)
+        issue.refresh_from_db()
+        self.assertEqual(issue.state, IssueStateChange.State.IN_PROGRESS)
+        self.assertEqual(issue.state_changed_at, occurred_at)
+        self.assertEqual(issue.current_state, 'IN PROGRESS')
+        issue.save(state=IssueStateChange.State.DONE)
+        issue.refresh_from_db()
+        self.assertEqual(issue.state, IssueStateChange.State.DONE)
+        self.assertEqual(issue.state_changed_at, issue.last_state_change.occurred_at)
+        self.assertFalse(Issue.objects.with_state_drift().exists())
+
+    def test_create_with_state(self):
+        """
+        Check that a new issue saved with a `state` gets just this state.
+        """
+        issue = Issue(
+            title='Testing issue D',
+            reporter=self.user,
+            assignee=self.user,
+            description='',
+            category=self.category,
+        )
+        issue.save(state=IssueStateChange.State.IN_PROGRESS)
+        self.assertEqual(issue.last_state_change.new_state, IssueStateChange.State.IN_PROGRESS)
+        self.assertEqual(issue.issuestatechange_set.count(), 1)
 
     def test_get_resolving_times_empty(self):
         """
@@ -143,3 +197,231 @@ class TestIssue(TestCase):
             set(resolving_times.times),
             {datetime.timedelta(minutes=30), datetime.timedelta(hours=6)},
         )
+
+
+class TestResolvingTimeStats(TestCase):
+    """
+    Test the running statistics of resolving times maintained by `Issue.update_state`.
+    """
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user('userA', '', 'password')
+        self.category = Category.objects.create(name='Category A')
+
+    def _create_resolved_issue(self, title: str, resolving_time: datetime.timedelta) -> Issue:
+        issue = Issue.objects.create(
+            title=title,
+            reporter=self.user,
+            assignee=self.user,
+            description='',
+            category=self.category,
+        )
+        issue.update_state(
+            IssueStateChange.State.DONE,
+            occurred_at=issue.last_state_change.occurred_at + resolving_time,
+        )
+        return issue
+
+    def test_stats_empty(self):
+        """
+        Check the statistics when there are no DONE issues.
+        """
+        stats = Issue.objects.get_resolving_time_stats()
+        self.assertEqual(stats.count, 0)
+        self.assertIsNone(stats.shortest)
+        self.assertIsNone(stats.longest)
+        self.assertIsNone(stats.avg)
+
+    def test_stats_updated_on_state_changes(self):
+        """
+        Check that resolving, re-resolving and reopening issues keeps the statistics up to date.
+        """
+        issue1 = self._create_resolved_issue('Testing issue 1', datetime.timedelta(hours=1))
+        issue2 = self._create_resolved_issue('Testing issue 2', datetime.timedelta(hours=3))
+        issue3 = self._create_resolved_issue('Testing issue 3', datetime.timedelta(hours=8))
+        stats = Issue.objects.get_resolving_time_stats()
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.shortest, datetime.timedelta(hours=1))
+        self.assertEqual(stats.longest, datetime.timedelta(hours=8))
+        self.assertEqual(stats.avg, datetime.timedelta(hours=4))
+
+        # Reopening the shortest one removes it from the statistics.
+        issue1.update_state(IssueStateChange.State.IN_PROGRESS)
+        stats = Issue.objects.get_resolving_time_stats()
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.shortest, datetime.timedelta(hours=3))
+        self.assertEqual(stats.avg, datetime.timedelta(hours=5, minutes=30))
+
+        # Resolving an issue again replaces its previous resolving time.
+        issue3.update_state(
+            IssueStateChange.State.DONE,
+            occurred_at=issue3.last_state_change.occurred_at + datetime.timedelta(hours=2),
+        )
+        stats = Issue.objects.get_resolving_time_stats()
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.longest, datetime.timedelta(hours=10))
+
+        # Deleting a resolved issue removes it from the statistics.
+        issue2.delete()
+        stats = Issue.objects.get_resolving_time_stats()
+        self.assertEqual(stats.count, 1)
+        self.assertEqual(stats.shortest, datetime.timedelta(hours=10))
+        self.assertEqual(stats.longest, datetime.timedelta(hours=10))
+
+    def test_rebuild_resolving_times(self):
+        """
+        Check that the `rebuild_resolving_times` command restores the statistics from history.
+        """
+        self._create_resolved_issue('Testing issue 1', datetime.timedelta(minutes=30))
+        self._create_resolved_issue('Testing issue 2', datetime.timedelta(hours=6))
+        IssueResolution.objects.all().delete()
+        ResolvingTimeStats.objects.all().delete()
+
+        call_command('rebuild_resolving_times', stdout=io.StringIO())
+
+        self.assertEqual(
+            set(Issue.objects.get_resolving_times().times),
+            {datetime.timedelta(minutes=30), datetime.timedelta(hours=6)},
+        )
+        stats = Issue.objects.get_resolving_time_stats()
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.shortest, datetime.timedelta(minutes=30))
+        self.assertEqual(stats.longest, datetime.timedelta(hours=6))
+        self.assertEqual(
+            Issue.objects.get_resolving_time_distribution().median,
+            datetime.timedelta(hours=3, minutes=15),
+        )
+
+    def test_get_resolving_time_summary(self):
+        """
+        Check that `Issue.objects.get_resolving_time_summary` aggregates the resolving times
+        in total and per category.
+        """
+        other_category = Category.objects.create(name='Category B')
+        self._create_resolved_issue('Testing issue 1', datetime.timedelta(hours=1))
+        self._create_resolved_issue('Testing issue 2', datetime.timedelta(hours=2))
+        issue3 = self._create_resolved_issue('Testing issue 3', datetime.timedelta(hours=9))
+        issue3.category = other_category
+        issue3.save()
+
+        (summary,) = Issue.objects.get_resolving_time_summary()
+        self.assertEqual(summary.count, 3)
+        self.assertEqual(summary.shortest, datetime.timedelta(hours=1))
+        self.assertEqual(summary.longest, datetime.timedelta(hours=9))
+        self.assertEqual(summary.avg, datetime.timedelta(hours=4))
+
+        summaries = Issue.objects.get_resolving_time_summary(group_by='category')
+        self.assertEqual(
+            [(s.group, s.count, s.shortest, s.longest, s.avg) for s in summaries],
+            [
+                (
+                    'Category A',
+                    2,
+                    datetime.timedelta(hours=1),
+                    datetime.timedelta(hours=2),
+                    datetime.timedelta(hours=1, minutes=30),
+                ),
+                (
+                    'Category B',
+                    1,
+                    datetime.timedelta(hours=9),
+                    datetime.timedelta(hours=9),
+                    datetime.timedelta(hours=9),
+                ),
+            ],
+        )
+        (summary,) = Issue.objects.get_resolving_time_summary(group_by='assignee')
+        self.assertEqual((summary.group, summary.count), (self.user.username, 3))
+
+        with self.assertRaises(ValueError):
+            Issue.objects.get_resolving_time_summary(group_by='title')
+
+
+class TestBulkUpdateState(TestCase):
+    """
+    Test changing the state of many issues at once.
+    """
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user('userA', '', 'password')
+        self.category = Category.objects.create(name='Category A')
+        self.issues = [
+            Issue.objects.create(
+                title=f'Testing issue {i}',
+                reporter=self.user,
+                assignee=self.user,
+                description='',
+                category=self.category,
+            )
+            for i in range(20)
+        ]
+
+    def test_bulk_update_state(self):
+        """
+        Check that the issues get new current states, and the history and the resolving times
+        are kept as if `update_state` was called for each of them.
+        """
+        issue_ids = [issue.pk for issue in self.issues[:15]]
+        self.issues[0].update_state(IssueStateChange.State.IN_PROGRESS)
+        occurred_at = self.issues[0].last_state_change.occurred_at + datetime.timedelta(hours=1)
+
+        count = Issue.objects.bulk_update_state(
+            issue_ids, IssueStateChange.State.DONE, occurred_at=occurred_at
+        )
+
+        self.assertEqual(count, 15)
+        for issue in Issue.objects.filter(pk__in=issue_ids).select_related('last_state_change'):
+            self.assertEqual(issue.last_state_change.issue_id, issue.pk)
+            self.assertEqual(issue.last_state_change.new_state, IssueStateChange.State.DONE)
+            self.assertEqual(issue.last_state_change.occurred_at, occurred_at)
+            self.assertEqual(issue.state, IssueStateChange.State.DONE)
+            self.assertEqual(issue.state_changed_at, occurred_at)
+        self.assertEqual(IssueStateChange.objects.count(), 20 + 1 + 15)
+        self.assertEqual(
+            set(
+                Issue.objects.exclude(pk__in=issue_ids).values_list(
+                    'last_state_change__new_state', flat=True
+                )
+            ),
+            {IssueStateChange.DEFAULT_STATE},
+        )
+        stats = Issue.objects.get_resolving_time_stats()
+        self.assertEqual(stats.count, 15)
+        refreshed_stats = ResolvingTimeStats.objects.refresh()
+        self.assertEqual(
+            (stats.count, stats.total, stats.shortest, stats.longest),
+            (
+                refreshed_stats.count,
+                refreshed_stats.total,
+                refreshed_stats.shortest,
+                refreshed_stats.longest,
+            ),
+        )
+
+        Issue.objects.bulk_update_state(issue_ids[:5], IssueStateChange.State.CANCELED)
+        self.assertEqual(Issue.objects.get_resolving_time_stats().count, 10)
+
+    def test_bulk_update_state_constant_number_of_queries(self):
+        """
+        Check that changing the state of more issues does not take more queries.
+        """
+        # The first transition of its kind on a day also creates the row counting them.
+        Issue.objects.bulk_update_state([self.issues[0].pk], IssueStateChange.State.DONE)
+        with CaptureQueriesContext(connection) as queries:
+            Issue.objects.bulk_update_state(
+                [issue.pk for issue in self.issues[1:3]], IssueStateChange.State.DONE
+            )
+        with self.assertNumQueries(len(queries)):
+            Issue.objects.bulk_update_state(
+                [issue.pk for issue in self.issues[3:]], IssueStateChange.State.DONE
+            )
+
+    def test_bulk_update_state_missing_issue(self):
+        """
+        Check that nothing is changed when some of the issues do not exist.
+        """
+        with self.assertRaises(ValueError):
+            Issue.objects.bulk_update_state(
+                [self.issues[0].pk, 12345], IssueStateChange.State.DONE
+            )
+        self.assertEqual(IssueStateChange.objects.count(), 20)
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from issues.models import Issue, Category, IssueStateChange
+
+
+class TestSearch(TestCase):
+    """
+    Test the full-text search of issues.
+    """
+
+    def setUp(self) -> None:
+        user = User.objects.create_user('userA', '', 'password')
+        category = Category.objects.create(name='Category A')
+        self.issues = Issue.objects.bulk_create_with_history(
+            [
+                Issue(
+                    title='Application crashes',
+                    description='The application crashes when started offline.',
+                    category=category,
+                    reporter=user,
+                    assignee=user,
+                ),
+                Issue(
+                    title='Slow startup',
+                    description='Starting takes long, and then it sometimes crashes.',
+                    category=category,
+                    reporter=user,
+                    assignee=user,
+                ),
+                Issue(
+                    title='Typo in the settings',
+                    category=category,
+                    reporter=user,
+                    assignee=user,
+                ),
+            ],
+            [[], [], []],
+        )
+
+    def _search(self, query: str) -> list[str]:
+        return list(Issue.objects.search(query).order_by('-rank').values_list('title', flat=True))
+
+    def test_ranked_results(self):
+        """
+        Check that issues containing all the words are found (in any form), better matches first.
+        """
+        self.assertEqual(self._search('crash'), ['Application crashes', 'Slow startup'])
+        self.assertEqual(self._search('crashing started'), ['Application crashes', 'Slow startup'])
+        self.assertEqual(self._search('typo settings'), ['Typo in the settings'])
+        self.assertEqual(self._search('typo crash'), [])
+
+    def test_prefix_and_syntax(self):
+        """
+        Check that the last word matches beginnings of words and that the query syntax
+        of the database is not interpreted.
+        """
+        self.assertEqual(self._search('Typ'), ['Typo in the settings'])
+        self.assertEqual(self._search('"typo" OR -(crash*'), [])
+        self.assertEqual(self._search('  !? '), [])
+
+    def test_index_kept_in_sync(self):
+        """
+        Check that changed, bulk updated and deleted issues are searched by their current texts.
+        """
+        issue = self.issues[2]
+        issue.title = 'Wrong label in the settings'
+        issue.save()
+        self.assertEqual(self._search('typo'), [])
+        self.assertEqual(self._search('label'), ['Wrong label in the settings'])
+
+        Issue.objects.filter(pk=self.issues[0].pk).update(description='Fixed.')
+        Issue.objects.bulk_update_state([self.issues[0].pk], IssueStateChange.State.DONE)
+        self.assertEqual(self._search('offline'), [])
+        self.assertEqual(self._search('fixed'), ['Application crashes'])
+
+        self.issues[1].delete()
+        self.assertEqual(self._search('crashes'), ['Application crashes'])
@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from issues.models import Issue, Category, IssueStateChange
+from issues.serializers import IssueSerializer, IssueRowSerializer, ISSUE_ROW_FIELDS
+
+
+class TestIssueRowSerializer(TestCase):
+    """
+    Test the fast read-only serializer of issues.
+    """
+
+    def setUp(self) -> None:
+        reporter = User.objects.create_user('reporter', '', 'password')
+        assignee = User.objects.create_user('assignee', '', 'password')
+        category = Category.objects.create(name='Category Ä')
+        for i, state in enumerate(IssueStateChange.State):
+            issue = Issue.objects.create(
+                title=f'Testing issue {i}',
+                description=f'Description "{i}"\nwith ünicode' if i % 2 else None,
+                category=category,
+                reporter=reporter,
+                assignee=assignee,
+            )
+            issue.update_state(state)
+
+    def test_same_json_as_issue_serializer(self):
+        """
+        Check that `IssueRowSerializer` renders exactly the same JSON as `IssueSerializer`.
+        """
+        renderer = JSONRenderer()
+        issues = Issue.objects.select_related(
+            'category', 'reporter', 'assignee', 'last_state_change'
+        ).order_by('title')
+        rows = Issue.objects.values(*ISSUE_ROW_FIELDS).order_by('title')
+        self.assertEqual(
+            renderer.render(IssueRowSerializer(rows, many=True).data),
+            renderer.render(IssueSerializer(issues, many=True).data),
+        )
+        self.assertEqual(
+            renderer.render(IssueRowSerializer(rows[0]).data),
+            renderer.render(IssueSerializer(issues[0]).data),
+        )
@@ -1,7 +1,7 @@
 import datetime
 from unittest import TestCase
 
-from issues.time_deltas import TimeDeltas
+from issues.time_deltas import TimeDeltas, CompactTimeDeltas
 
 
 class TestTimeDeltas(TestCase):
@@ -57,3 +57,68 @@ class TestTimeDeltas(TestCase):
             datetime.timedelta(hours=3),
         ]
         self.assertEqual(timedeltas.avg, datetime.timedelta(hours=2))
+
+
+class TestCompactTimeDeltas(TestCase):
+    def test_compact_time_deltas_empty(self):
+        """
+        Test the CompactTimeDeltas statistics without any time deltas.
+        """
+        timedeltas = CompactTimeDeltas()
+        self.assertIsNone(timedeltas.shortest)
+        self.assertIsNone(timedeltas.longest)
+        self.assertIsNone(timedeltas.avg)
+        self.assertIsNone(timedeltas.median)
+        self.assertIsNone(timedeltas.p99)
+        self.assertIsNone(timedeltas.stddev)
+        self.assertEqual(timedeltas.histogram(datetime.timedelta(hours=1)), [])
+
+    def test_compact_time_deltas_same_as_time_deltas(self):
+        """
+        Check that CompactTimeDeltas calculate the same basic statistics as TimeDeltas.
+        """
+        times = [
+            datetime.timedelta(hours=5),
+            datetime.timedelta(seconds=60),
+            datetime.timedelta(seconds=15),
+            datetime.timedelta(days=2),
+        ]
+        timedeltas = TimeDeltas(times)
+        compact_timedeltas = CompactTimeDeltas.from_timedeltas(times)
+        self.assertEqual(len(compact_timedeltas), 4)
+        self.assertEqual(compact_timedeltas.shortest, timedeltas.shortest)
+        self.assertEqual(compact_timedeltas.longest, timedeltas.longest)
+        self.assertEqual(compact_timedeltas.avg, timedeltas.avg)
+
+    def test_compact_time_deltas_percentiles(self):
+        """
+        Test the CompactTimeDeltas percentiles and the standard deviation.
+        """
+        timedeltas = CompactTimeDeltas(range(1, 102))
+        self.assertEqual(timedeltas.median, datetime.timedelta(seconds=51))
+        self.assertEqual(timedeltas.p90, datetime.timedelta(seconds=91))
+        self.assertEqual(timedeltas.p95, datetime.timedelta(seconds=96))
+        self.assertEqual(timedeltas.p99, datetime.timedelta(seconds=100))
+        self.assertEqual(timedeltas.percentile(0), datetime.timedelta(seconds=1))
+        self.assertEqual(timedeltas.percentile(100), datetime.timedelta(seconds=101))
+        self.assertEqual(CompactTimeDeltas([10, 20]).median, datetime.timedelta(seconds=15))
+        self.assertEqual(CompactTimeDeltas([2, 4, 4, 4, 5, 5, 7, 9]).stddev.total_seconds(), 2)
+        with self.assertRaises(ValueError):
+            timedeltas.percentile(101)
+
+    def test_compact_time_deltas_histogram(self):
+        """
+        Test the CompactTimeDeltas histogram.
+        """
+        timedeltas = CompactTimeDeltas([4000, 10, 3599, 3600, 11000])
+        self.assertEqual(
+            timedeltas.histogram(datetime.timedelta(hours=1)),
+            [
+                (datetime.timedelta(hours=0), 2),
+                (datetime.timedelta(hours=1), 2),
+                (datetime.timedelta(hours=2), 0),
+                (datetime.timedelta(hours=3), 1),
+            ],
+        )
+        with self.assertRaises(ValueError):
+            timedeltas.histogram(datetime.timedelta())
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import array
+import bisect
 import dataclasses
 import datetime
+import functools
+import math
+from typing import Iterable
 
 
 @dataclasses.dataclass
@@ -27,3 +32,122 @@ class TimeDeltas:
         return datetime.timedelta(
             seconds=round(sum(t.total_seconds() for t in self.times) / len(self.times))
         )
+
+
+class CompactTimeDeltas:
+    """
+    Time deltas stored as a compact array of whole seconds, with statistics
+    calculated lazily (at most once) and cached.
+
+    Use it instead of `TimeDeltas` for large amounts of time deltas.
+    """
+
+    def __init__(self, seconds: Iterable[int] = ()):
+        self.seconds = array.array('q', seconds)
+
+    @classmethod
+    def from_timedeltas(cls, times: Iterable[datetime.timedelta]) -> CompactTimeDeltas:
+        return cls(round(t.total_seconds()) for t in times)
+
+    def __len__(self) -> int:
+        return len(self.seconds)
+
+    @functools.cached_property
+    def _sorted(self) -> array.array:
+        return array.array('q', sorted(self.seconds))
+
+    @functools.cached_property
+    def _total(self) -> int:
+        return sum(self.seconds)
+
+    @functools.cached_property
+    def shortest(self) -> datetime.timedelta | None:
+        return datetime.timedelta(seconds=min(self.seconds)) if self.seconds else None
+
+    @functools.cached_property
+    def longest(self) -> datetime.timedelta | None:
+        return datetime.timedelta(seconds=max(self.seconds)) if self.seconds else None
+
+    @property
+    def avg(self) -> datetime.timedelta | None:
+        if not self.seconds:
+            return None
+        return datetime.timedelta(seconds=round(self._total / len(self.seconds)))
+
+    def percentile(self, p: float) -> datetime.timedelta | None:
+        """
+        Get the `p`-th percentile (0-100), linearly interpolated between the closest values.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError(f'Percentile must be between 0 and 100, got {p}.')
+        if not self.seconds:
+            return None
+        position = (len(self._sorted) - 1) * p / 100
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        value = self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * (
+            position - lower
+        )
+        return datetime.timedelta(seconds=round(value))
+
+    @property
+    def median(self) -> datetime.timedelta | None:
+        return self.percentile(50)
+
+    @property
+    def p90(self) -> datetime.timedelta | None:
+        return self.percentile(90)
+
+    @property
+    def p95(self) -> datetime.timedelta | None:
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> datetime.timedelta | None:
+        return self.percentile(99)
+
+    @functools.cached_property
+    def stddev(self) -> datetime.timedelta | None:
+        """
+        Population standard deviation.
+        """
+        if not self.seconds:
+            return None
+        mean = self._total / len(self.seconds)
+        variance = sum((s - mean) ** 2 for s in self.seconds) / len(self.seconds)
+        return datetime.timedelta(seconds=round(math.sqrt(variance)))
+
+    def histogram(
+        self, bucket_size: datetime.timedelta
+    ) -> list[tuple[datetime.timedelta, int]]:
+        """
+        Count the time deltas in buckets of the given size, starting at the shortest one's bucket.
+        Return a list of (bucket start, count) pairs, including empty buckets.
+        """
+        size = round(bucket_size.total_seconds())
+        if size <= 0:
+            raise ValueError('Bucket size must be at least one second.')
+        if not self.seconds:
+            return []
+        histogram = []
+        bucket_start = self._sorted[0] // size * size
+        bucket_from = 0
+        while bucket_from < len(self._sorted):
+            bucket_to = bisect.bisect_left(self._sorted, bucket_start + size, lo=bucket_from)
+            histogram.append((datetime.timedelta(seconds=bucket_start), bucket_to - bucket_from))
+            bucket_start += size
+            bucket_from = bucket_to
+        return histogram
+
+
+@dataclasses.dataclass
+class TimeDeltasSummary:
+    """
+    Statistics of a group of time deltas calculated elsewhere (e.g. in the database).
+    """
+
+    group: object
+    count: int
+    shortest: datetime.timedelta | None
+    longest: datetime.timedelta | None
+    avg: datetime.timedelta | None
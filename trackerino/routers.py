@@ -0,0 +1,111 @@
+"""
+Routing of reads to a replica of the default (primary) database.
+
+Reads go to the replica (`DATABASE_REPLICA`) only where they are allowed explicitly
+(see `allow_replica_reads`), e.g. for read-only API requests, and only until anything
+is written in the same context. A user who wrote something reads from the primary
+for the next `DATABASE_REPLICA_LAG` seconds, so that they see their own writes.
+That is remembered by the default cache, which must be shared by all processes.
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import dataclasses
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+
+
+@dataclasses.dataclass
+class RoutingState:
+    replica_reads: bool = False
+    wrote: bool = False
+
+
+_state: contextvars.ContextVar[RoutingState | None] = contextvars.ContextVar(
+    'database_routing', default=None
+)
+
+
+@contextlib.contextmanager
+def database_routing():
+    """
+    Track the writes of a unit of work (e.g. a request), which may allow replica reads.
+    """
+    token = _state.set(RoutingState())
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def allow_replica_reads() -> None:
+    state = _state.get()
+    if state is not None and not state.wrote:
+        state.replica_reads = True
+
+
+def reads_from_replica() -> bool:
+    state = _state.get()
+    return bool(settings.DATABASE_REPLICA and state and state.replica_reads and not state.wrote)
+
+
+def wrote() -> bool:
+    state = _state.get()
+    return state is not None and state.wrote
+
+
+def _get_pin_key(user_id) -> str:
+    return f'db:primary-reads:{user_id}'
+
+
+def pin_to_primary(user) -> None:
+    """
+    Make the reads of `user` go to the primary until the replica has their writes.
+    """
+    if settings.DATABASE_REPLICA and user.is_authenticated:
+        cache.set(_get_pin_key(user.pk), True, timeout=settings.DATABASE_REPLICA_LAG)
+
+
+def is_pinned_to_primary(user) -> bool:
+    return user.is_authenticated and cache.get(_get_pin_key(user.pk), False)
+
+
+# Caches of a single process.
+PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def check_replica_cache(**kwargs) -> list[checks.CheckMessage]:
+    """
+    Warn if users who wrote something may read from the replica in other processes.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DATABASE_REPLICA and backend in PROCESS_CACHE_BACKENDS:
+        return [
+            checks.Warning(
+                'The default cache is not shared between processes, so users who wrote '
+                'something may read from the replica in the other processes.',
+                hint='Set a shared cache (e.g. Redis) when using a replica with more processes.',
+                id='trackerino.W001',
+            )
+        ]
+    return []
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reads_from_replica():
+            return settings.DATABASE_REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Reads after a write must see it.
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return None
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -78,9 +79,75 @@ WSGI_APPLICATION = 'trackerino.wsgi.application'
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
 DATABASES = {
-    'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db.sqlite3'}
+    'default': {
+        # The SQLite backend of Django, with the pragmas below and transactions taking
+        # the write lock at once (see `trackerino.sqlite3`).
+        'ENGINE': 'trackerino.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        # Connections are kept open for this many seconds (instead of one per request),
+        # and checked before they are reused.
+        'CONN_MAX_AGE': int(os.environ.get('TRACKERINO_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+    }
 }
 
+# A read replica of the default database, e.g. a PostgreSQL standby or (locally) a copy
+# of the SQLite file, used for read-only API requests (see `trackerino.routers`).
+if os.environ.get('TRACKERINO_REPLICA_DB_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['TRACKERINO_REPLICA_DB_NAME'],
+        # Only read, so its transactions need not take the write lock.
+        'OPTIONS': {'transaction_mode': 'DEFERRED'},
+    }
+# The alias of the replica, if any.
+DATABASE_REPLICA = 'replica' if 'replica' in DATABASES else None
+# Maximum delay (in seconds) of the replica: after a write, the user reads from the primary
+# for this long, and data read from the replica is cached only for this long.
+DATABASE_REPLICA_LAG = int(os.environ.get('TRACKERINO_REPLICA_LAG', 5))
+DATABASE_ROUTERS = ['trackerino.routers.PrimaryReplicaRouter']
+
+# Applied to each new SQLite connection (see `trackerino.sqlite3`):
+# - WAL lets readers run alongside a writer (it is kept by the database file),
+# - NORMAL synchronization is safe in WAL mode (the last commits may be lost on a power loss),
+# - up to `mmap_size` bytes of the database are read through memory mapping,
+# - the page cache takes up to `-cache_size` KiB per connection,
+# - locked databases are retried for up to `busy_timeout` milliseconds.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('TRACKERINO_SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('TRACKERINO_SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.environ.get('TRACKERINO_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.environ.get('TRACKERINO_SQLITE_CACHE_SIZE', -64 * 1024)),
+    'busy_timeout': int(os.environ.get('TRACKERINO_SQLITE_BUSY_TIMEOUT', 5000)),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# In-process memory by default. Set e.g. TRACKERINO_CACHE_BACKEND to
+# 'django.core.cache.backends.filebased.FileBasedCache' and TRACKERINO_CACHE_LOCATION
+# to a directory, or 'django.core.cache.backends.redis.RedisCache' and 'redis://host:port'.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'TRACKERINO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('TRACKERINO_CACHE_LOCATION', ''),
+    }
+}
+
+# For how long (in seconds) serialized issues are cached. They are also invalidated on changes.
+ISSUES_CACHE_TIMEOUT = int(os.environ.get('TRACKERINO_ISSUES_CACHE_TIMEOUT', 300))
+
+# For how long (in seconds) API tokens and their users are cached. They are also invalidated
+# when tokens are deleted or users saved.
+API_TOKEN_CACHE_TIMEOUT = int(os.environ.get('TRACKERINO_API_TOKEN_CACHE_TIMEOUT', 60))
+
+
+# Lists of more objects than this in the admin (e.g. of all issues) are counted approximately.
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -117,8 +184,39 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-    ]
+    ],
 }
+
+# Default number of items on a page of a paginated API endpoint.
+API_PAGE_SIZE = 100
+
+# Maximum number of items on a page of a paginated API endpoint (set by `?page_size=`).
+API_MAX_PAGE_SIZE = 1000
+
+# Maximum number of issues changed by one request to a bulk API endpoint.
+API_MAX_BULK_SIZE = 10000
+
+# Maximum number of periods (days or weeks) of the flow of issues returned by the API.
+API_MAX_FLOW_PERIODS = 3660
+
+# Number of issues fetched from the database at once when exporting all issues.
+API_EXPORT_CHUNK_SIZE = 2000
+
+# Maximum number of issues exported by one response of the async API, which is built in memory
+# (the rest is exported by the following responses).
+API_ASYNC_EXPORT_MAX_SIZE = 10000
+
+# How long (in seconds) a request for new state changes of issues waits for them,
+# and how often it looks for them in the meantime.
+API_EVENTS_TIMEOUT = int(os.environ.get('TRACKERINO_API_EVENTS_TIMEOUT', 25))
+API_EVENTS_POLL_INTERVAL = float(os.environ.get('TRACKERINO_API_EVENTS_POLL_INTERVAL', 1))
+
+# Maximum number of state changes of issues sent by one response.
+API_EVENTS_BATCH_SIZE = 1000
+
+# Issues appear in the change feed of the API only once their last change is this many seconds
+# old, so that changes committed late (by longer transactions, or to the replica) are not skipped.
+API_CHANGES_DELAY = int(os.environ.get('TRACKERINO_API_CHANGES_DELAY', 10))
@@ -0,0 +1,44 @@
+"""
+SQLite database backend with the pragmas of trackerino and transactions started as IMMEDIATE.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    `SQLITE_PRAGMAS` are applied to each new connection (most pragmas are not stored
+    in the database, so they are set for every connection).
+
+    Transactions (`atomic` blocks) start in the `transaction_mode` of the `OPTIONS`
+    of the database, by default IMMEDIATE: they take the write lock of the database when
+    they start, waiting for it up to the busy timeout. A transaction started by a read
+    (e.g. `select_for_update`) would otherwise fail with "database is locked" right away
+    when it writes after another connection has written in the meantime. The price is that
+    read-only `atomic` blocks wait for writers and each other too, so databases which are
+    only read (e.g. the replica) should use DEFERRED.
+    """
+
+    def get_connection_params(self):
+        params = super(DatabaseWrapper, self).get_connection_params()
+        # Not a parameter of `sqlite3.connect`.
+        transaction_mode = params.pop('transaction_mode', 'IMMEDIATE')
+        if transaction_mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'transaction_mode must be one of {", ".join(TRANSACTION_MODES)}, '
+                f'not {transaction_mode!r}.'
+            )
+        self.transaction_mode = transaction_mode
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super(DatabaseWrapper, self).get_new_connection(conn_params)
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')